@@ -1,13 +1,49 @@
 """AI generation and chat endpoints."""
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, model_validator
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
+import asyncio
+import json
+import math
 
-from app.services.ai_engine import ai_engine
+from app.api.routes.jobs import enqueue_job
+from app.core.config import settings
+from app.models.course import CourseUpdate
+from app.services.ai_engine import GENERATION_SECTIONS, REGENERATION_TARGETS, ai_engine, course_generation_context
+from app.services.chat_sessions import ChatSession, chat_session_store
+from app.services.jobs import job_queue
+from app.services.llm_provider import LLMError
+from app.services.patch import PatchTestFailed, diff_operations
+from app.services.rate_limit import BACKGROUND_CLIENT, RateLimitExceeded, ai_rate_limiter
+from app.services.storage import async_storage_service
+from app.services.usage import TokenMeter, estimate_message_tokens, metered, usage_tracker
 
 router = APIRouter()
 
+CHAT_SUGGESTIONS = [
+    "Generate learning objectives",
+    "Create module structure",
+    "Suggest assessments",
+]
+
+# Course fields written from each generated key when batch results are saved
+GENERATED_FIELDS = {
+    "learningObjectives": "learning_objectives",
+    "modules": "modules",
+    "assessments": "assessments",
+    "overview": "overview",
+    "description": "description",
+}
+
+# Headers that keep proxies from buffering or caching event streams
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
 
 class GenerationRequest(BaseModel):
     """Request model for AI generation."""
@@ -15,6 +51,7 @@ class GenerationRequest(BaseModel):
     generation_type: str  # objectives, modules, assessments, description, full
     context: Optional[str] = None
     preferences: Optional[Dict[str, Any]] = None
+    fresh: bool = False  # bypass the generation cache for a new result
 
 
 class GenerationResponse(BaseModel):
@@ -23,6 +60,55 @@ class GenerationResponse(BaseModel):
     data: Optional[Dict[str, Any]] = None
     message: Optional[str] = None
     tokens_used: Optional[int] = None
+    errors: Optional[Dict[str, str]] = None  # failed sections of a partial result
+
+
+class BatchItem(BaseModel):
+    """One course in a batch generation, given by ID, context or both."""
+    course_id: Optional[str] = None
+    context: Optional[Dict[str, Any]] = None
+
+    @model_validator(mode="after")
+    def check_source(self) -> "BatchItem":
+        if self.course_id is None and self.context is None:
+            raise ValueError("Each item needs a course_id or a context")
+        return self
+
+
+class BatchGenerationRequest(BaseModel):
+    """Request model for batch AI generation."""
+    items: List[BatchItem] = Field(..., min_length=1, max_length=settings.AI_BATCH_MAX_ITEMS)
+    generation_types: List[str] = Field(default=["full"], min_length=1)
+    concurrency: Optional[int] = Field(default=None, ge=1)
+    persist: bool = False  # save results into the courses given by course_id
+    fresh: bool = False  # bypass the generation cache for new results
+
+
+class RegenerateRequest(BaseModel):
+    """Request model for regenerating one part of a stored course."""
+    course_id: str
+    target: str  # objectives, module, lesson, assessment
+    target_id: Optional[str] = None  # ID of the module, lesson or assessment
+    persist: bool = False
+
+    @model_validator(mode="after")
+    def check_target(self) -> "RegenerateRequest":
+        if self.target not in REGENERATION_TARGETS:
+            raise ValueError(f"target must be one of: {', '.join(REGENERATION_TARGETS)}")
+        if self.target != "objectives" and not self.target_id:
+            raise ValueError(f"target_id is required to regenerate a {self.target}")
+        return self
+
+
+class RegenerateResponse(BaseModel):
+    """Response model for a regenerated part of a course."""
+    success: bool
+    path: Optional[str] = None  # JSON Pointer of the regenerated part
+    operations: List[Dict[str, Any]] = []  # JSON Patch applying the change in place
+    data: Optional[Any] = None  # the regenerated part
+    saved: bool = False
+    message: Optional[str] = None
+    tokens_used: Optional[int] = None
 
 
 class ChatRequest(BaseModel):
@@ -35,52 +121,375 @@ class ChatResponse(BaseModel):
     """Response model for AI chat."""
     message: str
     suggestions: Optional[list] = None
+    tokens_used: Optional[int] = None
+    context_tokens: Optional[int] = None  # estimated prompt size of a session message
+
+
+class ChatSessionCreate(BaseModel):
+    """Request model for starting a chat session."""
+    course_id: Optional[str] = None  # a stored course, re-read for every message
+    course_context: Optional[Dict[str, Any]] = None  # a snapshot for courses not yet saved
+
+
+class ChatSessionMessage(BaseModel):
+    """Request model for a message in a chat session."""
+    message: str
+    course_context: Optional[Dict[str, Any]] = None  # the current snapshot of a course not yet saved
+
+
+def parse_context(request: GenerationRequest) -> Dict[str, Any]:
+    """Parse the JSON course context of a generation request."""
+    if not request.context:
+        return {}
+    try:
+        return json.loads(request.context)
+    except json.JSONDecodeError:
+        return {"raw_context": request.context}
+
+
+def generated_update(generated: Dict[str, Any]) -> CourseUpdate:
+    """Turn generated content into an update of the matching course fields."""
+    return CourseUpdate(**{
+        field: generated[key]
+        for key, field in GENERATED_FIELDS.items()
+        if key in generated
+    })
+
+
+def client_id(request: Request) -> str:
+    """
+    Identify the client a request is rate limited and accounted under.
+
+    Clients are keyed on their address. The X-Client-ID header is only
+    honoured with AI_TRUST_CLIENT_ID_HEADER, for deployments behind a proxy
+    that sets it, since any client could otherwise pick a fresh ID to
+    escape its limit.
+    """
+    if settings.AI_TRUST_CLIENT_ID_HEADER:
+        header = request.headers.get("x-client-id")
+        if header:
+            return header
+    return request.client.host if request.client else "unknown"
+
+
+def rate_limited(e: RateLimitExceeded) -> HTTPException:
+    """Build the 429 for a request that waited too long for the rate limiter."""
+    return HTTPException(
+        status_code=429,
+        detail=str(e),
+        headers={"Retry-After": str(math.ceil(e.retry_after))},
+    )
+
+
+@contextmanager
+def accounted(client: str, course_id: Optional[str] = None, reserved: int = 0) -> Iterator[TokenMeter]:
+    """Meter the tokens used in the block and charge them to the client, settling its reservation."""
+    with metered() as meter:
+        try:
+            yield meter
+        finally:
+            ai_rate_limiter.charge(client, meter.total_tokens, reserved)
+            usage_tracker.record(meter, course_id, client)
+
+
+class ReservedEventStream(StreamingResponse):
+    """
+    Server-sent event stream that settles a rate limiter reservation.
+
+    The events charge the reservation through `accounted` as they run. If
+    the client goes away before the stream starts, they never run, so the
+    reservation is refunded when the response ends instead.
+    """
+
+    def __init__(self, client: str, reserved: int, events: Callable[[], AsyncIterator[str]]):
+        self.client = client
+        self.reserved = reserved
+        self.started = False
+        super().__init__(self._stream(events), media_type="text/event-stream", headers=SSE_HEADERS)
+
+    async def _stream(self, events: Callable[[], AsyncIterator[str]]) -> AsyncIterator[str]:
+        self.started = True
+        stream = events()
+        try:
+            async for chunk in stream:
+                yield chunk
+        finally:
+            await stream.aclose()
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            # Close a stream left suspended by a disconnect so its reservation is settled now
+            await self.body_iterator.aclose()
+            if not self.started:
+                ai_rate_limiter.charge(self.client, 0, self.reserved)
+
+
+def sse_event(event: str, data: Any) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def run_generation(
+    request: GenerationRequest,
+    client: str = BACKGROUND_CLIENT,
+    max_wait: float = math.inf,
+) -> GenerationResponse:
+    """
+    Generate content for a request, in the handler or as a job.
+
+    Jobs run as the background client and wait for the rate limiter as
+    long as needed.
+    """
+    reserved = await ai_rate_limiter.acquire(client, max_wait)
+    with accounted(client, request.course_id, reserved) as meter:
+        generated = await ai_engine.generate_content(
+            course_context=parse_context(request),
+            generation_type=request.generation_type,
+            fresh=request.fresh,
+        )
+
+    if "error" in generated:
+        return GenerationResponse(
+            success=False,
+            message=generated["error"],
+        )
+
+    errors = generated.pop("errors", None)
+    return GenerationResponse(
+        success=True,
+        data=generated,
+        errors=errors,
+        message="Some sections could not be generated" if errors else None,
+        tokens_used=meter.total_tokens,
+    )
 
 
 @router.post("/generate", response_model=GenerationResponse)
-async def generate_content(request: GenerationRequest):
+async def generate_content(
+    request: GenerationRequest,
+    job: bool = Query(False, description="Queue the generation as a background job"),
+    priority: int = Query(0, ge=-100, le=100, description="Job priority, higher runs first"),
+    client: str = Depends(client_id),
+):
     """
     Generate course content using AI.
 
+    With `job=true` the generation is queued and a 202 with the job is
+    returned; poll `/api/jobs/{id}` for its result.
+
     - **course_id**: ID of the course to generate content for
     - **generation_type**: Type of content to generate (objectives, modules, assessments, description, full)
     - **context**: Optional JSON string with course context
     - **preferences**: Optional generation preferences
+    - **fresh**: Generate anew instead of returning a cached result
     """
+    if job:
+        return await enqueue_job("ai.generate", request.model_dump(), priority)
+
     try:
-        # Parse context if provided
-        import json
-        context = {}
-        if request.context:
-            try:
-                context = json.loads(request.context)
-            except json.JSONDecodeError:
-                context = {"raw_context": request.context}
+        return await run_generation(request, client, settings.AI_RATE_LIMIT_MAX_WAIT)
+    except RateLimitExceeded as e:
+        raise rate_limited(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
-        # Generate content
-        generated = await ai_engine.generate_content(
-            course_context=context,
-            generation_type=request.generation_type,
-        )
 
-        if "error" in generated:
-            return GenerationResponse(
-                success=False,
-                message=generated["error"],
-            )
+async def generate_batch_item(
+    index: int,
+    item: BatchItem,
+    generation_type: str,
+    persist: bool,
+    client: str,
+    fresh: bool = False,
+) -> Dict[str, Any]:
+    """
+    Generate one type of content for one batch item and optionally save it.
 
-        return GenerationResponse(
-            success=True,
-            data=generated,
-            tokens_used=0,  # Placeholder - would track actual token usage
-        )
+    Items wait for the client's rate limit rather than failing, so a large
+    batch is spread out instead of exhausting the limit for everyone.
+    """
+    result = {"index": index, "course_id": item.course_id, "generation_type": generation_type}
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    context = item.context
+    if item.course_id is not None and (context is None or persist):
+        course = await async_storage_service.get_course(item.course_id)
+        if course is None:
+            return {**result, "success": False, "message": "Course not found"}
+        if context is None:
+            context = course_generation_context(course)
+
+    reserved = await ai_rate_limiter.acquire(client, math.inf)
+    with accounted(client, item.course_id, reserved) as meter:
+        try:
+            generated = await ai_engine.generate_content(context, generation_type, fresh)
+        except Exception as e:
+            generated = {"error": str(e)}
+    result["tokens_used"] = meter.total_tokens
+    if "error" in generated:
+        return {**result, "success": False, "message": generated["error"]}
+
+    errors = generated.pop("errors", None)
+    result.update(success=True, data=generated, errors=errors, saved=False)
+    if persist and item.course_id is not None:
+        saved = await async_storage_service.update_course(item.course_id, generated_update(generated))
+        result["saved"] = saved is not None
+    return result
+
+
+@router.post("/regenerate", response_model=RegenerateResponse)
+async def regenerate_part(request: RegenerateRequest, client: str = Depends(client_id)):
+    """
+    Regenerate one part of a stored course.
+
+    Only the targeted part is generated, using the stored course as
+    context. The response carries a minimal JSON Patch that applies the
+    change in place. For a module, lesson or assessment it starts with a
+    `test` of the part's ID. With `persist` the patch is also applied to
+    the stored course, and a 409 means the course changed in the meantime.
+
+    - **course_id**: ID of the stored course
+    - **target**: Part to regenerate (objectives, module, lesson, assessment)
+    - **target_id**: ID of the module, lesson or assessment
+    - **persist**: Apply the change to the stored course
+    """
+    course = await async_storage_service.get_course(request.course_id)
+    if not course:
+        raise HTTPException(status_code=404, detail="Course not found")
+
+    try:
+        reserved = await ai_rate_limiter.acquire(client)
+        with accounted(client, request.course_id, reserved) as meter:
+            regenerated = await ai_engine.regenerate(course, request.target, request.target_id)
+    except RateLimitExceeded as e:
+        raise rate_limited(e)
+    except LLMError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+    if regenerated is None:
+        raise HTTPException(status_code=404, detail=f"No {request.target} with ID {request.target_id}")
+
+    path, old, new = regenerated
+    operations = diff_operations(old, new, path)
+    if operations and request.target_id:
+        operations.insert(0, {"op": "test", "path": f"{path}/id", "value": request.target_id})
+
+    saved = False
+    if request.persist and operations:
+        try:
+            saved = await async_storage_service.patch_course(request.course_id, operations) is not None
+        except PatchTestFailed:
+            raise HTTPException(status_code=409, detail="The course changed while it was being regenerated")
+
+    return RegenerateResponse(
+        success=True,
+        path=path,
+        operations=operations,
+        data=new,
+        saved=saved,
+        message=None if operations else "The regenerated content is unchanged",
+        tokens_used=meter.total_tokens,
+    )
+
+
+def check_generation_types(generation_types: List[str]):
+    """Reject unknown generation types up front."""
+    unknown = [t for t in generation_types if t != "full" and t not in GENERATION_SECTIONS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown generation type: {unknown[0]}")
+
+
+async def iter_batch(
+    request: BatchGenerationRequest,
+    client: str = BACKGROUND_CLIENT,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run a batch generation, yielding each result as it completes.
+
+    Outstanding generations are cancelled if the consumer stops early.
+    """
+    limit = min(request.concurrency or settings.AI_BATCH_CONCURRENCY, settings.AI_BATCH_CONCURRENCY)
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(index: int, item: BatchItem, generation_type: str) -> Dict[str, Any]:
+        async with semaphore:
+            return await generate_batch_item(index, item, generation_type, request.persist, client, request.fresh)
+
+    tasks = [
+        asyncio.create_task(run(index, item, generation_type))
+        for index, item in enumerate(request.items)
+        for generation_type in request.generation_types
+    ]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            yield await next_result
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def batch_totals(results: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Count the outcomes of batch results."""
+    return {
+        "total": len(results),
+        "succeeded": sum(1 for result in results if result["success"]),
+        "failed": sum(1 for result in results if not result["success"]),
+        "saved": sum(1 for result in results if result.get("saved")),
+        "tokens_used": sum(result.get("tokens_used", 0) for result in results),
+    }
+
+
+async def run_batch(request: BatchGenerationRequest) -> Dict[str, Any]:
+    """Run a batch generation as a job, returning every result in item order."""
+    results = [result async for result in iter_batch(request)]
+    results.sort(key=lambda result: (result["index"], request.generation_types.index(result["generation_type"])))
+    return {"results": results, **batch_totals(results)}
+
+
+@router.post("/generate/batch")
+async def generate_batch(
+    request: BatchGenerationRequest,
+    job: bool = Query(False, description="Queue the batch as a background job"),
+    priority: int = Query(0, ge=-100, le=100, description="Job priority, higher runs first"),
+    client: str = Depends(client_id),
+):
+    """
+    Generate content for many courses, streaming results as server-sent events.
+
+    Every item is generated once per generation type, with at most
+    `concurrency` generations running at once. Events: `result` (one per
+    item and type, in completion order, with `index` pointing back into
+    `items`) and a final `done` with totals. With `job=true` the batch is
+    queued instead and its job result holds every result in item order.
+
+    - **items**: Courses to generate for, each with a `course_id`, a `context` or both
+    - **generation_types**: Types of content to generate for every item
+    - **concurrency**: Generations run at once (defaults to AI_BATCH_CONCURRENCY)
+    - **persist**: Save generated content into the courses given by `course_id`
+    """
+    check_generation_types(request.generation_types)
+    if job:
+        return await enqueue_job("ai.batch", request.model_dump(), priority)
+
+    async def events() -> AsyncIterator[str]:
+        results = []
+        async for result in iter_batch(request, client):
+            results.append(result)
+            yield sse_event("result", result)
+        yield sse_event("done", batch_totals(results))
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+def chat_course_id(request: ChatRequest) -> Optional[str]:
+    """Get the ID of the course a chat message is about, if given."""
+    course_id = (request.course_context or {}).get("id")
+    return course_id if isinstance(course_id, str) else None
 
 
 @router.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+async def chat(request: ChatRequest, client: str = Depends(client_id)):
     """
     Send a message to the AI assistant.
 
@@ -88,32 +497,238 @@ async def chat(request: ChatRequest):
     - **course_context**: Optional current course data for context
     """
     try:
-        response = await ai_engine.chat(
-            message=request.message,
-            course_context=request.course_context,
-        )
+        reserved = await ai_rate_limiter.acquire(client)
+        with accounted(client, chat_course_id(request), reserved) as meter:
+            response = await ai_engine.chat(
+                message=request.message,
+                course_context=request.course_context,
+            )
 
         return ChatResponse(
             message=response,
-            suggestions=[
-                "Generate learning objectives",
-                "Create module structure",
-                "Suggest assessments",
-            ],
+            suggestions=CHAT_SUGGESTIONS,
+            tokens_used=meter.total_tokens,
         )
 
+    except RateLimitExceeded as e:
+        raise rate_limited(e)
+    except LLMError as e:
+        raise HTTPException(status_code=502, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/generate/stream")
+async def generate_content_stream(request: GenerationRequest, client: str = Depends(client_id)):
+    """
+    Generate course content, streaming each part as a server-sent event.
+
+    Events: `module` (one per generated module), `section` (as each section
+    completes), `error` (a section failed) and a final `done` with the
+    tokens used.
+    """
+    context = parse_context(request)
+    try:
+        reserved = await ai_rate_limiter.acquire(client)
+    except RateLimitExceeded as e:
+        raise rate_limited(e)
+
+    async def events() -> AsyncIterator[str]:
+        with accounted(client, request.course_id, reserved) as meter:
+            async for event, data in ai_engine.generate_stream(context, request.generation_type, request.fresh):
+                if event == "done":
+                    data = {**data, "tokens_used": meter.total_tokens}
+                yield sse_event(event, data)
+
+    return ReservedEventStream(client, reserved, events)
+
+
+@router.post("/chat/stream")
+async def chat_stream(request: ChatRequest, client: str = Depends(client_id)):
+    """
+    Send a message to the AI assistant, streaming the reply as server-sent events.
+
+    Events: `token` (a piece of the reply), `error` and a final `done`
+    carrying the full message, suggestions and tokens used.
+    """
+    try:
+        reserved = await ai_rate_limiter.acquire(client)
+    except RateLimitExceeded as e:
+        raise rate_limited(e)
+
+    async def events() -> AsyncIterator[str]:
+        parts = []
+        with accounted(client, chat_course_id(request), reserved) as meter:
+            try:
+                async for delta in ai_engine.chat_stream(request.message, request.course_context):
+                    parts.append(delta)
+                    yield sse_event("token", {"text": delta})
+            except LLMError as e:
+                yield sse_event("error", {"message": str(e)})
+                return
+        yield sse_event("done", {
+            "message": "".join(parts),
+            "suggestions": CHAT_SUGGESTIONS,
+            "tokens_used": meter.total_tokens,
+        })
+
+    return ReservedEventStream(client, reserved, events)
+
+
+async def session_course(session: ChatSession, snapshot: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Get the current state of a session's course.
+
+    A stored course is re-read; for a course not yet saved, a snapshot sent
+    with the message replaces the session's, so edits made since the
+    session started are seen.
+    """
+    if session.course_id:
+        course = await async_storage_service.get_course(session.course_id)
+        if course is not None:
+            return course.model_dump(mode="json")
+    if snapshot is not None:
+        session.course_context = snapshot
+    return session.course_context
+
+
+def get_session(session_id: str) -> ChatSession:
+    """Get a live chat session or raise a 404."""
+    session = chat_session_store.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Chat session not found or expired")
+    return session
+
+
+@router.post("/chat/sessions", status_code=201)
+async def create_chat_session(request: ChatSessionCreate):
+    """
+    Start a chat session.
+
+    The session keeps the conversation on the server. Each message is sent
+    with a compact, token-budgeted context: the relevant parts of the
+    course, a summary of older turns and the recent turns verbatim.
+
+    - **course_id**: ID of a stored course the chat is about
+    - **course_context**: Course data to use when the course is not stored
+    """
+    if request.course_id and not await async_storage_service.get_course(request.course_id):
+        raise HTTPException(status_code=404, detail="Course not found")
+    return chat_session_store.create(request.course_id, request.course_context).to_dict()
+
+
+@router.get("/chat/sessions/{session_id}")
+async def get_chat_session(session_id: str):
+    """
+    Get a chat session's recent turns and summary.
+    """
+    return get_session(session_id).to_dict()
+
+
+@router.delete("/chat/sessions/{session_id}", status_code=204)
+async def delete_chat_session(session_id: str):
+    """
+    End a chat session.
+    """
+    if not chat_session_store.delete(session_id):
+        raise HTTPException(status_code=404, detail="Chat session not found or expired")
+
+
+@router.post("/chat/sessions/{session_id}/messages", response_model=ChatResponse)
+async def send_session_message(session_id: str, request: ChatSessionMessage, client: str = Depends(client_id)):
+    """
+    Send a message in a chat session.
+
+    - **message**: The user's message
+    - **course_context**: The current course data, for a session about a course not yet saved
+    """
+    session = get_session(session_id)
+    try:
+        reserved = await ai_rate_limiter.acquire(client)
+        async with session.lock:
+            course = await session_course(session, request.course_context)
+            messages = chat_session_store.build_messages(session, request.message, course)
+            with accounted(client, session.course_id, reserved) as meter:
+                response = await ai_engine.chat(request.message, course, messages)
+            chat_session_store.record_exchange(session, request.message, response, client)
+    except RateLimitExceeded as e:
+        raise rate_limited(e)
+    except LLMError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+    return ChatResponse(
+        message=response,
+        suggestions=CHAT_SUGGESTIONS,
+        tokens_used=meter.total_tokens,
+        context_tokens=estimate_message_tokens(messages),
+    )
+
+
+@router.post("/chat/sessions/{session_id}/messages/stream")
+async def stream_session_message(session_id: str, request: ChatSessionMessage, client: str = Depends(client_id)):
+    """
+    Send a message in a chat session, streaming the reply as server-sent events.
+
+    Events are the same as for `/chat/stream`.
+    """
+    session = get_session(session_id)
+    try:
+        reserved = await ai_rate_limiter.acquire(client)
+    except RateLimitExceeded as e:
+        raise rate_limited(e)
+
+    async def events() -> AsyncIterator[str]:
+        parts = []
+        async with session.lock:
+            course = await session_course(session, request.course_context)
+            messages = chat_session_store.build_messages(session, request.message, course)
+            with accounted(client, session.course_id, reserved) as meter:
+                try:
+                    async for delta in ai_engine.chat_stream(request.message, course, messages):
+                        parts.append(delta)
+                        yield sse_event("token", {"text": delta})
+                except LLMError as e:
+                    yield sse_event("error", {"message": str(e)})
+                    return
+            chat_session_store.record_exchange(session, request.message, "".join(parts), client)
+        yield sse_event("done", {
+            "message": "".join(parts),
+            "suggestions": CHAT_SUGGESTIONS,
+            "tokens_used": meter.total_tokens,
+            "context_tokens": estimate_message_tokens(messages),
+        })
+
+    return ReservedEventStream(client, reserved, events)
+
+
+@router.get("/usage")
+async def token_usage():
+    """
+    Get token usage in total, per course and per client, with the rate limits.
+    """
+    return {**usage_tracker.stats(), "limits": ai_rate_limiter.stats()}
+
+
+@router.get("/usage/courses/{course_id}")
+async def course_token_usage(course_id: str):
+    """
+    Get the token usage of one course.
+
+    - **course_id**: The unique identifier of the course
+    """
+    return {"course_id": course_id, **usage_tracker.for_course(course_id)}
+
+
 @router.get("/status")
 async def ai_status():
     """
     Get AI engine status.
     """
-    return {
+    provider = ai_engine.provider
+    status = {
         "status": "ready",
-        "model": "placeholder",
+        "provider": provider.name if provider else "mock",
+        "model": provider.model if provider else "placeholder",
         "capabilities": [
             "objectives_generation",
             "modules_generation",
@@ -121,6 +736,38 @@ async def ai_status():
             "description_generation",
             "full_course_generation",
             "chat",
+            "streaming",
         ],
-        "note": "This is a placeholder AI engine. Configure your API keys for full functionality.",
     }
+    status["cache"] = ai_engine.cache.stats() if ai_engine.cache else None
+    status["inflight"] = ai_engine.inflight
+    status["coalesced"] = ai_engine.coalesced
+    status["chat_sessions"] = chat_session_store.stats()
+    status["prompts"] = ai_engine.templates.stats()
+    if provider is None:
+        status["note"] = "This is a placeholder AI engine. Set AI_PROVIDER and your API keys for full functionality."
+    return status
+
+
+@router.get("/cache")
+async def cache_stats():
+    """
+    Get generation cache statistics.
+    """
+    if ai_engine.cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **ai_engine.cache.stats()}
+
+
+@router.delete("/cache")
+async def clear_cache():
+    """
+    Clear the generation cache.
+    """
+    if ai_engine.cache is None:
+        return {"cleared": 0}
+    return {"cleared": await ai_engine.cache.clear()}
+
+
+job_queue.register("ai.generate", run_generation, GenerationRequest)
+job_queue.register("ai.batch", run_batch, BatchGenerationRequest)
@@ -1,13 +1,108 @@
 """Course CRUD API endpoints."""
 
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+from typing import AsyncIterator, List, Optional, Tuple, Union
+import base64
+import json
 
-from app.models.course import Course, CourseCreate, CourseUpdate
-from app.services.storage import storage_service
+from app.models.course import (
+    Course,
+    CourseCreate,
+    CourseUpdate,
+    CourseSummary,
+    CourseSummaryPage,
+)
+from app.core.config import settings
+from app.core.executor import run_io
+from app.services.patch import PatchError, PatchTestFailed, merge_patch_to_operations
+from app.services.storage import PageKey, async_storage_service
 
 router = APIRouter()
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+JSON_PATCH_MEDIA_TYPE = "application/json-patch+json"
+
+SUMMARY_FIELDS = list(CourseSummary.model_fields)
+
+
+def encode_cursor(key: PageKey) -> str:
+    """Encode the key of a page's last course as an opaque cursor."""
+    return base64.urlsafe_b64encode(json.dumps(key, separators=(",", ":")).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> PageKey:
+    """Decode an opaque cursor back into a page key."""
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+        if not isinstance(key, list) or not all(isinstance(part, (str, int, float)) for part in key):
+            raise ValueError(cursor)
+        return key
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def summarize_course(course: Course, fields: List[str]) -> CourseSummary:
+    """Build a course summary containing only the requested fields."""
+    values = {
+        "id": course.id,
+        "title": course.title,
+        "code": course.code,
+        "level": course.level,
+        "thematic": course.thematic,
+        "status": course.status,
+        "duration": course.duration,
+        "delivery_method": course.delivery_method,
+        "module_count": len(course.modules),
+        "lesson_count": sum(len(module.lessons) for module in course.modules),
+        "updated_date": course.metadata.updated_date,
+    }
+    return CourseSummary(**{field: values[field] for field in fields})
+
+
+class CloneRequest(BaseModel):
+    """Request model for cloning courses."""
+    course_ids: List[str] = Field(..., min_length=1)
+    remap_ids: bool = False
+
+
+class BulkError(BaseModel):
+    """A rejected line of a bulk upload."""
+    line: int
+    error: str
+
+
+class BulkImportResponse(BaseModel):
+    """Response model for bulk course ingest."""
+    imported: int
+    failed: int
+    errors: List[BulkError] = []
+
+
+def parse_ndjson_batch(
+    lines: List[Tuple[int, bytes]],
+) -> Tuple[List[Union[CourseCreate, Course]], List[BulkError]]:
+    """
+    Parse NDJSON lines into courses.
+
+    Lines with an ``id`` are imported as full courses; all others are
+    treated as creation data and get a new ID.
+    """
+    items: List[Union[CourseCreate, Course]] = []
+    errors: List[BulkError] = []
+
+    for line_number, line in lines:
+        try:
+            data = json.loads(line)
+            if not isinstance(data, dict):
+                raise ValueError("Each line must be a JSON object")
+            items.append(Course(**data) if "id" in data else CourseCreate(**data))
+        except (ValueError, ValidationError) as e:
+            errors.append(BulkError(line=line_number, error=str(e)))
+
+    return items, errors
+
 
 @router.get("/", response_model=List[Course])
 async def get_courses(
@@ -15,6 +110,8 @@ async def get_courses(
     level: Optional[str] = Query(None, description="Filter by level"),
     thematic: Optional[str] = Query(None, description="Filter by thematic"),
     status: Optional[str] = Query(None, description="Filter by status"),
+    code: Optional[str] = Query(None, description="Filter by course code"),
+    q: Optional[str] = Query(None, description="Full-text search query"),
 ):
     """
     Get all courses or filter by criteria.
@@ -23,15 +120,189 @@ async def get_courses(
     - **level**: Optional level filter (exact match)
     - **thematic**: Optional thematic filter (exact match)
     - **status**: Optional status filter (exact match)
+    - **code**: Optional course code filter (exact match)
+    - **q**: Optional full-text query over titles, descriptions and lesson content (ranked)
+    """
+    if any([title, level, thematic, status, code, q]):
+        return await async_storage_service.search_courses(
+            title=title,
+            level=level,
+            thematic=thematic,
+            status=status,
+            code=code,
+            query=q,
+        )
+    return await async_storage_service.get_all_courses()
+
+
+@router.get(
+    "/summary",
+    response_model=CourseSummaryPage,
+    response_model_exclude_unset=True,
+)
+async def get_course_summaries(
+    limit: int = Query(50, ge=1, le=500, description="Maximum number of courses per page"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated summary fields to include"),
+    title: Optional[str] = Query(None, description="Filter by title"),
+    level: Optional[str] = Query(None, description="Filter by level"),
+    thematic: Optional[str] = Query(None, description="Filter by thematic"),
+    status: Optional[str] = Query(None, description="Filter by status"),
+    code: Optional[str] = Query(None, description="Filter by course code"),
+    q: Optional[str] = Query(None, description="Full-text search query"),
+):
     """
-    if any([title, level, thematic, status]):
-        return storage_service.search_courses(
+    Get a page of course summaries without nested modules, lessons or assessments.
+
+    - **limit**: Page size (1-500)
+    - **cursor**: Opaque cursor returned as `next_cursor` by the previous page; pages are
+      keyed on the last course seen, so concurrent changes do not skip or repeat courses
+    - **fields**: Optional projection, e.g. `title,status,lesson_count` (`id` is always included)
+    - Filters match `GET /api/courses`
+    """
+    if fields:
+        requested = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = [field for field in requested if field not in SUMMARY_FIELDS]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown summary fields: {', '.join(unknown)}",
+            )
+        selected = ["id"] + [field for field in requested if field != "id"]
+    else:
+        selected = SUMMARY_FIELDS
+
+    try:
+        courses, total, next_key = await async_storage_service.list_courses(
+            limit,
+            decode_cursor(cursor) if cursor else None,
             title=title,
             level=level,
             thematic=thematic,
             status=status,
+            code=code,
+            query=q,
         )
-    return storage_service.get_all_courses()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return CourseSummaryPage(
+        items=[summarize_course(course, selected) for course in courses],
+        total=total,
+        next_cursor=encode_cursor(next_key) if next_key is not None else None,
+    )
+
+
+@router.get("/stream")
+async def stream_courses(
+    title: Optional[str] = Query(None, description="Filter by title"),
+    level: Optional[str] = Query(None, description="Filter by level"),
+    thematic: Optional[str] = Query(None, description="Filter by thematic"),
+    status: Optional[str] = Query(None, description="Filter by status"),
+    code: Optional[str] = Query(None, description="Filter by course code"),
+    q: Optional[str] = Query(None, description="Full-text search query"),
+):
+    """
+    Stream courses as newline-delimited JSON, one course per line.
+
+    Courses are read and serialized in batches, so the full catalog is never
+    built into a single response. Filters match `GET /api/courses`.
+    """
+    async def generate() -> AsyncIterator[str]:
+        async for batch in async_storage_service.iter_courses(
+            title=title,
+            level=level,
+            thematic=thematic,
+            status=status,
+            code=code,
+            query=q,
+        ):
+            yield await run_io(
+                lambda: "".join(course.model_dump_json() + "\n" for course in batch)
+            )
+
+    return StreamingResponse(generate(), media_type=NDJSON_MEDIA_TYPE)
+
+
+@router.post("/bulk", response_model=BulkImportResponse)
+async def bulk_import_courses(request: Request):
+    """
+    Ingest courses from a newline-delimited JSON upload.
+
+    Each line is either course creation data or a full course with an `id`,
+    which is imported as-is and replaces an existing course with that ID.
+    Courses are committed in batches of `BULK_BATCH_SIZE` with one storage
+    write per batch. Invalid lines, and lines longer than
+    `BULK_MAX_LINE_BYTES`, are reported and skipped.
+    """
+    imported = 0
+    errors: List[BulkError] = []
+    pending: List[Tuple[int, bytes]] = []
+    line_number = 0
+    buffer = b""
+    oversized = False  # the line being read is over the limit and is being dropped
+    max_line = settings.BULK_MAX_LINE_BYTES
+
+    def too_long(number: int) -> BulkError:
+        return BulkError(line=number, error=f"Line exceeds {max_line} bytes")
+
+    async def commit():
+        nonlocal imported
+        items, batch_errors = await run_io(parse_ndjson_batch, list(pending))
+        pending.clear()
+        errors.extend(batch_errors)
+        if items:
+            imported += len(await async_storage_service.import_courses(items))
+
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if oversized or len(line) > max_line:
+                oversized = False
+                errors.append(too_long(line_number))
+            elif line.strip():
+                pending.append((line_number, line))
+            if len(pending) >= settings.BULK_BATCH_SIZE:
+                await commit()
+        if len(buffer) > max_line:
+            # Drop the rest of the line instead of buffering it
+            oversized = True
+            buffer = b""
+
+    if oversized:
+        errors.append(too_long(line_number + 1))
+    elif buffer.strip():
+        pending.append((line_number + 1, buffer))
+    if pending:
+        await commit()
+
+    errors.sort(key=lambda error: error.line)
+    return BulkImportResponse(
+        imported=imported,
+        failed=len(errors),
+        errors=errors[:100],
+    )
+
+
+@router.post("/clone", response_model=List[Course], status_code=201)
+async def clone_courses(request: CloneRequest):
+    """
+    Clone many courses in one storage write.
+
+    Each copy is a new draft titled "<title> (Copy)" with code "<code>-COPY".
+
+    - **course_ids**: IDs of the courses to clone
+    - **remap_ids**: Whether nested objectives, modules, lessons and assessments get new IDs
+    """
+    clones = await async_storage_service.clone_courses(
+        request.course_ids,
+        remap_ids=request.remap_ids,
+    )
+    if clones is None:
+        raise HTTPException(status_code=404, detail="One or more courses not found")
+    return clones
 
 
 @router.get("/{course_id}", response_model=Course)
@@ -41,7 +312,7 @@ async def get_course(course_id: str):
 
     - **course_id**: The unique identifier of the course
     """
-    course = storage_service.get_course(course_id)
+    course = await async_storage_service.get_course(course_id)
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
     return course
@@ -54,7 +325,7 @@ async def create_course(course_data: CourseCreate):
 
     - **course_data**: Course creation data
     """
-    return storage_service.create_course(course_data)
+    return await async_storage_service.create_course(course_data)
 
 
 @router.put("/{course_id}", response_model=Course)
@@ -65,7 +336,44 @@ async def update_course(course_id: str, updates: CourseUpdate):
     - **course_id**: The unique identifier of the course
     - **updates**: Fields to update
     """
-    course = storage_service.update_course(course_id, updates)
+    course = await async_storage_service.update_course(course_id, updates)
+    if not course:
+        raise HTTPException(status_code=404, detail="Course not found")
+    return course
+
+
+@router.patch("/{course_id}", response_model=Course)
+async def patch_course(course_id: str, request: Request):
+    """
+    Apply a partial update to a course.
+
+    Send `application/json-patch+json` with a list of JSON Patch (RFC 6902)
+    operations, e.g. `[{"op": "replace", "path": "/modules/2/lessons/1/title", "value": "..."}]`,
+    or `application/merge-patch+json` with a JSON Merge Patch (RFC 7396) object.
+    A plain `application/json` body is treated as a JSON Patch if it is a list
+    and as a merge patch if it is an object. Only the changed values are
+    validated and persisted.
+
+    - **course_id**: The unique identifier of the course
+    """
+    try:
+        body = json.loads(await request.body())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Request body must be valid JSON")
+
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    try:
+        if content_type == JSON_PATCH_MEDIA_TYPE or isinstance(body, list):
+            operations = body
+        else:
+            operations = merge_patch_to_operations(body)
+
+        course = await async_storage_service.patch_course(course_id, operations)
+    except PatchTestFailed as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except PatchError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
     return course
@@ -78,47 +386,21 @@ async def delete_course(course_id: str):
 
     - **course_id**: The unique identifier of the course
     """
-    deleted = storage_service.delete_course(course_id)
+    deleted = await async_storage_service.delete_course(course_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Course not found")
     return None
 
 
 @router.post("/{course_id}/duplicate", response_model=Course, status_code=201)
-async def duplicate_course(course_id: str):
+async def duplicate_course(course_id: str, remap_ids: bool = Query(False, description="Assign new IDs to objectives, modules, lessons and assessments")):
     """
     Duplicate an existing course.
 
     - **course_id**: The unique identifier of the course to duplicate
+    - **remap_ids**: Whether nested items get new IDs in the copy
     """
-    original = storage_service.get_course(course_id)
-    if not original:
+    clones = await async_storage_service.clone_courses([course_id], remap_ids=remap_ids)
+    if not clones:
         raise HTTPException(status_code=404, detail="Course not found")
-
-    # Create duplicate
-    duplicate_data = CourseCreate(
-        title=f"{original.title} (Copy)",
-        code=f"{original.code}-COPY",
-        level=original.level,
-        thematic=original.thematic,
-        custom_thematic=original.custom_thematic,
-        description=original.description,
-        overview=original.overview,
-        target_audience=original.target_audience,
-        duration=original.duration,
-        delivery_method=original.delivery_method,
-        author=original.metadata.author if original.metadata else "",
-        organization=original.metadata.organization if original.metadata else None,
-    )
-
-    duplicated = storage_service.create_course(duplicate_data)
-
-    # Copy objectives, modules, assessments
-    updates = CourseUpdate(
-        learning_objectives=original.learning_objectives,
-        modules=original.modules,
-        assessments=original.assessments,
-    )
-    storage_service.update_course(duplicated.id, updates)
-
-    return storage_service.get_course(duplicated.id)
+    return clones[0]
@@ -1,16 +1,20 @@
 """Export endpoints for course content."""
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import FileResponse
 from pydantic import BaseModel
 from typing import Optional
 import os
 
-from app.services.storage import storage_service
+from app.api.routes.jobs import enqueue_job
+from app.services.storage import async_storage_service
 from app.services.export import export_service
+from app.services.jobs import job_queue
 
 router = APIRouter()
 
+EXPORT_FORMATS = ("json", "pdf", "docx", "scorm")
+
 
 class ExportRequest(BaseModel):
     """Request model for export."""
@@ -26,52 +30,75 @@ class ExportResponse(BaseModel):
     message: Optional[str] = None
 
 
+async def run_export(request: ExportRequest) -> ExportResponse:
+    """Export a course, in the handler or as a job."""
+    # Get course
+    course = await async_storage_service.get_course(request.course_id)
+    if not course:
+        raise HTTPException(status_code=404, detail="Course not found")
+
+    # Export based on format
+    if request.format == "json":
+        filepath = await export_service.export_json(
+            course,
+            include_metadata=request.include_metadata,
+        )
+    elif request.format == "pdf":
+        filepath = await export_service.export_pdf(
+            course,
+            include_metadata=request.include_metadata,
+        )
+    elif request.format == "docx":
+        filepath = await export_service.export_docx(
+            course,
+            include_metadata=request.include_metadata,
+        )
+    elif request.format == "scorm":
+        filepath = await export_service.export_scorm(course)
+    else:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported export format: {request.format}",
+        )
+
+    # Return download URL
+    filename = os.path.basename(filepath)
+    return ExportResponse(
+        success=True,
+        download_url=f"/api/export/download/{filename}",
+    )
+
+
 @router.post("/", response_model=ExportResponse)
-async def export_course(request: ExportRequest):
+async def export_course(
+    request: ExportRequest,
+    job: bool = Query(False, description="Queue the export as a background job"),
+    priority: int = Query(0, ge=-100, le=100, description="Job priority, higher runs first"),
+):
     """
     Export a course to the specified format.
 
+    With `job=true` the export is queued and a 202 with the job is
+    returned; the job result holds the download URL.
+
     - **course_id**: ID of the course to export
     - **format**: Export format (json, pdf, docx, scorm)
     - **include_metadata**: Whether to include metadata in export
     """
-    # Get course
-    course = storage_service.get_course(request.course_id)
-    if not course:
-        raise HTTPException(status_code=404, detail="Course not found")
-
-    # Export based on format
-    try:
-        if request.format == "json":
-            filepath = await export_service.export_json(
-                course,
-                include_metadata=request.include_metadata,
-            )
-        elif request.format == "pdf":
-            filepath = await export_service.export_pdf(
-                course,
-                include_metadata=request.include_metadata,
-            )
-        elif request.format == "docx":
-            filepath = await export_service.export_docx(
-                course,
-                include_metadata=request.include_metadata,
-            )
-        elif request.format == "scorm":
-            filepath = await export_service.export_scorm(course)
-        else:
+    if job:
+        if request.format not in EXPORT_FORMATS:
             raise HTTPException(
                 status_code=400,
                 detail=f"Unsupported export format: {request.format}",
             )
+        if not await async_storage_service.get_course(request.course_id):
+            raise HTTPException(status_code=404, detail="Course not found")
+        return await enqueue_job("export", request.model_dump(), priority)
 
-        # Return download URL
-        filename = os.path.basename(filepath)
-        return ExportResponse(
-            success=True,
-            download_url=f"/api/export/download/{filename}",
-        )
-
+    try:
+        return await run_export(request)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -128,7 +155,7 @@ async def get_export_formats():
                 "name": "PDF",
                 "description": "Portable Document Format",
                 "extension": ".pdf",
-                "status": "placeholder",
+                "status": "available",
             },
             {
                 "id": "docx",
@@ -146,3 +173,6 @@ async def get_export_formats():
             },
         ],
     }
+
+
+job_queue.register("export", run_export, ExportRequest)
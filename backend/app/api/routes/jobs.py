@@ -0,0 +1,120 @@
+"""Background job endpoints."""
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import ValidationError
+from typing import Any, Dict, List, Optional
+
+from app.models.job import Job, JobCreate, JobStatusEnum
+from app.services.jobs import JobQueueFull, UnknownJobKind, job_queue
+
+router = APIRouter()
+
+# Seconds a client should wait before resubmitting to a full queue
+RETRY_AFTER = 5
+
+
+def job_accepted(job: Job) -> JSONResponse:
+    """Build the 202 response for a newly queued job."""
+    return JSONResponse(
+        status_code=202,
+        content=jsonable_encoder(job),
+        headers={"Location": f"/api/jobs/{job.id}"},
+    )
+
+
+async def enqueue_job(kind: str, payload: Dict[str, Any], priority: int = 0) -> JSONResponse:
+    """Queue a job for an endpoint running in job mode."""
+    try:
+        job = await job_queue.submit(kind, payload, priority)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(RETRY_AFTER)})
+    return job_accepted(job)
+
+
+@router.post("/", response_model=Job, status_code=202)
+async def submit_job(request: JobCreate):
+    """
+    Queue a background job.
+
+    - **kind**: Job kind (see `/api/jobs/stats` for the registered kinds)
+    - **payload**: Job input, as the matching endpoint would take it
+    - **priority**: Higher priorities run first (-100 to 100)
+    """
+    try:
+        return await enqueue_job(request.kind, request.payload, request.priority)
+    except UnknownJobKind as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=jsonable_encoder(e.errors()))
+
+
+@router.get("/", response_model=List[Job])
+async def list_jobs(
+    status: Optional[JobStatusEnum] = None,
+    kind: Optional[str] = None,
+):
+    """
+    List jobs, newest first. Results are left out; get a job by ID for its result.
+
+    - **status**: Only jobs in this state
+    - **kind**: Only jobs of this kind
+    """
+    return job_queue.list_jobs(status=status, kind=kind)
+
+
+@router.get("/stats")
+async def job_stats():
+    """
+    Get job counts by state and the worker pool size.
+    """
+    return job_queue.stats()
+
+
+@router.get("/{job_id}", response_model=Job)
+async def get_job(job_id: str):
+    """
+    Get a job's state.
+
+    - **job_id**: The unique identifier of the job
+    """
+    job = await job_queue.fetch(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/{job_id}/result")
+async def get_job_result(job_id: str):
+    """
+    Get the result of a finished job.
+
+    Responds 409 while the job is queued or running, or if it failed or was cancelled.
+
+    - **job_id**: The unique identifier of the job
+    """
+    job = await job_queue.fetch(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status != JobStatusEnum.SUCCEEDED:
+        detail = f"Job is {job.status.value}"
+        if job.error:
+            detail = f"{detail}: {job.error}"
+        raise HTTPException(status_code=409, detail=detail)
+    return job.result
+
+
+@router.delete("/{job_id}", response_model=Job)
+async def cancel_job(job_id: str):
+    """
+    Cancel a queued or running job.
+
+    - **job_id**: The unique identifier of the job
+    """
+    job = job_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.finished:
+        raise HTTPException(status_code=409, detail=f"Job is already {job.status.value}")
+    return await job_queue.cancel(job_id)
@@ -1,111 +1,145 @@
 """Lexicon API endpoints."""
 
-from fastapi import APIRouter, HTTPException
-from typing import Dict, Any
-import json
-import os
+from fastapi import APIRouter, HTTPException, Request, Response
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+from app.models.course import CourseLevelEnum
+from app.services.lexicon import CachedResponse, lexicon_service
 
 router = APIRouter()
 
-# Path to shared lexicon file
-LEXICON_PATH = os.path.join(
-    os.path.dirname(__file__),
-    "..", "..", "..", "..", "shared", "lexicon.json"
-)
+# Clients may cache lexicon responses but must revalidate them with the ETag
+CACHE_CONTROL = "no-cache"
+
+# Largest batch of objectives accepted by /classify
+MAX_CLASSIFY_OBJECTIVES = 10000
+
+
+class ClassifyRequest(BaseModel):
+    """Request model for classifying learning objectives."""
+    objectives: List[str] = Field(..., min_length=1, max_length=MAX_CLASSIFY_OBJECTIVES)
+    level: Optional[CourseLevelEnum] = None
+
+
+class ObjectiveClassification(BaseModel):
+    """The detected Bloom level of one learning objective."""
+    text: str
+    verb: Optional[str] = None
+    level: Optional[str] = None
+    candidates: List[str] = []
+    matches_level: Optional[bool] = None
+
+
+class ClassifyResponse(BaseModel):
+    """Response model for a batch of classified objectives."""
+    level: Optional[CourseLevelEnum] = None
+    results: List[ObjectiveClassification]
+    matched: int
+    mismatched: int
+    unclassified: int
 
 
-def load_lexicon() -> Dict[str, Any]:
-    """Load the lexicon from the shared JSON file."""
-    try:
-        with open(LEXICON_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {"error": "Lexicon file not found"}
-    except json.JSONDecodeError:
-        return {"error": "Invalid lexicon JSON"}
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check whether an If-None-Match header matches an entity tag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def cached_response(request: Request, cached: CachedResponse) -> Response:
+    """Serve a pre-serialized body, or a 304 if the client's copy is current."""
+    headers = {"ETag": cached.etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request, cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
 
 
 @router.get("/")
-async def get_lexicon():
+async def get_lexicon(request: Request):
     """
     Get the complete lexicon.
     """
-    return load_lexicon()
+    return cached_response(request, lexicon_service.get_response("lexicon"))
 
 
 @router.get("/levels")
-async def get_course_levels():
+async def get_course_levels(request: Request):
     """
     Get available course levels.
     """
-    lexicon = load_lexicon()
-    return {
-        "levels": lexicon.get("courseLevels", []),
-    }
+    return cached_response(request, lexicon_service.get_response("levels"))
 
 
 @router.get("/thematics")
-async def get_course_thematics():
+async def get_course_thematics(request: Request):
     """
     Get available course thematics.
     """
-    lexicon = load_lexicon()
-    return {
-        "thematics": lexicon.get("courseThematics", []),
-    }
+    return cached_response(request, lexicon_service.get_response("thematics"))
 
 
 @router.get("/placeholders")
-async def get_placeholders():
+async def get_placeholders(request: Request):
     """
     Get template placeholders.
     """
-    lexicon = load_lexicon()
-    return {
-        "placeholders": lexicon.get("placeholders", {}),
-    }
+    return cached_response(request, lexicon_service.get_response("placeholders"))
 
 
 @router.get("/templates")
-async def get_templates():
+async def get_templates(request: Request):
     """
     Get templates including objective verbs, assessment types, etc.
     """
-    lexicon = load_lexicon()
-    return {
-        "templates": lexicon.get("templates", {}),
-    }
+    return cached_response(request, lexicon_service.get_response("templates"))
 
 
 @router.get("/status-codes")
-async def get_status_codes():
+async def get_status_codes(request: Request):
     """
     Get course status codes.
     """
-    lexicon = load_lexicon()
-    return {
-        "statusCodes": lexicon.get("statusCodes", {}),
-    }
+    return cached_response(request, lexicon_service.get_response("status-codes"))
 
 
 @router.get("/verbs/{level}")
-async def get_objective_verbs(level: str):
+async def get_objective_verbs(level: str, request: Request):
     """
     Get recommended objective verbs for a specific level.
 
     - **level**: Course level (awareness, foundational, basic, intermediate, advanced, expert, senior)
     """
-    lexicon = load_lexicon()
-    templates = lexicon.get("templates", {})
-    verbs = templates.get("objectiveVerbs", {})
-
-    if level not in verbs:
+    cached = lexicon_service.get_response(f"verbs/{level}")
+    if cached is None:
         raise HTTPException(
             status_code=404,
             detail=f"No verbs found for level: {level}",
         )
 
-    return {
-        "level": level,
-        "verbs": verbs[level],
-    }
+    return cached_response(request, cached)
+
+
+@router.post("/classify", response_model=ClassifyResponse)
+async def classify_objectives(request: ClassifyRequest):
+    """
+    Classify learning objectives by the Bloom-level verb they use.
+
+    - **objectives**: Objective texts to classify
+    - **level**: Course level to check the objectives against
+    """
+    level = request.level.value if request.level else None
+    results = lexicon_service.classify_objectives(request.objectives, level)
+
+    return ClassifyResponse(
+        level=request.level,
+        results=results,
+        matched=sum(1 for result in results if result["matches_level"]),
+        mismatched=sum(1 for result in results if result["matches_level"] is False and result["level"]),
+        unclassified=sum(1 for result in results if result["level"] is None),
+    )
@@ -18,11 +18,68 @@ class Settings(BaseModel):
     # Storage Settings
     DATA_DIR: str = os.path.join(os.path.dirname(__file__), "..", "..", "data")
     COURSES_FILE: str = "courses.json"
+    STORAGE_BACKEND: str = "json"  # json, sharded, sqlite, log
+    COURSES_DIR: str = "courses"
+    SQLITE_FILE: str = "courses.db"
+    STORAGE_LOG_FSYNC: bool = False
+    STORAGE_COMPACT_INTERVAL: float = 60.0  # seconds
+    STORAGE_COMPACT_MIN_ENTRIES: int = 1000
+    IO_WORKERS: int = 8  # threads for blocking file I/O
+    BULK_BATCH_SIZE: int = 500  # courses committed per bulk-ingest write
+    BULK_MAX_LINE_BYTES: int = 10 * 1024 * 1024  # longest accepted bulk-ingest line
 
-    # AI Settings (placeholders for future integration)
+    # Lexicon Settings
+    LEXICON_PATH: str = os.path.join(
+        os.path.dirname(__file__), "..", "..", "..", "shared", "lexicon.json"
+    )
+    LEXICON_RELOAD_INTERVAL: float = 2.0  # seconds between file change checks; 0 disables
+
+    # Prompt Template Settings
+    PROMPT_TEMPLATE_DIR: str = os.path.join(os.path.dirname(__file__), "..", "prompts")
+    PROMPT_RELOAD_INTERVAL: float = 2.0  # seconds between file change checks; 0 disables
+    PROMPT_PREFIX_CACHE_SIZE: int = 1024  # rendered per-course prompt prefixes kept
+
+    # AI Settings
+    AI_PROVIDER: str = "mock"  # mock, openai
     AI_API_KEY: str = ""
+    AI_API_BASE: str = "https://api.openai.com/v1"
     AI_MODEL: str = "gpt-4"
     AI_MAX_TOKENS: int = 4096
+    AI_TEMPERATURE: float = 0.7
+    AI_TIMEOUT: float = 60.0  # seconds per upstream request
+    AI_CONNECT_TIMEOUT: float = 5.0
+    AI_MAX_RETRIES: int = 3
+    AI_RETRY_BACKOFF: float = 0.5  # seconds, doubled on each retry
+    AI_MAX_CONNECTIONS: int = 20
+    AI_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    AI_MAX_CONCURRENCY: int = 4  # concurrent section requests per generation
+    AI_SECTION_TIMEOUT: float = 120.0  # seconds per section or module
+    AI_CACHE_ENABLED: bool = True
+    AI_CACHE_MAX_ENTRIES: int = 512
+    AI_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    AI_CACHE_TTL: float = 86400.0  # seconds
+    AI_CACHE_DISK: bool = False  # also persist cached results under DATA_DIR
+    AI_CACHE_DIR: str = "generation_cache"
+    AI_BATCH_CONCURRENCY: int = 4  # generations run at once by /generate/batch
+    AI_BATCH_MAX_ITEMS: int = 500
+    AI_RATE_LIMIT_REQUESTS: int = 60  # per client per minute, 0 for no limit
+    AI_RATE_LIMIT_TOKENS: int = 200000  # per client per minute, 0 for no limit
+    AI_RATE_LIMIT_GLOBAL_REQUESTS: int = 0  # across all clients per minute
+    AI_RATE_LIMIT_GLOBAL_TOKENS: int = 0  # across all clients per minute
+    AI_RATE_LIMIT_MAX_WAIT: float = 5.0  # seconds a request may queue before a 429
+    AI_RATE_LIMIT_RESERVE_TOKENS: int = 2000  # tokens held per request until its usage is known
+    AI_TRUST_CLIENT_ID_HEADER: bool = False  # key clients on X-Client-ID, only behind a proxy that sets it
+    CHAT_CONTEXT_TOKENS: int = 3000  # course, summary and history sent with each message
+    CHAT_HISTORY_TOKENS: int = 1500  # recent turns kept verbatim before older ones are summarized
+    CHAT_SUMMARY_TOKENS: int = 300
+    CHAT_SESSION_TTL: float = 6 * 3600.0  # seconds an idle session is kept
+    CHAT_MAX_SESSIONS: int = 1000
+
+    # Job Queue Settings
+    JOB_WORKERS: int = 2
+    JOB_MAX_QUEUED: int = 1000  # submissions beyond this are rejected with 503
+    JOB_DIR: str = "jobs"  # under DATA_DIR
+    JOB_RETENTION: float = 7 * 86400.0  # seconds finished jobs are kept
 
     # Export Settings
     EXPORT_DIR: str = os.path.join(os.path.dirname(__file__), "..", "..", "exports")
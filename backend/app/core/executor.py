@@ -0,0 +1,21 @@
+"""Bounded thread pool for blocking file I/O."""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+io_executor = ThreadPoolExecutor(
+    max_workers=settings.IO_WORKERS,
+    thread_name_prefix="prometheus-io",
+)
+
+
+async def run_io(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking function on the I/O thread pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(io_executor, functools.partial(func, *args, **kwargs))
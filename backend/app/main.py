@@ -6,8 +6,12 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
-from app.api.routes import courses, ai, export, lexicon
+from app.api.routes import courses, ai, export, jobs, lexicon
 from app.core.config import settings
+from app.services.storage import storage_service
+from app.services.lexicon import lexicon_service
+from app.services.ai_engine import ai_engine
+from app.services.jobs import job_queue
 
 
 @asynccontextmanager
@@ -15,9 +19,17 @@ async def lifespan(app: FastAPI):
     """Application lifespan events."""
     # Startup
     print("🔥 Prometheus Course Generation System 2.0 starting...")
+    await storage_service.start()
+    await lexicon_service.start()
+    await ai_engine.start()
+    await job_queue.start()
     yield
     # Shutdown
     print("🔥 Prometheus shutting down...")
+    await job_queue.stop()
+    await ai_engine.close()
+    await lexicon_service.stop()
+    await storage_service.stop()
 
 
 app = FastAPI(
@@ -40,6 +52,7 @@ app.add_middleware(
 app.include_router(courses.router, prefix="/api/courses", tags=["Courses"])
 app.include_router(ai.router, prefix="/api/ai", tags=["AI"])
 app.include_router(export.router, prefix="/api/export", tags=["Export"])
+app.include_router(jobs.router, prefix="/api/jobs", tags=["Jobs"])
 app.include_router(lexicon.router, prefix="/api/lexicon", tags=["Lexicon"])
 
 
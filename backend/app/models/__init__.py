@@ -4,6 +4,8 @@ from app.models.course import (
     Course,
     CourseCreate,
     CourseUpdate,
+    CourseSummary,
+    CourseSummaryPage,
     LearningObjective,
     Module,
     Lesson,
@@ -14,11 +16,14 @@ from app.models.course import (
     CourseStatusEnum,
     DeliveryMethodEnum,
 )
+from app.models.job import Job, JobCreate, JobStatusEnum
 
 __all__ = [
     "Course",
     "CourseCreate",
     "CourseUpdate",
+    "CourseSummary",
+    "CourseSummaryPage",
     "LearningObjective",
     "Module",
     "Lesson",
@@ -28,4 +33,7 @@ __all__ = [
     "CourseThematicEnum",
     "CourseStatusEnum",
     "DeliveryMethodEnum",
+    "Job",
+    "JobCreate",
+    "JobStatusEnum",
 ]
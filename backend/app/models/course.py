@@ -152,3 +152,25 @@ class Course(CourseBase):
 
     class Config:
         from_attributes = True
+
+
+class CourseSummary(BaseModel):
+    """Lightweight course listing model without nested content."""
+    id: str
+    title: Optional[str] = None
+    code: Optional[str] = None
+    level: Optional[CourseLevelEnum] = None
+    thematic: Optional[CourseThematicEnum] = None
+    status: Optional[CourseStatusEnum] = None
+    duration: Optional[int] = None
+    delivery_method: Optional[DeliveryMethodEnum] = None
+    module_count: Optional[int] = None
+    lesson_count: Optional[int] = None
+    updated_date: Optional[str] = None
+
+
+class CourseSummaryPage(BaseModel):
+    """A page of course summaries."""
+    items: List[CourseSummary]
+    total: int
+    next_cursor: Optional[str] = None
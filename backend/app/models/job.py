@@ -0,0 +1,48 @@
+"""Background job models."""
+
+from pydantic import BaseModel, Field
+from typing import Any, Dict, Optional
+from enum import Enum
+from datetime import datetime
+
+
+class JobStatusEnum(str, Enum):
+    """Background job states."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+# States a job never leaves
+FINISHED_JOB_STATUSES = frozenset({
+    JobStatusEnum.SUCCEEDED,
+    JobStatusEnum.FAILED,
+    JobStatusEnum.CANCELLED,
+})
+
+
+class JobCreate(BaseModel):
+    """Job submission model."""
+    kind: str
+    payload: Dict[str, Any] = {}
+    priority: int = Field(default=0, ge=-100, le=100)  # higher runs first
+
+
+class Job(BaseModel):
+    """A unit of work run by the background job queue."""
+    id: str
+    kind: str
+    status: JobStatusEnum = JobStatusEnum.QUEUED
+    priority: int = 0
+    payload: Dict[str, Any] = {}
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_date: str = Field(default_factory=lambda: datetime.now().isoformat())
+    started_date: Optional[str] = None
+    finished_date: Optional[str] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_JOB_STATUSES
@@ -1,7 +1,12 @@
 """AI Engine service for course content generation."""
 
-from typing import Dict, Any, Optional, List
+from typing import AsyncIterator, Callable, Dict, Any, Iterator, Optional, List, Tuple
+import asyncio
+import copy
 import json
+import re
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
 from app.models.course import (
     Course,
@@ -11,32 +16,142 @@ from app.models.course import (
     Assessment,
     CourseLevelEnum,
 )
+from app.core.config import settings
+from app.services.generation_cache import GenerationCache, cache_key, create_generation_cache
+from app.services.lexicon import lexicon_service
+from app.services.llm_provider import LLMError, LLMProvider, LLMResponse, create_llm_provider
+from app.services.prompt_templates import PromptTemplateService, course_values, prompt_templates
+from app.services.usage import TokenMeter, estimate_message_tokens, estimate_tokens, metered, record_usage
+
+# Sentence boundaries used by the mock summarizer
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+")
+
+
+class ModuleOutline(BaseModel):
+    """A planned module, before its lessons are written."""
+    number: int
+    title: str
+    description: str = ""
+
+
+# Validators for the keys each section must return
+SECTION_FIELDS = {
+    "objectives": (("learningObjectives", TypeAdapter(List[LearningObjective])),),
+    "module_outline": (("modules", TypeAdapter(List[ModuleOutline])),),
+    "module": (("module", TypeAdapter(Module)),),
+    "assessments": (("assessments", TypeAdapter(List[Assessment])),),
+    "description": (("overview", TypeAdapter(str)), ("description", TypeAdapter(str))),
+    "lesson": (("lesson", TypeAdapter(Lesson)),),
+    "assessment": (("assessment", TypeAdapter(Assessment)),),
+}
+
+# Sections that can be generated on their own; modules are outlined first,
+# then each module is written by its own request
+GENERATION_SECTIONS = ("objectives", "modules", "assessments", "description")
+
+# Sections generated for a full course, in output order
+FULL_COURSE_SECTIONS = ("objectives", "modules", "assessments", "description")
+
+# Parts of a stored course that can be regenerated on their own
+REGENERATION_TARGETS = ("objectives", "module", "lesson", "assessment")
+
+# Result keys produced by each section
+SECTION_OUTPUT_KEYS = {
+    "objectives": ("learningObjectives",),
+    "modules": ("modules",),
+    "assessments": ("assessments",),
+    "description": ("overview", "description"),
+}
+
+# Word-sized chunks used to stream mock chat replies
+STREAM_CHUNK_PATTERN = re.compile(r"\s*\S+")
+
+
+def course_generation_context(course: Course) -> Dict[str, Any]:
+    """Build a generation context from a stored course, as the editor does."""
+    return {
+        "title": course.title,
+        "level": course.level.value if course.level else None,
+        "thematic": course.thematic.value if course.thematic else None,
+        "targetAudience": course.target_audience,
+    }
+
+
+class SharedGeneration:
+    """
+    A generation in flight that several requests follow.
+
+    Section events are kept as they are emitted, so a request joining late
+    still sees every event from the start.
+    """
+
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        self.events: List[Tuple[str, Dict[str, Any]]] = []
+        self.finished = False
+        self._changed = asyncio.Event()
+
+    def emit(self, event: str, data: Dict[str, Any]):
+        """Record an event and wake the followers."""
+        self.events.append((event, data))
+        self._changed.set()
+
+    def finish(self):
+        """Mark the generation done and wake the followers."""
+        self.finished = True
+        self._changed.set()
+
+    async def follow(self) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Yield every event, including those already emitted, until the generation is done."""
+        index = 0
+        while True:
+            while index < len(self.events):
+                yield self.events[index]
+                index += 1
+            if self.finished:
+                return
+            self._changed.clear()
+            await self._changed.wait()
 
 
 class AIEngine:
     """
     AI Engine for generating course content.
 
-    This is a placeholder implementation that returns mock data.
-    In production, this would integrate with an actual AI service
-    (e.g., OpenAI, Anthropic, etc.)
+    With an LLM provider configured, content is generated by the model and
+    validated against the course models. Without one, the engine returns
+    mock data. Prompts are rendered from the compiled prompt templates.
     """
 
-    # Bloom's Taxonomy verbs by level
-    OBJECTIVE_VERBS = {
-        "awareness": ["identify", "recognize", "describe", "list", "recall", "name"],
-        "foundational": ["explain", "summarize", "classify", "compare", "discuss", "interpret"],
-        "basic": ["apply", "demonstrate", "use", "implement", "execute", "solve"],
-        "intermediate": ["analyze", "differentiate", "examine", "investigate", "organize", "distinguish"],
-        "advanced": ["evaluate", "assess", "critique", "justify", "recommend", "judge"],
-        "expert": ["design", "create", "develop", "formulate", "construct", "synthesize"],
-        "senior": ["lead", "direct", "strategize", "transform", "innovate", "orchestrate"],
-    }
+    # Used when the lexicon lists no verbs for a level
+    DEFAULT_VERBS = ("describe",)
+
+    def __init__(
+        self,
+        provider: Optional[LLMProvider] = None,
+        cache: Optional[GenerationCache] = None,
+        templates: Optional[PromptTemplateService] = None,
+    ):
+        self.provider = provider
+        self.cache = cache
+        self.templates = templates or prompt_templates
+        self._inflight: Dict[str, SharedGeneration] = {}
+        self.coalesced = 0
+
+    def _objective_verbs(self, level: str) -> Tuple[str, ...]:
+        """Get Bloom's Taxonomy verbs for a level from the lexicon."""
+        snapshot = lexicon_service.snapshot
+        return (
+            snapshot.objective_verbs(level)
+            or snapshot.objective_verbs("basic")
+            or self.DEFAULT_VERBS
+        )
 
     async def generate_content(
         self,
         course_context: Dict[str, Any],
         generation_type: str,
+        fresh: bool = False,
     ) -> Dict[str, Any]:
         """
         Generate course content based on context.
@@ -44,27 +159,412 @@ class AIEngine:
         Args:
             course_context: Current course data and settings
             generation_type: Type of content to generate (objectives, modules, assessments, full)
+            fresh: Generate anew instead of reusing a cached result
 
         Returns:
             Generated content
+
+        Identical requests made while one is already generating, streamed or
+        not, share its result instead of starting another generation. The
+        shared work is shielded, so cancelling one caller does not cancel it
+        for the rest, and its token usage is recorded against every caller
+        that receives the result.
+        """
+        sections = self._sections_for(generation_type)
+        if sections is None:
+            return {"error": f"Unknown generation type: {generation_type}"}
+
+        key = self._request_key(course_context, generation_type)
+        if self.cache is not None and not fresh:
+            cached = await self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        generation = self._join_generation(key, course_context, sections)
+        results, errors, usage = await asyncio.shield(generation.task)
+        record_usage(usage.prompt_tokens, usage.completion_tokens, usage.calls)
+        if not results:
+            return {"error": "; ".join(errors.values())}
+
+        # Every caller gets its own copy, since routes edit the result they return
+        merged = copy.deepcopy(self._merge_sections(results, sections))
+        if errors:
+            merged["errors"] = dict(errors)
+        return merged
+
+    def _join_generation(
+        self,
+        key: str,
+        course_context: Dict[str, Any],
+        sections: Tuple[str, ...],
+    ) -> "SharedGeneration":
+        """Get the generation in flight for a request, starting it if there is none."""
+        generation = self._inflight.get(key)
+        if generation is not None:
+            self.coalesced += 1
+            return generation
+
+        generation = SharedGeneration()
+        generation.task = asyncio.create_task(self._generate_shared(key, course_context, sections, generation.emit))
+        self._inflight[key] = generation
+        generation.task.add_done_callback(lambda done: self._finish_inflight(key, generation))
+        return generation
+
+    async def _generate_shared(
+        self,
+        key: str,
+        course_context: Dict[str, Any],
+        sections: Tuple[str, ...],
+        emit: Callable[[str, Dict[str, Any]], None],
+    ) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str], TokenMeter]:
+        """
+        Generate the sections of a request and cache them if every one succeeded.
+
+        The work may be shared by several callers, so its usage is metered
+        apart from the caller that started it and returned with the result.
+        """
+        with metered(detached=True) as usage:
+            results, errors = await self._run_sections(course_context, sections, emit)
+
+        if self.cache is not None and results and not errors:
+            await self.cache.set(key, self._merge_sections(results, sections))
+        return results, errors, usage
+
+    def _finish_inflight(self, key: str, generation: "SharedGeneration"):
+        """Forget a finished in-flight generation."""
+        if self._inflight.get(key) is generation:
+            del self._inflight[key]
+        generation.finish()
+        if not generation.task.cancelled():
+            # Mark the exception retrieved in case every caller was cancelled
+            generation.task.exception()
+
+    @property
+    def inflight(self) -> int:
+        """Number of distinct generations currently running."""
+        return len(self._inflight)
+
+    async def generate_stream(
+        self,
+        course_context: Dict[str, Any],
+        generation_type: str,
+        fresh: bool = False,
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Generate course content, yielding parts as they complete.
+
+        Yields (event, data) pairs: a "module" event for each generated
+        module, a "section" event as each section completes (module data is
+        not repeated there), an "error" event for each failed section or
+        module, and a final "done" event listing the completed sections.
+        Cached results are replayed as the same events, unless fresh.
+
+        Streams join an identical generation already in flight, streamed or
+        not, and receive its events from the start. Closing one stream does
+        not stop the generation for the others.
+        """
+        sections = self._sections_for(generation_type)
+        if sections is None:
+            yield "error", {"message": f"Unknown generation type: {generation_type}"}
+            return
+
+        key = self._request_key(course_context, generation_type)
+        if self.cache is not None and not fresh:
+            cached = await self.cache.get(key)
+            if cached is not None:
+                for event in self._replay_events(cached, sections):
+                    yield event
+                return
+
+        generation = self._join_generation(key, course_context, sections)
+        async for event, data in generation.follow():
+            yield event, copy.deepcopy(data)
+        results, errors, usage = generation.task.result()
+        record_usage(usage.prompt_tokens, usage.completion_tokens, usage.calls)
+        yield "done", {"sections": [section for section in sections if section in results]}
+
+    @staticmethod
+    def _sections_for(generation_type: str) -> Optional[Tuple[str, ...]]:
+        """Get the sections produced by a generation type, or None if unknown."""
+        if generation_type == "full":
+            return FULL_COURSE_SECTIONS
+        if generation_type in GENERATION_SECTIONS:
+            return (generation_type,)
+        return None
+
+    def fingerprint(self) -> Dict[str, Any]:
+        """Describe the model and settings that shape generated output."""
+        return {
+            "provider": self.provider.name if self.provider else "mock",
+            "model": self.provider.model if self.provider else None,
+            "temperature": settings.AI_TEMPERATURE,
+            "max_tokens": settings.AI_MAX_TOKENS,
+            "prompts": self.templates.fingerprint,
+            "lexicon": lexicon_service.get_response("templates").etag,
+        }
+
+    def _request_key(self, course_context: Dict[str, Any], generation_type: str) -> str:
+        """Get the key identifying equivalent generation requests."""
+        return cache_key(course_context, generation_type, self.fingerprint())
+
+    @staticmethod
+    def _merge_sections(results: Dict[str, Dict[str, Any]], sections: Tuple[str, ...]) -> Dict[str, Any]:
+        """Merge per-section results in section order."""
+        merged: Dict[str, Any] = {}
+        for section in sections:
+            merged.update(results.get(section, {}))
+        return merged
+
+    @staticmethod
+    def _replay_events(result: Dict[str, Any], sections: Tuple[str, ...]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Turn a complete result back into the events generate_stream emits."""
+        for section in sections:
+            if section == "modules":
+                modules = result.get("modules", [])
+                for index, module in enumerate(modules):
+                    yield "module", {"index": index, "module": module}
+                yield "section", {"section": section, "count": len(modules)}
+            else:
+                data = {key: result[key] for key in SECTION_OUTPUT_KEYS[section] if key in result}
+                yield "section", {"section": section, "data": data}
+        yield "done", {"sections": list(sections), "cached": True}
+
+    async def _run_sections(
+        self,
+        course_context: Dict[str, Any],
+        sections: Tuple[str, ...],
+        emit: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+    ) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
+        """
+        Generate independent sections concurrently.
+
+        At most AI_MAX_CONCURRENCY generation requests run at once and each
+        is limited to AI_SECTION_TIMEOUT seconds. Module outlines start
+        right away; each module is then written in parallel once the
+        objectives are ready. Returns the results of the sections that
+        succeeded and an error message per failed section or module.
+        """
+        emit = emit or (lambda event, data: None)
+        semaphore = asyncio.Semaphore(settings.AI_MAX_CONCURRENCY)
+        results: Dict[str, Dict[str, Any]] = {}
+        errors: Dict[str, str] = {}
+
+        async def call(task: str, context: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(
+                        self.generate_section(task, context),
+                        settings.AI_SECTION_TIMEOUT,
+                    )
+                except asyncio.TimeoutError:
+                    raise LLMError(f"Generating {task} timed out after {settings.AI_SECTION_TIMEOUT:g}s")
+
+        async def objectives_for_modules(objectives_task: Optional[asyncio.Task]) -> List[Dict[str, Any]]:
+            if objectives_task is None:
+                return course_context.get("learningObjectives") or []
+            generated = await objectives_task
+            return generated["learningObjectives"] if generated else []
+
+        async def write_module(index: int, outline: Dict[str, Any], objectives: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+            context = {**course_context, "learningObjectives": objectives, "module": outline}
+            try:
+                module = (await call("module", context))["module"]
+            except LLMError as e:
+                errors[f"modules[{index}]"] = str(e)
+                emit("error", {"section": "modules", "index": index, "message": str(e)})
+                return None
+            emit("module", {"index": index, "module": module})
+            return module
+
+        async def generate_modules(objectives_task: Optional[asyncio.Task]) -> Dict[str, Any]:
+            outline = (await call("module_outline", course_context))["modules"]
+            objectives = await objectives_for_modules(objectives_task)
+            modules = await asyncio.gather(*(
+                write_module(index, entry, objectives) for index, entry in enumerate(outline)
+            ))
+            modules = [module for module in modules if module is not None]
+            if not modules:
+                raise LLMError("No modules were generated")
+            return {"modules": modules}
+
+        async def run_section(section: str, objectives_task: Optional[asyncio.Task]) -> Optional[Dict[str, Any]]:
+            try:
+                if section == "modules":
+                    data = await generate_modules(objectives_task)
+                else:
+                    data = await call(section, course_context)
+            except LLMError as e:
+                errors[section] = str(e)
+                emit("error", {"section": section, "message": str(e)})
+                return None
+
+            results[section] = data
+            if section == "modules":
+                emit("section", {"section": section, "count": len(data["modules"])})
+            else:
+                emit("section", {"section": section, "data": data})
+            return data
+
+        tasks: Dict[str, asyncio.Task] = {}
+        try:
+            for section in sections:
+                tasks[section] = asyncio.create_task(run_section(section, tasks.get("objectives")))
+            await asyncio.gather(*tasks.values())
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+        return results, errors
+
+    async def regenerate(
+        self,
+        course: Course,
+        target: str,
+        target_id: Optional[str] = None,
+    ) -> Optional[Tuple[str, Any, Any]]:
+        """
+        Regenerate one part of a stored course.
+
+        The target is the objective set, or the module, lesson or assessment
+        with ID target_id. Only that part is sent for generation, with the
+        rest of the course as context, and the regenerated part keeps its
+        ID and number.
+
+        Returns the JSON Pointer of the part with its old and new values, or
+        None if the course has no such part.
+        """
+        stored = course.model_dump(mode="json")
+        context = {
+            **course_generation_context(course),
+            "learningObjectives": stored["learning_objectives"],
+        }
+
+        if target == "objectives":
+            generated = await self.generate_section("objectives", context)
+            return "/learning_objectives", stored["learning_objectives"], generated["learningObjectives"]
+
+        if target == "module":
+            for index, module in enumerate(stored["modules"]):
+                if module["id"] == target_id:
+                    outline = {key: module[key] for key in ("number", "title", "description")}
+                    generated = (await self.generate_section("module", {**context, "module": outline}))["module"]
+                    return f"/modules/{index}", module, {**generated, "id": module["id"], "number": module["number"]}
+            return None
+
+        if target == "lesson":
+            for index, module in enumerate(stored["modules"]):
+                for lesson_index, lesson in enumerate(module["lessons"]):
+                    if lesson["id"] == target_id:
+                        outline = {key: module[key] for key in ("number", "title", "description")}
+                        generated = (await self.generate_section(
+                            "lesson", {**context, "module": outline, "lesson": lesson}
+                        ))["lesson"]
+                        return (
+                            f"/modules/{index}/lessons/{lesson_index}",
+                            lesson,
+                            {**generated, "id": lesson["id"], "number": lesson["number"]},
+                        )
+            return None
+
+        if target == "assessment":
+            for index, assessment in enumerate(stored["assessments"]):
+                if assessment["id"] == target_id:
+                    generated = (await self.generate_section(
+                        "assessment", {**context, "assessment": assessment}
+                    ))["assessment"]
+                    return f"/assessments/{index}", assessment, {**generated, "id": assessment["id"]}
+            return None
+
+        raise ValueError(f"Unknown regeneration target: {target}")
+
+    async def generate_section(self, task: str, course_context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run one generation request: a section, a module outline or a single module.
+
+        Uses the LLM provider, or the mock engine without one.
+        """
+        messages = self._section_messages(task, course_context)
+        if self.provider is None:
+            result = await self.mock_section(task, course_context)
+            record_usage(estimate_message_tokens(messages), estimate_tokens(json.dumps(result)))
+            return result
+
+        response = await self.provider.complete(messages, json_mode=True)
+        self._record_response(messages, response)
+        return self._parse_section(task, response.text)
+
+    @staticmethod
+    def _record_response(messages: List[Dict[str, str]], response: LLMResponse):
+        """Record a provider call's token usage, estimating it if the provider reported none."""
+        if response.total_tokens:
+            record_usage(response.prompt_tokens, response.completion_tokens)
+        else:
+            record_usage(estimate_message_tokens(messages), estimate_tokens(response.text))
+
+    async def mock_section(self, task: str, course_context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run one generation request against the mock engine.
+
+        Records no usage, so stand-in providers can answer with it too.
         """
         title = course_context.get("title", "Untitled Course")
         level = course_context.get("level", "basic")
         thematic = course_context.get("thematic", "personal-skills")
         target_audience = course_context.get("targetAudience", "Professionals")
 
-        if generation_type == "objectives":
+        if task == "objectives":
             return await self._generate_objectives(title, level, thematic)
-        elif generation_type == "modules":
-            return await self._generate_modules(title, level, thematic)
-        elif generation_type == "assessments":
+        elif task == "module_outline":
+            return await self._generate_module_outline(title)
+        elif task == "module":
+            return await self._generate_module(course_context.get("module") or {})
+        elif task == "assessments":
             return await self._generate_assessments(title, level)
-        elif generation_type == "description":
+        elif task == "description":
             return await self._generate_description(title, level, thematic, target_audience)
-        elif generation_type == "full":
-            return await self._generate_full_course(title, level, thematic, target_audience)
+        elif task == "lesson":
+            return await self._generate_lesson(course_context.get("module") or {}, course_context.get("lesson") or {})
+        elif task == "assessment":
+            return await self._generate_assessment(title, level, course_context.get("assessment") or {})
         else:
-            return {"error": f"Unknown generation type: {generation_type}"}
+            raise LLMError(f"Unknown generation task: {task}")
+
+    def _section_messages(self, section: str, course_context: Dict[str, Any]) -> List[Dict[str, str]]:
+        """
+        Build the chat messages for generating one section.
+
+        The system message depends only on the course, so every section of
+        a course starts with the same cached prefix; the task follows.
+        """
+        template = self.templates.get(f"section_{section}")
+        values = {"COURSE_CONTEXT": json.dumps(course_context, ensure_ascii=False)}
+        if "OBJECTIVE_VERBS" in template.placeholders:
+            values["OBJECTIVE_VERBS"] = ", ".join(self._objective_verbs(course_context.get("level", "basic")))
+
+        return [
+            {"role": "system", "content": self.templates.prefix(("generation_system", "course"), course_values(course_context))},
+            {"role": "user", "content": template.render(values)},
+        ]
+
+    @staticmethod
+    def _parse_section(section: str, text: str) -> Dict[str, Any]:
+        """Parse and validate a model's JSON output for one section."""
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            raise LLMError(f"Model returned invalid JSON for {section}")
+        if not isinstance(data, dict):
+            raise LLMError(f"Model returned invalid JSON for {section}")
+
+        result = {}
+        for key, adapter in SECTION_FIELDS[section]:
+            if key not in data:
+                raise LLMError(f"Model response for {section} is missing '{key}'")
+            try:
+                result[key] = adapter.dump_python(adapter.validate_python(data[key]))
+            except ValidationError as e:
+                raise LLMError(f"Model returned invalid {key}: {e}")
+        return result
 
     async def _generate_objectives(
         self,
@@ -73,7 +573,7 @@ class AIEngine:
         thematic: str,
     ) -> Dict[str, Any]:
         """Generate learning objectives."""
-        verbs = self.OBJECTIVE_VERBS.get(level, self.OBJECTIVE_VERBS["basic"])
+        verbs = self._objective_verbs(level)
 
         objectives = [
             LearningObjective(
@@ -103,13 +603,8 @@ class AIEngine:
             "learningObjectives": [obj.model_dump() for obj in objectives],
         }
 
-    async def _generate_modules(
-        self,
-        title: str,
-        level: str,
-        thematic: str,
-    ) -> Dict[str, Any]:
-        """Generate course modules and lessons."""
+    async def _generate_module_outline(self, title: str) -> Dict[str, Any]:
+        """Generate the module plan for a course."""
         module_titles = [
             f"Introduction to {title}",
             f"Core Concepts of {title}",
@@ -117,41 +612,75 @@ class AIEngine:
             f"Advanced Topics and Case Studies",
         ]
 
-        modules = []
-        for i, mod_title in enumerate(module_titles):
-            lessons = [
-                Lesson(
-                    id=f"lesson-{i+1}-{j+1}",
-                    number=j + 1,
-                    title=f"Lesson {j+1}: {mod_title} Part {j+1}",
-                    duration=45,
-                    content=f"Content for {mod_title} - Part {j+1}",
-                    key_points=[
-                        f"Key point 1 for lesson {j+1}",
-                        f"Key point 2 for lesson {j+1}",
-                        f"Key point 3 for lesson {j+1}",
-                    ],
-                    activities=[
-                        f"Discussion activity for lesson {j+1}",
-                        f"Practical exercise for lesson {j+1}",
-                    ],
-                )
-                for j in range(3)
-            ]
+        return {
+            "modules": [
+                {
+                    "number": i + 1,
+                    "title": mod_title,
+                    "description": f"This module covers {mod_title.lower()}",
+                }
+                for i, mod_title in enumerate(module_titles)
+            ],
+        }
 
-            modules.append(
-                Module(
-                    id=f"module-{i+1}",
-                    number=i + 1,
-                    title=mod_title,
-                    description=f"This module covers {mod_title.lower()}",
-                    duration=sum(l.duration for l in lessons),
-                    lessons=lessons,
-                )
-            )
+    async def _generate_module(self, outline: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate the lessons of one outlined module."""
+        number = outline.get("number", 1)
+        mod_title = outline.get("title", f"Module {number}")
+
+        lessons = [self._mock_lesson(number, j + 1, mod_title) for j in range(3)]
+
+        module = Module(
+            id=f"module-{number}",
+            number=number,
+            title=mod_title,
+            description=outline.get("description", ""),
+            duration=sum(l.duration for l in lessons),
+            lessons=lessons,
+        )
 
         return {
-            "modules": [mod.model_dump() for mod in modules],
+            "module": module.model_dump(),
+        }
+
+    @staticmethod
+    def _mock_lesson(module_number: int, number: int, mod_title: str) -> Lesson:
+        """Build one mock lesson of a module."""
+        return Lesson(
+            id=f"lesson-{module_number}-{number}",
+            number=number,
+            title=f"Lesson {number}: {mod_title} Part {number}",
+            duration=45,
+            content=f"Content for {mod_title} - Part {number}",
+            key_points=[
+                f"Key point 1 for lesson {number}",
+                f"Key point 2 for lesson {number}",
+                f"Key point 3 for lesson {number}",
+            ],
+            activities=[
+                f"Discussion activity for lesson {number}",
+                f"Practical exercise for lesson {number}",
+            ],
+        )
+
+    async def _generate_lesson(self, module: Dict[str, Any], lesson: Dict[str, Any]) -> Dict[str, Any]:
+        """Rewrite one lesson of a module."""
+        module_number = module.get("number", 1)
+        number = lesson.get("number", 1)
+        rewritten = self._mock_lesson(module_number, number, module.get("title", f"Module {module_number}"))
+        return {
+            "lesson": rewritten.model_copy(update={"id": lesson.get("id", rewritten.id)}).model_dump(),
+        }
+
+    async def _generate_assessment(self, title: str, level: str, assessment: Dict[str, Any]) -> Dict[str, Any]:
+        """Rewrite one assessment, keeping its type where the mock has one to match."""
+        candidates = (await self._generate_assessments(title, level))["assessments"]
+        rewritten = next(
+            (candidate for candidate in candidates if candidate["type"] == assessment.get("type")),
+            candidates[0],
+        )
+        return {
+            "assessment": {**rewritten, "id": assessment.get("id", rewritten["id"])},
         }
 
     async def _generate_assessments(
@@ -226,36 +755,99 @@ Upon completion, participants will be able to apply their learning directly to t
             "description": description,
         }
 
-    async def _generate_full_course(
+    def _chat_messages(self, message: str, course_context: Optional[Dict[str, Any]]) -> List[Dict[str, str]]:
+        """Build the chat messages sent to the LLM provider."""
+        messages = [{"role": "system", "content": self.templates.render("chat_system")}]
+        if course_context:
+            messages.append({
+                "role": "system",
+                "content": self.templates.render(
+                    "chat_course", {"COURSE_CONTEXT": json.dumps(course_context, ensure_ascii=False)}
+                ),
+            })
+        messages.append({"role": "user", "content": message})
+        return messages
+
+    async def chat_stream(
         self,
-        title: str,
-        level: str,
-        thematic: str,
-        target_audience: str,
-    ) -> Dict[str, Any]:
-        """Generate a complete course."""
-        objectives = await self._generate_objectives(title, level, thematic)
-        modules = await self._generate_modules(title, level, thematic)
-        assessments = await self._generate_assessments(title, level)
-        description = await self._generate_description(title, level, thematic, target_audience)
+        message: str,
+        course_context: Optional[Dict[str, Any]] = None,
+        messages: Optional[List[Dict[str, str]]] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Process a chat message and yield the response as it is produced.
 
-        return {
-            **objectives,
-            **modules,
-            **assessments,
-            **description,
-        }
+        Prebuilt messages, such as a chat session's context, replace the
+        ones built from the message and course context.
+        """
+        if self.provider is not None:
+            messages = messages or self._chat_messages(message, course_context)
+            parts = []
+            usage = [0, 0]
+
+            def on_usage(prompt_tokens: int, completion_tokens: int):
+                usage[:] = [prompt_tokens, completion_tokens]
+
+            try:
+                async for delta in self.provider.stream(messages, on_usage=on_usage):
+                    parts.append(delta)
+                    yield delta
+            finally:
+                # A stream cut short never gets its usage report, so what was sent and received is estimated
+                self._record_response(messages, LLMResponse("".join(parts), self.provider.model, *usage))
+            return
+
+        for chunk in STREAM_CHUNK_PATTERN.findall(await self.chat(message, course_context, messages)):
+            yield chunk
 
     async def chat(
         self,
         message: str,
         course_context: Optional[Dict[str, Any]] = None,
+        messages: Optional[List[Dict[str, str]]] = None,
     ) -> str:
         """
         Process a chat message and return a response.
 
-        This is a placeholder that returns helpful mock responses.
+        Without an LLM provider this returns helpful mock responses.
+        """
+        messages = messages or self._chat_messages(message, course_context)
+        if self.provider is not None:
+            response = await self.provider.complete(messages)
+            self._record_response(messages, response)
+            return response.text
+
+        reply = self.mock_chat_reply(message, course_context)
+        record_usage(estimate_message_tokens(messages), estimate_tokens(reply))
+        return reply
+
+    async def summarize(self, summary: str, turns: List[Dict[str, str]], max_tokens: int) -> str:
         """
+        Fold conversation turns into a running summary.
+
+        Without an LLM provider the summary keeps the first sentence of each turn.
+        """
+        if self.provider is not None:
+            transcript = "\n".join(f"{turn['role'].capitalize()}: {turn['content']}" for turn in turns)
+            messages = [
+                {"role": "system", "content": self.templates.render("summary_system")},
+                {"role": "user", "content": self.templates.render(
+                    "summary_request", {"CHAT_SUMMARY": summary or "(none)", "CHAT_TRANSCRIPT": transcript}
+                )},
+            ]
+            response = await self.provider.complete(messages, max_tokens=max_tokens)
+            self._record_response(messages, response)
+            return response.text.strip()
+
+        lines = [summary] if summary else []
+        for turn in turns:
+            first_sentence = SENTENCE_PATTERN.split(turn["content"].strip(), maxsplit=1)[0]
+            lines.append(f"{turn['role'].capitalize()}: {first_sentence}")
+        return "\n".join(lines)
+
+    @staticmethod
+    def mock_chat_reply(message: str, course_context: Optional[Dict[str, Any]]) -> str:
+        """Pick a canned chat reply for the mock engine."""
         message_lower = message.lower()
 
         if "objective" in message_lower:
@@ -275,6 +867,18 @@ Upon completion, participants will be able to apply their learning directly to t
 
         return "I'm here to help you create an effective course! I can assist with:\n\n• Generating learning objectives\n• Structuring course modules\n• Creating assessments\n• Reviewing your course design\n\nWhat would you like help with?"
 
+    async def start(self):
+        """Compile the prompt templates and prepare the generation cache."""
+        await self.templates.start()
+        if self.cache is not None:
+            await self.cache.start()
+
+    async def close(self):
+        """Stop watching the prompt templates and release the provider's pooled connections."""
+        await self.templates.stop()
+        if self.provider is not None:
+            await self.provider.close()
+
 
 # Singleton instance
-ai_engine = AIEngine()
+ai_engine = AIEngine(create_llm_provider(), create_generation_cache())
@@ -0,0 +1,321 @@
+"""Server-side chat sessions with a token-budgeted context."""
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+from app.services.ai_engine import AIEngine, ai_engine
+from app.services.rate_limit import ai_rate_limiter
+from app.services.search import tokenize
+from app.services.usage import CHARS_PER_TOKEN, estimate_tokens, metered, usage_tracker
+
+# Turns always kept verbatim, however long they are
+MIN_RECENT_TURNS = 2
+
+
+class ChatTurn(NamedTuple):
+    """One message of a conversation with its estimated token count."""
+    role: str
+    content: str
+    tokens: int
+
+
+def truncate_to_tokens(text: str, tokens: int, keep_end: bool = False) -> str:
+    """Cut a text to roughly a token budget, keeping its start or its end."""
+    limit = tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    return "…" + text[-limit:] if keep_end else text[:limit] + "…"
+
+
+def _field(course: Dict[str, Any], snake: str, camel: str, default: Any = None) -> Any:
+    """Read a course field from a stored course or an editor snapshot."""
+    value = course.get(snake)
+    if value is None:
+        value = course.get(camel)
+    return default if value is None else value
+
+
+def course_header(course: Dict[str, Any]) -> str:
+    """Describe a course in a line or two; always part of the chat context."""
+    parts = [f"Title: {course.get('title') or 'Untitled'}"]
+    for label, snake, camel in (
+        ("Code", "code", "code"),
+        ("Level", "level", "level"),
+        ("Thematic", "thematic", "thematic"),
+        ("Audience", "target_audience", "targetAudience"),
+        ("Duration", "duration", "duration"),
+    ):
+        value = _field(course, snake, camel)
+        if value:
+            parts.append(f"{label}: {value}")
+    return "; ".join(parts)
+
+
+def course_sections(course: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """Split a course into titled text sections the chat context is chosen from."""
+    sections = []
+
+    overview = "\n".join(text for text in (course.get("overview"), course.get("description")) if text)
+    if overview:
+        sections.append(("Overview", overview))
+
+    objectives = _field(course, "learning_objectives", "learningObjectives", [])
+    if objectives:
+        sections.append((
+            "Learning objectives",
+            "\n".join(f"- [{objective.get('type', '')}] {objective.get('text', '')}" for objective in objectives),
+        ))
+
+    for module in course.get("modules") or []:
+        lines = [module.get("description", "")]
+        for lesson in module.get("lessons") or []:
+            lines.append(f"- {lesson.get('title', '')}: {'; '.join(lesson.get('key_points') or [])}")
+        sections.append((
+            f"Module {module.get('number', '')}: {module.get('title', '')}",
+            "\n".join(line for line in lines if line),
+        ))
+
+    assessments = course.get("assessments") or []
+    if assessments:
+        sections.append((
+            "Assessments",
+            "\n".join(
+                f"- {assessment.get('title', '')} ({assessment.get('type', '')}): "
+                f"{'; '.join(assessment.get('criteria') or [])}"
+                for assessment in assessments
+            ),
+        ))
+    return sections
+
+
+def select_course_context(course: Dict[str, Any], query: str, budget: int) -> str:
+    """
+    Build the course part of a chat context within a token budget.
+
+    The header is always included. Sections are ranked by how many of the
+    query's search terms they contain, and the relevant ones are added best
+    first until the budget runs out. If nothing matches, the overview
+    stands in.
+    """
+    text = course_header(course)
+    remaining = budget - estimate_tokens(text)
+    terms = set(tokenize(query))
+
+    scored = []
+    for position, (title, body) in enumerate(course_sections(course)):
+        score = len(terms.intersection(tokenize(f"{title} {body}")))
+        scored.append((score, position, title, body))
+    relevant = sorted((entry for entry in scored if entry[0] > 0), key=lambda entry: (-entry[0], entry[1]))
+    if not relevant:
+        relevant = [entry for entry in scored if entry[2] == "Overview"]
+
+    chosen = []
+    for _, position, title, body in relevant:
+        if remaining <= 0:
+            break
+        section = truncate_to_tokens(f"{title}\n{body}", remaining)
+        remaining -= estimate_tokens(section)
+        chosen.append((position, section))
+
+    # Keep the course's own order so the context reads naturally
+    return "\n\n".join([text] + [section for _, section in sorted(chosen)])
+
+
+class ChatSession:
+    """
+    A conversation about one course.
+
+    Recent turns are kept verbatim; older turns are folded into a running
+    summary once the history outgrows its token budget.
+    """
+
+    def __init__(self, course_id: Optional[str] = None, course_context: Optional[Dict[str, Any]] = None):
+        self.id = str(uuid.uuid4())
+        self.course_id = course_id
+        self.course_context = course_context
+        self.summary = ""
+        self.turns: List[ChatTurn] = []
+        self.summarized_turns = 0
+        self.created_date = datetime.now().isoformat()
+        self.last_used = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    @property
+    def history_tokens(self) -> int:
+        return sum(turn.tokens for turn in self.turns)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Describe the session for the API."""
+        return {
+            "id": self.id,
+            "course_id": self.course_id,
+            "summary": self.summary,
+            "turns": [{"role": turn.role, "content": turn.content} for turn in self.turns],
+            "summarized_turns": self.summarized_turns,
+            "history_tokens": self.history_tokens,
+            "created_date": self.created_date,
+        }
+
+
+class ChatSessionStore:
+    """
+    Keeps chat sessions in memory and builds their model context.
+
+    Each message is sent with the system prompt, the relevant parts of the
+    course, the summary of older turns and the recent turns, all within
+    CHAT_CONTEXT_TOKENS, so the prompt stays the same size however long
+    the conversation runs. Sessions idle for CHAT_SESSION_TTL seconds, or
+    beyond the CHAT_MAX_SESSIONS most recently used, are dropped.
+    """
+
+    def __init__(self, engine: AIEngine):
+        self.engine = engine
+        self._sessions: "OrderedDict[str, ChatSession]" = OrderedDict()
+        self._compactions: Dict[str, asyncio.Task] = {}
+        self.summary_failures = 0
+        self.error: Optional[str] = None
+
+    def _prune(self):
+        """Drop expired sessions and those beyond the session limit."""
+        cutoff = time.monotonic() - settings.CHAT_SESSION_TTL
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if session.last_used >= cutoff and len(self._sessions) <= settings.CHAT_MAX_SESSIONS:
+                break
+            del self._sessions[session_id]
+
+    def create(self, course_id: Optional[str] = None, course_context: Optional[Dict[str, Any]] = None) -> ChatSession:
+        """Start a session about a stored course or a course snapshot."""
+        session = ChatSession(course_id, course_context)
+        self._sessions[session.id] = session
+        self._prune()
+        return session
+
+    def get(self, session_id: str) -> Optional[ChatSession]:
+        """Get a live session, marking it as used."""
+        self._prune()
+        session = self._sessions.get(session_id)
+        if session is not None:
+            session.last_used = time.monotonic()
+            self._sessions.move_to_end(session_id)
+        return session
+
+    def delete(self, session_id: str) -> bool:
+        """End a session."""
+        return self._sessions.pop(session_id, None) is not None
+
+    def build_messages(
+        self,
+        session: ChatSession,
+        message: str,
+        course: Optional[Dict[str, Any]],
+    ) -> List[Dict[str, str]]:
+        """
+        Build the token-budgeted messages for the next reply.
+
+        Turns beyond CHAT_HISTORY_TOKENS, which a pending compaction has not
+        folded into the summary yet, are left out rather than overflowing
+        the context.
+        """
+        templates = self.engine.templates
+        messages = [{"role": "system", "content": templates.render("chat_system")}]
+        turns = self._recent_turns(session, settings.CHAT_HISTORY_TOKENS)
+        budget = settings.CHAT_CONTEXT_TOKENS - sum(estimate_tokens(turn["content"]) for turn in turns)
+
+        if session.summary:
+            messages.append({"role": "system", "content": templates.render("chat_summary", {"CHAT_SUMMARY": session.summary})})
+            budget -= estimate_tokens(session.summary)
+
+        if course:
+            # Rank sections against the new message and the user's previous turn
+            previous = next((turn.content for turn in reversed(session.turns) if turn.role == "user"), "")
+            context = select_course_context(course, f"{message} {previous}", max(budget, 0))
+            messages.insert(1, {"role": "system", "content": templates.render("chat_course", {"COURSE_CONTEXT": context})})
+
+        messages.extend(turns)
+        messages.append({"role": "user", "content": message})
+        return messages
+
+    @staticmethod
+    def _recent_turns(session: ChatSession, budget: int) -> List[Dict[str, str]]:
+        """Get the newest turns that fit a token budget, cutting down the last MIN_RECENT_TURNS if needed."""
+        turns = []
+        for index, turn in enumerate(reversed(session.turns)):
+            content = turn.content
+            if turn.tokens > budget:
+                if index >= MIN_RECENT_TURNS:
+                    break
+                content = truncate_to_tokens(content, max(budget, 0) // (MIN_RECENT_TURNS - index))
+            budget -= estimate_tokens(content)
+            turns.append({"role": turn.role, "content": content})
+        turns.reverse()
+        return turns
+
+    def record_exchange(self, session: ChatSession, message: str, reply: str, client: Optional[str] = None):
+        """Add a message and its reply, compacting the history in the background if needed."""
+        session.turns.append(ChatTurn("user", message, estimate_tokens(message)))
+        session.turns.append(ChatTurn("assistant", reply, estimate_tokens(reply)))
+        if session.history_tokens > settings.CHAT_HISTORY_TOKENS and session.id not in self._compactions:
+            task = asyncio.create_task(self._compact(session, client))
+            self._compactions[session.id] = task
+            task.add_done_callback(lambda _: self._compactions.pop(session.id, None))
+
+    async def _compact(self, session: ChatSession, client: Optional[str]):
+        """Fold the oldest turns into the summary until the history fits its budget."""
+        async with session.lock:
+            keep = len(session.turns)
+            tokens = session.history_tokens
+            while keep > MIN_RECENT_TURNS and tokens > settings.CHAT_HISTORY_TOKENS:
+                tokens -= session.turns[len(session.turns) - keep].tokens
+                keep -= 1
+            folded = session.turns[:len(session.turns) - keep]
+            if not folded:
+                return
+
+            with metered() as meter:
+                try:
+                    summary = await self.engine.summarize(
+                        session.summary,
+                        [{"role": turn.role, "content": turn.content} for turn in folded],
+                        settings.CHAT_SUMMARY_TOKENS,
+                    )
+                except Exception as e:
+                    # Fold the turns anyway, so the history cannot keep growing while the model fails
+                    self.summary_failures += 1
+                    self.error = str(e)
+                    summary = self._fallback_summary(session.summary, folded)
+                else:
+                    self.error = None
+            if client:
+                ai_rate_limiter.charge(client, meter.total_tokens)
+            usage_tracker.record(meter, session.course_id, client)
+
+            session.summary = truncate_to_tokens(summary, settings.CHAT_SUMMARY_TOKENS, keep_end=True)
+            session.turns = session.turns[len(folded):]
+            session.summarized_turns += len(folded)
+
+    @staticmethod
+    def _fallback_summary(summary: str, turns: List[ChatTurn]) -> str:
+        """Summarize without the model: the previous summary and the start of each folded turn."""
+        share = max(settings.CHAT_SUMMARY_TOKENS // (len(turns) + 1), 1)
+        lines = [truncate_to_tokens(summary, share, keep_end=True)] if summary else []
+        lines.extend(f"{turn.role.capitalize()}: {truncate_to_tokens(turn.content, share)}" for turn in turns)
+        return "\n".join(lines)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the number of live sessions and failed summaries."""
+        return {
+            "sessions": len(self._sessions),
+            "compacting": len(self._compactions),
+            "summary_failures": self.summary_failures,
+            "error": self.error,
+        }
+
+
+# Singleton instance
+chat_session_store = ChatSessionStore(ai_engine)
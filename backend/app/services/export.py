@@ -2,15 +2,28 @@
 
 import json
 import os
-from typing import Optional
+from enum import Enum
+from typing import Dict, Optional
 from datetime import datetime
 
 from app.models.course import Course
 from app.core.config import settings
+from app.core.executor import run_io
+from app.services.pdf import PDFWriter
+
+
+def _label(value: Optional[Enum]) -> str:
+    """Turn an enum value such as 'personal-skills' into 'Personal Skills'."""
+    return value.value.replace("-", " ").title() if value else ""
 
 
 class ExportService:
-    """Service for exporting courses to various formats."""
+    """
+    Service for exporting courses to various formats.
+
+    Rendering and file writes run on the I/O thread pool so large exports
+    do not block the event loop.
+    """
 
     def __init__(self):
         self.export_dir = settings.EXPORT_DIR
@@ -22,58 +35,137 @@ class ExportService:
 
         Returns the file path of the exported file.
         """
-        # Prepare export data
-        export_data = course.model_dump()
-
-        if not include_metadata:
-            export_data.pop("metadata", None)
-
         # Generate filename
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"{course.code or 'course'}_{timestamp}.json"
         filepath = os.path.join(self.export_dir, filename)
 
         # Write file
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False)
+        await run_io(self._write_json, filepath, course, include_metadata)
 
         return filepath
 
+    def _write_json(self, filepath: str, course: Course, include_metadata: bool):
+        """Serialize the course and write it to disk."""
+        # Prepare export data
+        export_data = course.model_dump()
+
+        if not include_metadata:
+            export_data.pop("metadata", None)
+
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump(export_data, f, indent=2, ensure_ascii=False)
+
     async def export_pdf(self, course: Course, include_metadata: bool = True) -> str:
         """
         Export course to PDF format.
 
-        This is a placeholder implementation.
-        In production, this would use a PDF generation library.
+        Returns the file path of the exported file.
         """
-        # Placeholder - return a message about PDF generation
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"{course.code or 'course'}_{timestamp}.pdf"
         filepath = os.path.join(self.export_dir, filename)
 
-        # Create a placeholder text file
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write("PDF EXPORT PLACEHOLDER\n")
-            f.write("=" * 50 + "\n\n")
-            f.write(f"Course: {course.title}\n")
-            f.write(f"Code: {course.code}\n")
-            f.write(f"Level: {course.level}\n")
-            f.write(f"Thematic: {course.thematic}\n")
-            f.write(f"Duration: {course.duration} hours\n\n")
-            f.write("Description:\n")
-            f.write(course.description or "No description provided.\n\n")
-            f.write("Learning Objectives:\n")
-            for obj in course.learning_objectives:
-                f.write(f"  - [{obj.type}] {obj.text}\n")
-            f.write("\nModules:\n")
-            for mod in course.modules:
-                f.write(f"  {mod.number}. {mod.title}\n")
-                for lesson in mod.lessons:
-                    f.write(f"    - Lesson {lesson.number}: {lesson.title}\n")
-            f.write("\n\nNote: This is a placeholder. Full PDF generation requires additional libraries.")
+        await run_io(self._write_pdf, filepath, course, include_metadata)
 
         return filepath
 
+    def _write_pdf(self, filepath: str, course: Course, include_metadata: bool):
+        """
+        Render the course to a PDF file.
+
+        Pages are written out as the modules and lessons are walked, so
+        only the page being laid out is held in memory. Each module gets a
+        bookmark, with its lessons nested under it.
+        """
+        with open(filepath, "wb") as f:
+            pdf = PDFWriter(
+                f,
+                title=course.title,
+                author=course.metadata.author,
+                footer=f"{course.code} · {course.title}" if course.code else course.title,
+            )
+
+            # Title page
+            pdf.heading(course.title, level=0, bookmark=0)
+            pdf.rule()
+            details = [
+                ("Code", course.code),
+                ("Level", _label(course.level)),
+                ("Thematic", course.custom_thematic or _label(course.thematic)),
+                ("Delivery", _label(course.delivery_method)),
+                ("Duration", f"{course.duration} hours" if course.duration else ""),
+                ("Target audience", course.target_audience),
+            ]
+            if include_metadata:
+                details += [
+                    ("Author", course.metadata.author),
+                    ("Organization", course.metadata.organization),
+                    ("Reviewer", course.metadata.reviewer),
+                    ("Version", course.metadata.version),
+                    ("Updated", course.metadata.updated_date[:10]),
+                ]
+            for label, value in details:
+                if value:
+                    pdf.text(f"{label}: {value}", space_after=2.0)
+
+            if course.overview:
+                pdf.heading("Overview", level=1, bookmark=1)
+                pdf.text(course.overview)
+            if course.description:
+                pdf.heading("Description", level=1, bookmark=1)
+                pdf.text(course.description)
+
+            if course.learning_objectives:
+                pdf.heading("Learning Objectives", level=1, bookmark=0)
+                objectives = sorted(course.learning_objectives, key=lambda objective: objective.order)
+                children: Dict[str, list] = {}
+                for objective in objectives:
+                    if objective.parent_id:
+                        children.setdefault(objective.parent_id, []).append(objective)
+                known = {objective.id for objective in objectives}
+                for objective in objectives:
+                    if objective.parent_id and objective.parent_id in known:
+                        continue
+                    pdf.text(objective.text, indent=14, bullet="•", space_after=3.0)
+                    for enabling in children.get(objective.id, []):
+                        pdf.text(enabling.text, indent=32, bullet="–", space_after=3.0)
+
+            for module in course.modules:
+                pdf.page_break()
+                pdf.heading(f"Module {module.number}: {module.title}", level=0, bookmark=0)
+                if module.duration:
+                    pdf.text(f"Duration: {module.duration} minutes", space_after=4.0)
+                if module.description:
+                    pdf.text(module.description)
+                for lesson in module.lessons:
+                    pdf.heading(f"Lesson {lesson.number}: {lesson.title}", level=2, bookmark=1)
+                    if lesson.duration:
+                        pdf.text(f"Duration: {lesson.duration} minutes", space_after=4.0)
+                    if lesson.content:
+                        pdf.text(lesson.content)
+                    for title, items in (("Key points", lesson.key_points), ("Activities", lesson.activities)):
+                        if items:
+                            pdf.text(title, style="bold", space_before=2.0, space_after=2.0)
+                            for item in items:
+                                pdf.text(item, indent=14, bullet="•", space_after=2.0)
+
+            if course.assessments:
+                pdf.page_break()
+                pdf.heading("Assessments", level=0, bookmark=0)
+                for assessment in course.assessments:
+                    pdf.heading(f"{assessment.title} ({assessment.type})", level=2, bookmark=1)
+                    facts = [f"Passing score: {assessment.passing_score}%"]
+                    if assessment.duration:
+                        facts.append(f"Duration: {assessment.duration} minutes")
+                    pdf.text(" · ".join(facts), space_after=4.0)
+                    if assessment.description:
+                        pdf.text(assessment.description)
+                    for criterion in assessment.criteria:
+                        pdf.text(criterion, indent=14, bullet="•", space_after=2.0)
+
+            pdf.close()
+
     async def export_docx(self, course: Course, include_metadata: bool = True) -> str:
         """
         Export course to DOCX format.
@@ -85,6 +177,12 @@ class ExportService:
         filename = f"{course.code or 'course'}_{timestamp}.docx"
         filepath = os.path.join(self.export_dir, filename)
 
+        await run_io(self._write_docx, filepath, course)
+
+        return filepath
+
+    def _write_docx(self, filepath: str, course: Course):
+        """Write the DOCX placeholder file."""
         # Create a placeholder text file
         with open(filepath, "w", encoding="utf-8") as f:
             f.write("DOCX EXPORT PLACEHOLDER\n")
@@ -93,8 +191,6 @@ class ExportService:
             f.write(f"Course Code: {course.code}\n")
             f.write(f"\nNote: This is a placeholder. Full DOCX generation requires the python-docx library.")
 
-        return filepath
-
     async def export_scorm(self, course: Course) -> str:
         """
         Export course to SCORM format.
@@ -106,6 +202,12 @@ class ExportService:
         filename = f"{course.code or 'course'}_{timestamp}_scorm.zip"
         filepath = os.path.join(self.export_dir, filename)
 
+        await run_io(self._write_scorm, filepath, course)
+
+        return filepath
+
+    def _write_scorm(self, filepath: str, course: Course):
+        """Write the SCORM placeholder file."""
         # Create a placeholder text file
         with open(filepath, "w", encoding="utf-8") as f:
             f.write("SCORM EXPORT PLACEHOLDER\n")
@@ -113,8 +215,6 @@ class ExportService:
             f.write(f"Course: {course.title}\n")
             f.write(f"\nNote: This is a placeholder. Full SCORM package generation requires additional implementation.")
 
-        return filepath
-
 
 # Singleton instance
 export_service = ExportService()
@@ -0,0 +1,301 @@
+"""Content-addressed cache for AI generation results."""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.executor import run_io
+from app.services.storage import atomic_write_json
+
+
+def normalize_context(value: Any) -> Any:
+    """
+    Normalize a generation context so equivalent requests hash the same.
+
+    Whitespace in strings is collapsed, and empty values are dropped from
+    objects. Letter case is kept because it shows up in generated text.
+    """
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, dict):
+        normalized = {}
+        for key, item in value.items():
+            item = normalize_context(item)
+            if item not in (None, "", [], {}):
+                normalized[key] = item
+        return normalized
+    if isinstance(value, (list, tuple)):
+        return [normalize_context(item) for item in value]
+    return value
+
+
+def cache_key(course_context: Dict[str, Any], generation_type: str, fingerprint: Dict[str, Any]) -> str:
+    """Hash a generation request and the model settings into a cache key."""
+    canonical = json.dumps(
+        {
+            "context": normalize_context(course_context),
+            "type": generation_type,
+            "model": fingerprint,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class GenerationCache:
+    """
+    LRU cache of generation results with a TTL and an optional disk tier.
+
+    Results are stored as encoded JSON, so every hit returns a fresh copy
+    and the memory bound is measured in bytes as well as entries. With the
+    disk tier enabled, results are also written to one file per key and
+    survive restarts; a memory miss falls back to disk before counting as
+    a miss. The disk tier is held to the same entry and byte limits, with
+    the least recently used files removed as new ones are written.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float = 86400.0,
+        disk_dir: Optional[str] = None,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.disk_dir = disk_dir
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._bytes = 0
+        # Files in the disk tier with their size, least recently used first; loaded on first use
+        self._disk_entries: "Optional[OrderedDict[str, int]]" = None
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "disk_evictions": 0,
+            "expirations": 0,
+        }
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def _disk_path(self, key: str) -> str:
+        """Get the disk tier file for a key."""
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _remember(self, key: str, expires_at: float, body: bytes):
+        """Put an entry in the memory tier, evicting the least recently used."""
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous[1])
+            if len(body) > self.max_bytes:
+                return
+
+            self._entries[key] = (expires_at, body)
+            self._bytes += len(body)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self._stats["evictions"] += 1
+
+    def _lookup(self, key: str) -> Optional[bytes]:
+        """Look up a live entry in the memory tier."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, body = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                self._bytes -= len(body)
+                self._stats["expirations"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return body
+
+    def _load_disk_index(self):
+        """Index the disk tier's live files, oldest first, removing expired ones and any over the limits."""
+        now = time.time()
+        found = []
+        for name in os.listdir(self.disk_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.disk_dir, name)
+            try:
+                stat = os.stat(path)
+                with open(path, "r", encoding="utf-8") as f:
+                    live = json.load(f).get("expires_at", 0) > now
+            except FileNotFoundError:
+                continue
+            except (json.JSONDecodeError, UnicodeDecodeError, AttributeError):
+                live = False
+            if live:
+                found.append((stat.st_mtime, name[:-len(".json")], stat.st_size))
+            else:
+                self._remove_disk_file(path)
+
+        with self._lock:
+            self._disk_entries = OrderedDict((key, size) for _, key, size in sorted(found))
+            self._disk_bytes = sum(self._disk_entries.values())
+            evicted = self._evict_disk_locked()
+        for key in evicted:
+            self._remove_disk_file(self._disk_path(key))
+
+    def _evict_disk_locked(self) -> List[str]:
+        """Drop the least recently used disk entries over the limits from the index; returns their keys."""
+        evicted = []
+        while self._disk_entries and (len(self._disk_entries) > self.max_entries or self._disk_bytes > self.max_bytes):
+            key, size = self._disk_entries.popitem(last=False)
+            self._disk_bytes -= size
+            self._stats["disk_evictions"] += 1
+            evicted.append(key)
+        return evicted
+
+    def _forget_disk(self, key: str):
+        """Drop a key from the disk index."""
+        with self._lock:
+            if self._disk_entries is not None:
+                size = self._disk_entries.pop(key, None)
+                if size is not None:
+                    self._disk_bytes -= size
+
+    @staticmethod
+    def _remove_disk_file(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _read_disk(self, key: str) -> Optional[Tuple[float, bytes]]:
+        """Read a live entry from the disk tier, removing it if expired."""
+        path = self._disk_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        expires_at = record.get("expires_at", 0)
+        if expires_at <= time.time():
+            self._remove_disk_file(path)
+            self._forget_disk(key)
+            with self._lock:
+                self._stats["expirations"] += 1
+            return None
+        with self._lock:
+            if self._disk_entries is not None and key in self._disk_entries:
+                self._disk_entries.move_to_end(key)
+        return expires_at, json.dumps(record.get("value"), ensure_ascii=False).encode("utf-8")
+
+    def _write_disk(self, key: str, expires_at: float, value: Dict[str, Any]):
+        """Write an entry to the disk tier, evicting the least recently used files over the limits."""
+        if self._disk_entries is None:
+            self._load_disk_index()
+        path = self._disk_path(key)
+        atomic_write_json(path, {"expires_at": expires_at, "value": value})
+        size = os.path.getsize(path)
+
+        self._forget_disk(key)
+        with self._lock:
+            self._disk_entries[key] = size
+            self._disk_bytes += size
+            evicted = self._evict_disk_locked()
+        for evicted_key in evicted:
+            self._remove_disk_file(self._disk_path(evicted_key))
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached result, or None on a miss."""
+        body = self._lookup(key)
+        if body is None and self.disk_dir:
+            entry = await run_io(self._read_disk, key)
+            if entry is not None:
+                self._remember(key, *entry)
+                body = entry[1]
+                with self._lock:
+                    self._stats["disk_hits"] += 1
+
+        if body is None:
+            with self._lock:
+                self._stats["misses"] += 1
+            return None
+        return json.loads(body)
+
+    async def set(self, key: str, value: Dict[str, Any]):
+        """Cache a result."""
+        expires_at = time.time() + self.ttl
+        body = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        self._remember(key, expires_at, body)
+        with self._lock:
+            self._stats["stores"] += 1
+        if self.disk_dir:
+            await run_io(self._write_disk, key, expires_at, value)
+
+    def _clear_disk(self) -> int:
+        """Remove every disk tier file. Returns the count removed."""
+        removed = 0
+        for name in os.listdir(self.disk_dir):
+            if not name.endswith(".json"):
+                continue
+            try:
+                os.remove(os.path.join(self.disk_dir, name))
+                removed += 1
+            except FileNotFoundError:
+                pass
+        with self._lock:
+            self._disk_entries = OrderedDict()
+            self._disk_bytes = 0
+        return removed
+
+    async def clear(self) -> int:
+        """Drop every cached result. Returns the number of memory entries dropped."""
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+        if self.disk_dir:
+            await run_io(self._clear_disk)
+        return count
+
+    async def start(self):
+        """Index the disk tier, pruning expired results and any over the limits."""
+        if self.disk_dir:
+            await run_io(self._load_disk_index)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and current size."""
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["disk_hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hit_rate": (self._stats["hits"] + self._stats["disk_hits"]) / lookups if lookups else 0.0,
+                "disk": bool(self.disk_dir),
+                "disk_entries": len(self._disk_entries or ()),
+                "disk_bytes": self._disk_bytes,
+            }
+
+
+def create_generation_cache() -> Optional[GenerationCache]:
+    """Create the generation cache configured in settings, or None if disabled."""
+    if not settings.AI_CACHE_ENABLED:
+        return None
+    return GenerationCache(
+        max_entries=settings.AI_CACHE_MAX_ENTRIES,
+        max_bytes=settings.AI_CACHE_MAX_BYTES,
+        ttl=settings.AI_CACHE_TTL,
+        disk_dir=os.path.join(settings.DATA_DIR, settings.AI_CACHE_DIR) if settings.AI_CACHE_DISK else None,
+    )
@@ -0,0 +1,290 @@
+"""In-process background job queue with persisted job state."""
+
+import asyncio
+import itertools
+import json
+import os
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+
+from app.core.config import settings
+from app.core.executor import run_io
+from app.models.job import Job, JobStatusEnum
+from app.services.storage import atomic_write_json
+
+# Handlers take the validated payload and return a JSON-serializable result
+JobHandler = Callable[[Any], Awaitable[Any]]
+
+
+class JobQueueFull(Exception):
+    """Raised when a job is submitted while JOB_MAX_QUEUED jobs are waiting."""
+
+
+class UnknownJobKind(ValueError):
+    """Raised when a job is submitted for a kind with no registered handler."""
+
+
+class JobQueue:
+    """
+    Priority queue of background jobs served by a fixed pool of workers.
+
+    Each job kind has a handler, registered by the module that owns the
+    work, and an optional pydantic model its payload is validated against
+    at submission. Higher priorities run first, and jobs of equal priority
+    run in submission order. Every state change is written to one JSON file
+    per job under DATA_DIR/JOB_DIR, so queued jobs, and jobs interrupted
+    while running, are queued again on the next start. Finished jobs are
+    kept for JOB_RETENTION seconds; their results are only kept on disk and
+    read back by fetch.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        workers: Optional[int] = None,
+        max_queued: Optional[int] = None,
+    ):
+        self.directory = directory or os.path.join(settings.DATA_DIR, settings.JOB_DIR)
+        self.workers = workers or settings.JOB_WORKERS
+        self.max_queued = max_queued or settings.JOB_MAX_QUEUED
+        self._handlers: Dict[str, Tuple[JobHandler, Optional[Type[BaseModel]]]] = {}
+        self._jobs: Dict[str, Job] = {}
+        self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._sequence = itertools.count()
+        self._worker_tasks: List[asyncio.Task] = []
+        self._running: Dict[str, asyncio.Task] = {}
+        self._save_locks: Dict[str, asyncio.Lock] = {}
+
+    def register(self, kind: str, handler: JobHandler, model: Optional[Type[BaseModel]] = None):
+        """Register the handler for a job kind."""
+        self._handlers[kind] = (handler, model)
+
+    @property
+    def kinds(self) -> List[str]:
+        """Get the registered job kinds."""
+        return sorted(self._handlers)
+
+    def _path(self, job_id: str) -> str:
+        """Get the state file for a job."""
+        return os.path.join(self.directory, f"{job_id}.json")
+
+    async def _save(self, job: Job):
+        """
+        Persist a job's current state.
+
+        Saves of one job are serialized and each writes the state as of its
+        turn, so the last state set is the one left on disk.
+        """
+        async with self._save_locks.setdefault(job.id, asyncio.Lock()):
+            await run_io(atomic_write_json, self._path(job.id), job.model_dump(mode="json"))
+
+    def _remove_file(self, job_id: str):
+        """Delete a job's state file."""
+        try:
+            os.remove(self._path(job_id))
+        except FileNotFoundError:
+            pass
+
+    def _read_job(self, job_id: str) -> Optional[Job]:
+        """Read one persisted job, or None if it is missing or unreadable."""
+        try:
+            with open(self._path(job_id), "r", encoding="utf-8") as f:
+                return Job.model_validate(json.load(f))
+        except (OSError, json.JSONDecodeError, ValidationError):
+            return None
+
+    def _load_all(self) -> List[Job]:
+        """Read every persisted job, skipping unreadable files."""
+        os.makedirs(self.directory, exist_ok=True)
+        jobs = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json") or name.startswith("."):
+                continue
+            try:
+                with open(os.path.join(self.directory, name), "r", encoding="utf-8") as f:
+                    jobs.append(Job.model_validate(json.load(f)))
+            except (OSError, json.JSONDecodeError, ValidationError):
+                continue
+        return jobs
+
+    def _expired(self, job: Job, now: datetime) -> bool:
+        """Check whether a finished job is past its retention period."""
+        if not job.finished or not job.finished_date:
+            return False
+        return datetime.fromisoformat(job.finished_date) < now - timedelta(seconds=settings.JOB_RETENTION)
+
+    async def _prune(self):
+        """Forget finished jobs past their retention period."""
+        now = datetime.now()
+        expired = [job_id for job_id, job in self._jobs.items() if self._expired(job, now)]
+        for job_id in expired:
+            del self._jobs[job_id]
+            self._save_locks.pop(job_id, None)
+            await run_io(self._remove_file, job_id)
+
+    def _enqueue(self, job: Job):
+        """Put a queued job on the priority queue."""
+        self._queue.put_nowait((-job.priority, next(self._sequence), job.id))
+
+    async def submit(self, kind: str, payload: Optional[Dict[str, Any]] = None, priority: int = 0) -> Job:
+        """
+        Queue a job.
+
+        Raises UnknownJobKind for an unregistered kind, ValidationError for
+        a payload its model rejects and JobQueueFull when the queue is full.
+        """
+        if kind not in self._handlers:
+            raise UnknownJobKind(f"Unknown job kind: {kind}")
+        _, model = self._handlers[kind]
+        payload = payload or {}
+        if model is not None:
+            payload = model.model_validate(payload).model_dump(mode="json")
+
+        await self._prune()
+        queued = sum(1 for job in self._jobs.values() if job.status == JobStatusEnum.QUEUED)
+        if queued >= self.max_queued:
+            raise JobQueueFull(f"Job queue is full ({queued} jobs waiting)")
+
+        job = Job(id=str(uuid.uuid4()), kind=kind, priority=priority, payload=payload)
+        self._jobs[job.id] = job
+        await self._save(job)
+        self._enqueue(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Get a job by ID, without the result of a finished job."""
+        return self._jobs.get(job_id)
+
+    async def fetch(self, job_id: str) -> Optional[Job]:
+        """Get a job by ID, reading a finished job's result back from disk."""
+        job = self._jobs.get(job_id)
+        if job is None or job.status != JobStatusEnum.SUCCEEDED:
+            return job
+        return await run_io(self._read_job, job_id) or job
+
+    def list_jobs(self, status: Optional[JobStatusEnum] = None, kind: Optional[str] = None) -> List[Job]:
+        """List jobs, newest first, without their results."""
+        jobs = [
+            job for job in self._jobs.values()
+            if (status is None or job.status == status) and (kind is None or job.kind == kind)
+        ]
+        return sorted(jobs, key=lambda job: job.created_date, reverse=True)
+
+    async def cancel(self, job_id: str) -> Optional[Job]:
+        """
+        Cancel a queued or running job.
+
+        Returns the job, unchanged if it had already finished, or None if
+        there is no such job.
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.finished:
+            return job
+
+        job.status = JobStatusEnum.CANCELLED
+        job.finished_date = datetime.now().isoformat()
+        task = self._running.get(job_id)
+        if task is not None:
+            task.cancel()
+        await self._save(job)
+        return job
+
+    async def _run(self, job: Job):
+        """Run one job and record its outcome."""
+        handler, model = self._handlers.get(job.kind, (None, None))
+        if handler is None:
+            job.status = JobStatusEnum.FAILED
+            job.error = f"Unknown job kind: {job.kind}"
+            job.finished_date = datetime.now().isoformat()
+            await self._save(job)
+            return
+
+        job.status = JobStatusEnum.RUNNING
+        job.started_date = datetime.now().isoformat()
+        await self._save(job)
+        if job.status == JobStatusEnum.CANCELLED:
+            return  # cancelled while it was being started
+
+        payload = model.model_validate(job.payload) if model is not None else job.payload
+        task = asyncio.create_task(handler(payload))
+        self._running[job.id] = task
+        try:
+            result = await task
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                # Shutting down: leave the job to be picked up again on restart
+                job.status = JobStatusEnum.QUEUED
+                job.started_date = None
+                await self._save(job)
+                raise
+            return  # cancelled through cancel(), which already recorded it
+        except Exception as e:
+            outcome = {"status": JobStatusEnum.FAILED, "error": str(getattr(e, "detail", None) or e) or type(e).__name__}
+        else:
+            outcome = {
+                "status": JobStatusEnum.SUCCEEDED,
+                "result": result.model_dump(mode="json") if isinstance(result, BaseModel) else result,
+            }
+        finally:
+            self._running.pop(job.id, None)
+
+        if job.status == JobStatusEnum.CANCELLED:
+            return  # cancel() won the race after the handler had already returned
+        for field, value in outcome.items():
+            setattr(job, field, value)
+        job.finished_date = datetime.now().isoformat()
+        await self._save(job)
+        job.result = None  # persisted; fetch reads it back
+
+    async def _worker(self):
+        """Take jobs off the queue until cancelled."""
+        while True:
+            _, _, job_id = await self._queue.get()
+            job = self._jobs.get(job_id)
+            if job is None or job.status != JobStatusEnum.QUEUED:
+                continue  # cancelled while waiting
+            await self._run(job)
+
+    async def start(self):
+        """Restore persisted jobs and start the workers."""
+        now = datetime.now()
+        for job in sorted(await run_io(self._load_all), key=lambda job: job.created_date):
+            if self._expired(job, now):
+                await run_io(self._remove_file, job.id)
+                continue
+            if job.status == JobStatusEnum.RUNNING:
+                job.status = JobStatusEnum.QUEUED
+                job.started_date = None
+                await self._save(job)
+            job.result = None
+            self._jobs[job.id] = job
+            if job.status == JobStatusEnum.QUEUED:
+                self._enqueue(job)
+
+        self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Stop the workers, leaving unfinished jobs queued for the next start."""
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+
+    def stats(self) -> Dict[str, Any]:
+        """Get job counts by status."""
+        counts = {status.value: 0 for status in JobStatusEnum}
+        for job in self._jobs.values():
+            counts[job.status.value] += 1
+        return {
+            "workers": self.workers,
+            "max_queued": self.max_queued,
+            "kinds": self.kinds,
+            **counts,
+        }
+
+
+# Singleton instance
+job_queue = JobQueue()
@@ -0,0 +1,276 @@
+"""Resident lexicon cache with hot reload."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+from app.core.executor import run_io
+from app.services.search import TOKEN_PATTERN
+
+logger = logging.getLogger(__name__)
+
+# British -ise/-yse spellings are folded into -ize/-yze before stemming
+BRITISH_SPELLING = re.compile(r"([iy])s(e|es|ed|ing)$")
+
+# Inflection suffixes stripped by stem_verb, longest first, with their replacements
+STEM_SUFFIXES = (
+    ("ying", "y"),
+    ("ies", "y"),
+    ("ied", "y"),
+    ("ing", ""),
+    ("es", ""),
+    ("ed", ""),
+    ("e", ""),
+    ("s", ""),
+)
+
+# Shortest stem left after stripping a suffix
+MIN_STEM_LENGTH = 2
+
+# Shorter words are only matched exactly, so 'us' never matches 'use'
+MIN_STEMMED_WORD_LENGTH = 3
+
+
+def stem_verb(word: str) -> str:
+    """
+    Reduce an English verb form to a stem shared by its inflections.
+
+    'organize', 'organises', 'organized' and 'organizing' all stem to
+    'organiz'; 'identifies' and 'identified' stem to 'identify'.
+    """
+    word = BRITISH_SPELLING.sub(lambda m: f"{m.group(1)}z{m.group(2)}", word.lower())
+    if word.endswith("ss"):
+        return word
+    for suffix, replacement in STEM_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM_LENGTH:
+            return word[:-len(suffix)] + replacement
+    return word
+
+
+class CachedResponse(NamedTuple):
+    """A pre-serialized JSON response body with its entity tag."""
+    body: bytes
+    etag: str
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively turn dicts and lists into read-only mappings and tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _serialize(content: Any) -> CachedResponse:
+    """Encode content the way JSONResponse does and derive a strong ETag."""
+    body = json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    return CachedResponse(body=body, etag=f'"{hashlib.sha1(body).hexdigest()}"')
+
+
+class LexiconSnapshot(NamedTuple):
+    """
+    An immutable view of one version of the lexicon file.
+
+    ``data`` is a read-only copy of the parsed file and ``responses`` holds
+    every endpoint body already encoded, keyed by route (``levels``,
+    ``verbs/<level>`` and so on). ``verb_levels`` and ``stem_levels`` are
+    reverse indexes from objective verbs, and their stems, to the levels
+    that list them.
+    """
+    data: Mapping[str, Any]
+    responses: Mapping[str, CachedResponse]
+    stamp: Optional[Tuple[int, int]] = None
+    loaded: bool = True
+    verb_levels: Mapping[str, Tuple[str, ...]] = MappingProxyType({})
+    stem_levels: Mapping[str, Tuple[str, ...]] = MappingProxyType({})
+
+    @classmethod
+    def build(cls, lexicon: Dict[str, Any], stamp: Optional[Tuple[int, int]] = None,
+              loaded: bool = True) -> "LexiconSnapshot":
+        """Build a snapshot and pre-serialize every sub-response."""
+        templates = lexicon.get("templates", {})
+        responses = {
+            "lexicon": _serialize(lexicon),
+            "levels": _serialize({"levels": lexicon.get("courseLevels", [])}),
+            "thematics": _serialize({"thematics": lexicon.get("courseThematics", [])}),
+            "placeholders": _serialize({"placeholders": lexicon.get("placeholders", {})}),
+            "templates": _serialize({"templates": templates}),
+            "status-codes": _serialize({"statusCodes": lexicon.get("statusCodes", {})}),
+        }
+        verb_levels: Dict[str, Tuple[str, ...]] = {}
+        stem_levels: Dict[str, Tuple[str, ...]] = {}
+        for level, verbs in templates.get("objectiveVerbs", {}).items():
+            responses[f"verbs/{level}"] = _serialize({"level": level, "verbs": verbs})
+            for verb in verbs:
+                verb = verb.lower()
+                for index, key in ((verb_levels, verb), (stem_levels, stem_verb(verb))):
+                    if level not in index.get(key, ()):
+                        index[key] = index.get(key, ()) + (level,)
+
+        return cls(
+            data=_freeze(lexicon),
+            responses=MappingProxyType(responses),
+            stamp=stamp,
+            loaded=loaded,
+            verb_levels=MappingProxyType(verb_levels),
+            stem_levels=MappingProxyType(stem_levels),
+        )
+
+    def objective_verbs(self, level: str) -> Tuple[str, ...]:
+        """Get the objective verbs listed for a level."""
+        templates = self.data.get("templates", {})
+        return templates.get("objectiveVerbs", {}).get(level, ())
+
+    def classify(self, text: str) -> Tuple[Optional[str], Tuple[str, ...]]:
+        """
+        Find the first objective verb in a text.
+
+        Returns the matched word and the levels listing it, or
+        ``(None, ())`` if the text contains no known verb.
+        """
+        for word in TOKEN_PATTERN.findall(text.lower()):
+            levels = self.verb_levels.get(word)
+            if levels is None and len(word) >= MIN_STEMMED_WORD_LENGTH:
+                levels = self.stem_levels.get(stem_verb(word))
+            if levels:
+                return word, levels
+        return None, ()
+
+
+class LexiconService:
+    """
+    Keeps the shared lexicon resident in memory.
+
+    Requests read the current snapshot without touching the file or encoding
+    JSON. A background task stats the file every LEXICON_RELOAD_INTERVAL
+    seconds and swaps in a new snapshot when it changes. If the file turns
+    out to be missing or unreadable after a good load, the last good
+    snapshot is kept.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or settings.LEXICON_PATH
+        self._lock = threading.Lock()
+        self._snapshot: Optional[LexiconSnapshot] = None
+        self._watch_task: Optional[asyncio.Task] = None
+
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        """Return the (mtime, size) stamp of the lexicon file."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _read(self) -> Tuple[Dict[str, Any], bool]:
+        """Read the lexicon file, returning an error document on failure."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f), True
+        except FileNotFoundError:
+            return {"error": "Lexicon file not found"}, False
+        except json.JSONDecodeError:
+            return {"error": "Invalid lexicon JSON"}, False
+
+    @property
+    def snapshot(self) -> LexiconSnapshot:
+        """Get the current snapshot, loading it on first use."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self.reload()
+        return snapshot
+
+    def reload(self, force: bool = True) -> LexiconSnapshot:
+        """
+        Load the lexicon file into a new snapshot.
+
+        Without force, the file is only re-read when its stamp changed.
+        """
+        with self._lock:
+            current = self._snapshot
+            stamp = self._file_stamp()
+            if not force and current is not None and stamp == current.stamp:
+                return current
+
+            lexicon, loaded = self._read()
+            if not loaded and current is not None and current.loaded:
+                # Keep serving the last good lexicon, e.g. while the file is being rewritten
+                self._snapshot = current._replace(stamp=stamp)
+                return self._snapshot
+
+            self._snapshot = LexiconSnapshot.build(lexicon, stamp=stamp, loaded=loaded)
+            return self._snapshot
+
+    def get_response(self, key: str) -> Optional[CachedResponse]:
+        """Get a pre-serialized response by route key."""
+        return self.snapshot.responses.get(key)
+
+    def classify_objectives(self, texts: List[str], level: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Classify learning objectives by their Bloom-level verb.
+
+        Each result has the matched verb, the detected level, every
+        candidate level for that verb and, when a course level is given,
+        whether the objective matches it. The whole batch is classified
+        against one snapshot.
+        """
+        snapshot = self.snapshot
+        results = []
+        for text in texts:
+            verb, levels = snapshot.classify(text)
+            results.append({
+                "text": text,
+                "verb": verb,
+                "level": levels[0] if levels else None,
+                "candidates": list(levels),
+                "matches_level": level in levels if level else None,
+            })
+        return results
+
+    async def _watch_loop(self):
+        """
+        Periodically reload the lexicon if the file changed.
+
+        A failed reload is logged and leaves the current snapshot in place;
+        the next tick tries again.
+        """
+        while True:
+            await asyncio.sleep(settings.LEXICON_RELOAD_INTERVAL)
+            try:
+                await run_io(self.reload, False)
+            except Exception:
+                logger.exception("Lexicon reload failed; keeping the current snapshot")
+
+    async def start(self):
+        """Load the lexicon and start watching it for changes."""
+        await run_io(self.reload)
+        if settings.LEXICON_RELOAD_INTERVAL > 0:
+            self._watch_task = asyncio.create_task(self._watch_loop())
+
+    async def stop(self):
+        """Stop watching the lexicon file."""
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+            self._watch_task = None
+
+
+# Singleton instance
+lexicon_service = LexiconService()
@@ -0,0 +1,324 @@
+"""LLM provider layer for AI generation."""
+
+import asyncio
+import json
+import random
+from typing import Any, AsyncIterator, Callable, Dict, List, NamedTuple, Optional
+
+import httpx
+
+from app.core.config import settings
+
+# Upstream statuses worth retrying: timeouts, rate limits and server errors
+RETRY_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+# Longest delay between retries, including any Retry-After hint
+MAX_RETRY_DELAY = 30.0
+
+# Called by a stream with the (prompt, completion) tokens the provider reported
+UsageCallback = Callable[[int, int], None]
+
+
+class LLMError(Exception):
+    """Raised when a provider request fails."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class LLMResponse(NamedTuple):
+    """A completed model response with its token usage."""
+    text: str
+    model: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+class LLMProvider:
+    """Base class for chat-completion providers."""
+
+    name = "base"
+
+    def __init__(self, model: str):
+        self.model = model
+
+    async def complete(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        json_mode: bool = False,
+        timeout: Optional[float] = None,
+    ) -> LLMResponse:
+        """
+        Run a chat completion.
+
+        Args:
+            messages: Chat messages with "role" and "content"
+            max_tokens: Completion token limit, defaulting to AI_MAX_TOKENS
+            temperature: Sampling temperature, defaulting to AI_TEMPERATURE
+            json_mode: Ask the model for a single JSON object
+            timeout: Per-request timeout overriding AI_TIMEOUT
+        """
+        raise NotImplementedError
+
+    async def stream(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        timeout: Optional[float] = None,
+        on_usage: Optional[UsageCallback] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Run a chat completion, yielding text as it is produced.
+
+        Providers without native streaming yield the whole completion at once.
+        If the provider reports the tokens used, they are passed to on_usage.
+        """
+        response = await self.complete(messages, max_tokens, temperature, timeout=timeout)
+        if on_usage is not None and response.total_tokens:
+            on_usage(response.prompt_tokens, response.completion_tokens)
+        if response.text:
+            yield response.text
+
+    async def close(self):
+        """Release any pooled connections."""
+
+
+class OpenAIProvider(LLMProvider):
+    """
+    Provider for OpenAI-compatible chat completion APIs.
+
+    All requests share one pooled ``httpx.AsyncClient``, so connections
+    (and their TLS sessions) are kept alive and reused across generations.
+    Each request has its own timeout, and transport errors, rate limits and
+    server errors are retried with jittered exponential backoff.
+    """
+
+    name = "openai"
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str,
+        base_url: str,
+        timeout: float = 60.0,
+        connect_timeout: float = 5.0,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        super().__init__(model)
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it on first use."""
+        if self._client is None or self._client.is_closed:
+            headers = {"Content-Type": "application/json"}
+            if self.api_key:
+                headers["Authorization"] = f"Bearer {self.api_key}"
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=headers,
+                timeout=self.timeout,
+                limits=self.limits,
+                transport=self._transport,
+            )
+        return self._client
+
+    def _payload(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: Optional[int],
+        temperature: Optional[float],
+        json_mode: bool,
+    ) -> Dict[str, Any]:
+        """Build a chat completion request body."""
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "max_tokens": max_tokens or settings.AI_MAX_TOKENS,
+            "temperature": settings.AI_TEMPERATURE if temperature is None else temperature,
+        }
+        if json_mode:
+            payload["response_format"] = {"type": "json_object"}
+        return payload
+
+    def _retry_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Get the delay before a retry, honouring a Retry-After header."""
+        if retry_after:
+            try:
+                return min(float(retry_after), MAX_RETRY_DELAY)
+            except ValueError:
+                pass
+        delay = min(self.retry_backoff * (2 ** attempt), MAX_RETRY_DELAY)
+        return delay * random.uniform(0.5, 1.0)
+
+    async def _send(
+        self,
+        path: str,
+        payload: Dict[str, Any],
+        timeout: Optional[float] = None,
+        stream: bool = False,
+    ) -> httpx.Response:
+        """
+        POST a JSON request, retrying transient failures.
+
+        With stream, the successful response is returned unread; retries
+        only happen before any of its body has been consumed.
+        """
+        request_timeout = httpx.Timeout(timeout, connect=self.timeout.connect) if timeout else self.timeout
+
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                request = self.client.build_request("POST", path, json=payload, timeout=request_timeout)
+                response = await self.client.send(request, stream=stream)
+            except httpx.TransportError as e:
+                error = LLMError(f"Provider request failed: {e!r}")
+            else:
+                if response.status_code < 400:
+                    return response
+                if stream:
+                    await response.aread()
+                    await response.aclose()
+                error = LLMError(
+                    f"Provider returned {response.status_code}: {response.text[:200]}",
+                    status_code=response.status_code,
+                )
+                if response.status_code not in RETRY_STATUS_CODES:
+                    raise error
+                retry_after = response.headers.get("retry-after")
+
+            if attempt == self.max_retries:
+                raise error
+            await asyncio.sleep(self._retry_delay(attempt, retry_after))
+
+    async def _post(self, path: str, payload: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """POST a JSON request and parse the JSON response."""
+        response = await self._send(path, payload, timeout=timeout)
+        try:
+            return response.json()
+        except ValueError:
+            raise LLMError("Provider returned invalid JSON")
+
+    async def complete(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        json_mode: bool = False,
+        timeout: Optional[float] = None,
+    ) -> LLMResponse:
+        """Run a chat completion against the upstream API."""
+        data = await self._post(
+            "/chat/completions",
+            self._payload(messages, max_tokens, temperature, json_mode),
+            timeout=timeout,
+        )
+
+        try:
+            text = data["choices"][0]["message"]["content"] or ""
+        except (KeyError, IndexError, TypeError):
+            raise LLMError("Provider returned an unexpected response")
+
+        usage = data.get("usage") or {}
+        return LLMResponse(
+            text=text,
+            model=data.get("model", self.model),
+            prompt_tokens=usage.get("prompt_tokens", 0),
+            completion_tokens=usage.get("completion_tokens", 0),
+        )
+
+    async def stream(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        timeout: Optional[float] = None,
+        on_usage: Optional[UsageCallback] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion from the upstream API.
+
+        The timeout applies to each read, so a slow first token or a stalled
+        stream fails instead of holding the connection open. The usage the
+        API reports in its last chunk is passed to on_usage.
+        """
+        payload = self._payload(messages, max_tokens, temperature, json_mode=False)
+        payload["stream"] = True
+        payload["stream_options"] = {"include_usage": True}
+
+        response = await self._send("/chat/completions", payload, timeout=timeout, stream=True)
+        try:
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    return
+                try:
+                    chunk = json.loads(data)
+                    delta = chunk["choices"][0]["delta"].get("content") if chunk.get("choices") else None
+                    usage = chunk.get("usage")
+                except (ValueError, KeyError, IndexError, TypeError, AttributeError):
+                    raise LLMError("Provider returned an unexpected stream chunk")
+                if usage and on_usage is not None:
+                    on_usage(usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0))
+                if delta:
+                    yield delta
+        except httpx.TransportError as e:
+            raise LLMError(f"Provider stream failed: {e!r}")
+        finally:
+            await response.aclose()
+
+    async def close(self):
+        """Close the shared HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def create_llm_provider() -> Optional[LLMProvider]:
+    """
+    Create the provider selected by settings.AI_PROVIDER.
+
+    Returns None for the built-in mock engine.
+    """
+    provider = settings.AI_PROVIDER
+
+    if provider == "mock":
+        return None
+    if provider == "openai":
+        return OpenAIProvider(
+            api_key=settings.AI_API_KEY,
+            model=settings.AI_MODEL,
+            base_url=settings.AI_API_BASE,
+            timeout=settings.AI_TIMEOUT,
+            connect_timeout=settings.AI_CONNECT_TIMEOUT,
+            max_retries=settings.AI_MAX_RETRIES,
+            retry_backoff=settings.AI_RETRY_BACKOFF,
+            max_connections=settings.AI_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.AI_MAX_KEEPALIVE_CONNECTIONS,
+        )
+
+    raise ValueError(f"Unknown AI provider: {provider}")
@@ -0,0 +1,317 @@
+"""Append-only log storage service with snapshot compaction."""
+
+import asyncio
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Union
+
+from app.models.course import Course, CourseCreate, CourseUpdate
+from app.core.config import settings
+from app.core.executor import run_io
+from app.services.patch import apply_patch
+from app.services.storage import StorageService, atomic_write_json
+
+
+class LogStorageService(StorageService):
+    """
+    Storage service that appends every mutation to a write-ahead log.
+
+    Each create, update or delete is written as one small JSON line holding
+    only that course's delta, so a write costs O(delta) instead of a full
+    catalog rewrite. A background task periodically compacts the log into a
+    snapshot. On startup the snapshot is loaded and the log is replayed on
+    top of it; a torn trailing line from a crash is discarded.
+    """
+
+    SNAPSHOT_FILE = "courses.snapshot.json"
+    LOG_FILE = "courses.log"
+
+    def __init__(self):
+        self.snapshot_file = os.path.join(settings.DATA_DIR, self.SNAPSHOT_FILE)
+        self.log_file = os.path.join(settings.DATA_DIR, self.LOG_FILE)
+        self.rotated_log_file = f"{self.log_file}.compacting"
+        self._compact_lock = threading.Lock()
+        self._seq = 0
+        self._log_entries = 0
+        self._log = None
+        self._compaction_task: Optional[asyncio.Task] = None
+        super().__init__()
+
+    def _ensure_data_file(self):
+        """Load the snapshot and replay the log, migrating courses.json if needed."""
+        os.makedirs(self.data_dir, exist_ok=True)
+
+        fresh = not any(
+            os.path.exists(path)
+            for path in (self.snapshot_file, self.log_file, self.rotated_log_file)
+        )
+        if fresh and os.path.exists(self.courses_file):
+            self.migrate_from_json()
+
+        self._load()
+        self._open_log()
+
+    def _open_log(self):
+        """Open the log for appending."""
+        self._log = open(self.log_file, "a", encoding="utf-8")
+
+    def _close_log(self):
+        """Close the log file handle."""
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+    def migrate_from_json(self) -> int:
+        """
+        Write the monolithic courses file out as the initial snapshot.
+
+        The original file is renamed with a ``.migrated`` suffix once the
+        snapshot is in place. Returns the number of migrated courses.
+        """
+        courses = [
+            Course(**record).model_dump(mode="json")
+            for record in self._read_courses()
+        ]
+        atomic_write_json(self.snapshot_file, {"seq": 0, "courses": courses})
+        os.replace(self.courses_file, f"{self.courses_file}.migrated")
+        return len(courses)
+
+    def _load(self):
+        """Load the last snapshot and replay newer log entries on top of it."""
+        records: Dict[str, dict] = {}
+        seq = 0
+
+        try:
+            with open(self.snapshot_file, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            seq = snapshot.get("seq", 0)
+            for record in snapshot.get("courses", []):
+                records[record["id"]] = record
+        except FileNotFoundError:
+            pass
+
+        self._seq = seq
+        self._log_entries = 0
+        for path in (self.rotated_log_file, self.log_file):
+            self._replay(path, records)
+
+        self._records = records
+        self._courses = {
+            course_id: Course(**record) for course_id, record in records.items()
+        }
+
+    def _replay(self, path: str, records: Dict[str, dict]):
+        """Apply log entries newer than the current sequence number."""
+        if not os.path.exists(path):
+            return
+
+        good_offset = 0
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    break
+                if not line.endswith(b"\n"):
+                    break
+                good_offset += len(line)
+                if entry["seq"] <= self._seq:
+                    continue
+                self._apply_entry(records, entry)
+                self._seq = entry["seq"]
+                self._log_entries += 1
+
+        # Drop a partially written trailing entry left by a crash
+        if good_offset < os.path.getsize(path):
+            with open(path, "r+b") as f:
+                f.truncate(good_offset)
+
+    @staticmethod
+    def _apply_entry(records: Dict[str, dict], entry: dict):
+        """Apply a single log entry to the records."""
+        op = entry["op"]
+        course_id = entry["id"]
+
+        if op == "create":
+            records[course_id] = entry["data"]
+        elif op == "update" and course_id in records:
+            record = dict(records[course_id])
+            record.update(entry["data"])
+            record["metadata"] = dict(record.get("metadata") or {})
+            record["metadata"]["updated_date"] = entry["updated_date"]
+            records[course_id] = record
+        elif op == "patch" and course_id in records:
+            course = apply_patch(Course(**records[course_id]), entry["operations"])
+            record = course.model_dump(mode="json")
+            record["metadata"]["updated_date"] = entry["updated_date"]
+            records[course_id] = record
+        elif op == "delete":
+            records.pop(course_id, None)
+
+    def _append(self, *entries: dict):
+        """Append entries to the log and flush them to disk together."""
+        lines = []
+        for entry in entries:
+            self._seq += 1
+            entry["seq"] = self._seq
+            lines.append(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+        if self._log is None:
+            self._open_log()  # written to after stop()
+        self._log.write("".join(lines))
+        self._log.flush()
+        if settings.STORAGE_LOG_FSYNC:
+            os.fsync(self._log.fileno())
+        self._log_entries += len(entries)
+
+    def _refresh_index(self):
+        """The log is only written by this process; the index is always current."""
+
+    def create_course(self, course_data: CourseCreate) -> Course:
+        """Create a new course."""
+        new_course = self._build_course(course_data)
+        record = new_course.model_dump(mode="json")
+
+        with self._lock:
+            self._append({"op": "create", "id": new_course.id, "data": record})
+            self._records[new_course.id] = record
+            self._courses[new_course.id] = new_course
+            self._index_course(new_course)
+
+        return new_course
+
+    def import_courses(self, items: List[Union[CourseCreate, Course]]) -> List[Course]:
+        """Create or replace many courses with one log append."""
+        courses = self._prepare_import(items)
+        records = [course.model_dump(mode="json") for course in courses]
+
+        with self._lock:
+            self._append(*[
+                {"op": "create", "id": course.id, "data": record}
+                for course, record in zip(courses, records)
+            ])
+            for course, record in zip(courses, records):
+                self._records[course.id] = record
+                self._courses[course.id] = course
+                self._index_course(course)
+
+        return courses
+
+    def update_course(self, course_id: str, updates: CourseUpdate) -> Optional[Course]:
+        """Update an existing course, logging only the changed fields."""
+        with self._lock:
+            if course_id not in self._records:
+                return None
+
+            record, updated = self._apply_updates(self._records[course_id], updates)
+            self._append({
+                "op": "update",
+                "id": course_id,
+                "data": updates.model_dump(mode="json", exclude_none=True),
+                "updated_date": record["metadata"]["updated_date"],
+            })
+            self._records[course_id] = record
+            self._courses[course_id] = updated
+            self._index_course(updated)
+
+        return updated
+
+    def patch_course(self, course_id: str, operations: List[dict]) -> Optional[Course]:
+        """Apply JSON Patch operations, logging only the operations themselves."""
+        with self._lock:
+            course = self._courses.get(course_id)
+            if course is None:
+                return None
+
+            patched = self._touch(apply_patch(course, operations))
+            self._append({
+                "op": "patch",
+                "id": course_id,
+                "operations": operations,
+                "updated_date": patched.metadata.updated_date,
+            })
+            self._records[course_id] = patched.model_dump(mode="json")
+            self._courses[course_id] = patched
+            self._index_course(patched)
+
+        return patched
+
+    def delete_course(self, course_id: str) -> bool:
+        """Delete a course by ID."""
+        with self._lock:
+            if course_id not in self._records:
+                return False
+
+            self._append({"op": "delete", "id": course_id})
+            del self._records[course_id]
+            self._courses.pop(course_id, None)
+            self._unindex_course(course_id)
+
+        return True
+
+    def compact(self) -> bool:
+        """
+        Fold the log into a new snapshot.
+
+        The log is rotated under the lock so writers keep appending to a
+        fresh file while the snapshot is written. Returns True if a
+        snapshot was written.
+        """
+        with self._compact_lock:
+            with self._lock:
+                if self._log_entries == 0:
+                    return False
+                if os.path.exists(self.rotated_log_file):
+                    # A previous compaction was interrupted; fold it in first
+                    return self._compact_locked()
+
+                if self._log is not None:
+                    self._log.close()
+                os.replace(self.log_file, self.rotated_log_file)
+                self._open_log()
+                snapshot = {"seq": self._seq, "courses": list(self._records.values())}
+                self._log_entries = 0
+
+            atomic_write_json(self.snapshot_file, snapshot)
+            os.remove(self.rotated_log_file)
+            return True
+
+    def _compact_locked(self) -> bool:
+        """Write a snapshot while holding the lock and clear both logs."""
+        atomic_write_json(self.snapshot_file, {
+            "seq": self._seq,
+            "courses": list(self._records.values()),
+        })
+        if self._log is not None:
+            self._log.close()
+        os.remove(self.rotated_log_file)
+        self._log = open(self.log_file, "w", encoding="utf-8")
+        self._log_entries = 0
+        return True
+
+    async def _compaction_loop(self):
+        """Periodically compact the log once it has enough entries."""
+        while True:
+            await asyncio.sleep(settings.STORAGE_COMPACT_INTERVAL)
+            if self._log_entries >= settings.STORAGE_COMPACT_MIN_ENTRIES:
+                await run_io(self.compact)
+
+    async def start(self):
+        """Start the background compaction task."""
+        if self._log is None:
+            await run_io(self._open_log)
+        self._compaction_task = asyncio.create_task(self._compaction_loop())
+
+    async def stop(self):
+        """Stop background compaction and fold the remaining log into a snapshot."""
+        if self._compaction_task is not None:
+            self._compaction_task.cancel()
+            try:
+                await self._compaction_task
+            except asyncio.CancelledError:
+                pass
+            self._compaction_task = None
+        await run_io(self.compact)
+        await run_io(self._close_log)
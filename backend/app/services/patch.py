@@ -0,0 +1,247 @@
+"""JSON Patch and JSON Merge Patch support for courses."""
+
+import functools
+from typing import Annotated, Any, Dict, List, Union, get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from pydantic_core import to_jsonable_python
+
+from app.models.course import Course
+
+PATCH_OPERATIONS = ("add", "remove", "replace", "move", "copy", "test")
+
+# Fields that identify a course and cannot be patched
+PROTECTED_FIELDS = ("id",)
+
+
+class PatchError(ValueError):
+    """Raised when a patch is malformed or cannot be applied."""
+
+
+class PatchTestFailed(PatchError):
+    """Raised when a JSON Patch ``test`` operation does not match."""
+
+
+def parse_pointer(path: str) -> List[str]:
+    """
+    Split a JSON Pointer into unescaped segments.
+
+    The leading slash is optional, so ``modules/2/lessons/1/title`` and
+    ``/modules/2/lessons/1/title`` address the same value.
+    """
+    if not isinstance(path, str):
+        raise PatchError("Patch path must be a string")
+    path = path[1:] if path.startswith("/") else path
+    if not path:
+        return []
+    return [segment.replace("~1", "/").replace("~0", "~") for segment in path.split("/")]
+
+
+def escape_pointer_segment(key: str) -> str:
+    """Escape one JSON Pointer segment."""
+    return key.replace("~", "~0").replace("/", "~1")
+
+
+def diff_operations(old: Any, new: Any, path: str = "") -> List[Dict[str, Any]]:
+    """
+    Compute JSON Patch operations that turn ``old`` into ``new``.
+
+    Objects are compared key by key and lists of the same length item by
+    item, so only the values that changed are replaced. A list that grew or
+    shrank is replaced as a whole.
+    """
+    if old == new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        operations = [
+            {"op": "remove", "path": f"{path}/{escape_pointer_segment(key)}"}
+            for key in old
+            if key not in new
+        ]
+        for key, value in new.items():
+            child = f"{path}/{escape_pointer_segment(key)}"
+            if key in old:
+                operations.extend(diff_operations(old[key], value, child))
+            else:
+                operations.append({"op": "add", "path": child, "value": value})
+        return operations
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        operations = []
+        for index, (old_item, new_item) in enumerate(zip(old, new)):
+            operations.extend(diff_operations(old_item, new_item, f"{path}/{index}"))
+        return operations
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def merge_patch_to_operations(patch: Dict[str, Any], prefix: str = "") -> List[Dict[str, Any]]:
+    """
+    Convert a JSON Merge Patch (RFC 7396) into JSON Patch operations.
+
+    Objects recurse into the matching sub-model, ``null`` resets a field to
+    its default and any other value (including lists) replaces the field.
+    """
+    if not isinstance(patch, dict):
+        raise PatchError("A merge patch must be a JSON object")
+
+    operations = []
+    for key, value in patch.items():
+        path = f"{prefix}/{escape_pointer_segment(key)}"
+        if value is None:
+            operations.append({"op": "remove", "path": path})
+        elif isinstance(value, dict):
+            operations.extend(merge_patch_to_operations(value, path))
+        else:
+            operations.append({"op": "replace", "path": path, "value": value})
+    return operations
+
+
+def _strip_optional(annotation: Any) -> Any:
+    """Unwrap Optional[X] to X."""
+    if get_origin(annotation) is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+@functools.lru_cache(maxsize=None)
+def _field_adapter(model: type, name: str) -> TypeAdapter:
+    """Get a validator for a single model field, including its constraints."""
+    field = model.model_fields[name]
+    annotation = field.annotation
+    if field.metadata:
+        annotation = Annotated[(annotation, *field.metadata)]
+    return TypeAdapter(annotation)
+
+
+@functools.lru_cache(maxsize=None)
+def _item_adapter(annotation: Any) -> TypeAdapter:
+    """Get a validator for the items of a list annotation."""
+    return TypeAdapter(get_args(_strip_optional(annotation))[0])
+
+
+def _validate(adapter: TypeAdapter, value: Any, path: str) -> Any:
+    """Validate a patched value, reporting errors against its path."""
+    try:
+        return adapter.validate_python(value)
+    except ValidationError as e:
+        raise PatchError(f"Invalid value for {path}: {e}")
+
+
+def _parse_index(segment: str, length: int, allow_end: bool) -> int:
+    """Parse a list index segment; ``-`` means the end of the list."""
+    if allow_end and segment == "-":
+        return length
+    if not segment.isdigit() or (segment != "0" and segment.startswith("0")):
+        raise PatchError(f"Invalid list index: {segment}")
+    index = int(segment)
+    if index > length or (index == length and not allow_end):
+        raise PatchError(f"List index out of range: {segment}")
+    return index
+
+
+def _get(node: Any, segments: List[str]) -> Any:
+    """Resolve a path to a value."""
+    for segment in segments:
+        if isinstance(node, BaseModel):
+            if segment not in type(node).model_fields:
+                raise PatchError(f"Unknown field: {segment}")
+            node = getattr(node, segment)
+        elif isinstance(node, list):
+            node = node[_parse_index(segment, len(node), allow_end=False)]
+        else:
+            raise PatchError(f"Path does not exist: {segment}")
+    return node
+
+
+def _update(node: Any, annotation: Any, segments: List[str], op: str, value: Any, path: str) -> Any:
+    """
+    Return a copy of ``node`` with the operation applied at ``segments``.
+
+    Only the nodes along the path are copied; untouched siblings are shared
+    with the original, and only the new value is validated.
+    """
+    segment, rest = segments[0], segments[1:]
+
+    if isinstance(node, BaseModel):
+        model = type(node)
+        field = model.model_fields.get(segment)
+        if field is None:
+            raise PatchError(f"Unknown field: {segment}")
+
+        if rest:
+            child = _update(getattr(node, segment), field.annotation, rest, op, value, path)
+        elif op == "remove":
+            if field.is_required():
+                raise PatchError(f"Cannot remove required field: {path}")
+            child = field.get_default(call_default_factory=True)
+        else:
+            child = _validate(_field_adapter(model, segment), value, path)
+        return node.model_copy(update={segment: child})
+
+    if isinstance(node, list):
+        items = list(node)
+        index = _parse_index(segment, len(items), allow_end=(op == "add" and not rest))
+
+        if rest:
+            items[index] = _update(items[index], get_args(_strip_optional(annotation))[0], rest, op, value, path)
+        elif op == "add":
+            items.insert(index, _validate(_item_adapter(annotation), value, path))
+        elif op == "replace":
+            items[index] = _validate(_item_adapter(annotation), value, path)
+        else:
+            del items[index]
+        return items
+
+    raise PatchError(f"Path does not exist: {path}")
+
+
+def apply_patch(course: Course, operations: List[Dict[str, Any]]) -> Course:
+    """
+    Apply JSON Patch (RFC 6902) operations to a course.
+
+    Each operation validates only the value it writes against the sub-model
+    field or list it targets, and copies only the objects along its path.
+    The original course is left unchanged.
+    """
+    if not isinstance(operations, list):
+        raise PatchError("A JSON Patch must be a list of operations")
+
+    for operation in operations:
+        if not isinstance(operation, dict):
+            raise PatchError("Each patch operation must be an object")
+
+        op = operation.get("op")
+        if op not in PATCH_OPERATIONS:
+            raise PatchError(f"Unsupported patch operation: {op}")
+
+        path = operation.get("path")
+        segments = parse_pointer(path)
+        if not segments:
+            raise PatchError("Patches cannot replace the whole course")
+        if segments[0] in PROTECTED_FIELDS and op != "test":
+            raise PatchError(f"Field cannot be patched: {segments[0]}")
+        if op in ("add", "replace", "test") and "value" not in operation:
+            raise PatchError(f"Operation '{op}' requires a value")
+
+        if op == "test":
+            actual = to_jsonable_python(_get(course, segments))
+            if actual != operation["value"]:
+                raise PatchTestFailed(f"Test failed at {path}")
+            continue
+
+        if op in ("move", "copy"):
+            source = parse_pointer(operation.get("from"))
+            if not source:
+                raise PatchError(f"Operation '{op}' requires a from path")
+            value = to_jsonable_python(_get(course, source))
+            if op == "move":
+                if segments[:len(source)] == source and len(segments) > len(source):
+                    raise PatchError("Cannot move a value into one of its children")
+                course = _update(course, Course, source, "remove", None, operation["from"])
+            course = _update(course, Course, segments, "add", value, path)
+            continue
+
+        course = _update(course, Course, segments, op, operation.get("value"), path)
+
+    return course
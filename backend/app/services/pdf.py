@@ -0,0 +1,391 @@
+"""Streaming PDF writer using the standard Helvetica fonts."""
+
+import functools
+import zlib
+from datetime import datetime
+from typing import BinaryIO, Dict, Iterator, List, NamedTuple, Optional
+
+# A4 portrait, in points
+PAGE_WIDTH = 595.0
+PAGE_HEIGHT = 842.0
+MARGIN = 56.0
+
+# Room kept free above the bottom margin for the page footer
+FOOTER_HEIGHT = 20.0
+
+# Text is encoded for WinAnsiEncoding; other characters are replaced with '?'
+ENCODING = "cp1252"
+
+# Advance widths of the printable ASCII characters (32-126), in 1/1000 em, from the Adobe AFM files
+HELVETICA_WIDTHS = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+HELVETICA_BOLD_WIDTHS = (
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+)
+
+# Widths of the non-ASCII punctuation course text commonly contains
+EXTRA_WIDTHS = {"•": 350, "·": 278, "–": 556, "—": 1000, "‘": 222, "’": 222, "“": 333, "”": 333, "…": 1000}
+
+# Width used for other characters, e.g. accented letters
+DEFAULT_WIDTH = 556
+
+# Font styles: resource name, PostScript name and ASCII widths
+FONTS = {
+    "regular": ("F1", "Helvetica", HELVETICA_WIDTHS),
+    "bold": ("F2", "Helvetica-Bold", HELVETICA_BOLD_WIDTHS),
+}
+
+
+class FontMetrics(NamedTuple):
+    """A font's width table and PDF font dictionary."""
+    resource: str
+    definition: bytes
+    widths: tuple  # per encoded byte, in 1/1000 em
+
+    def encode(self, text: str) -> bytes:
+        return text.replace("\t", "    ").encode(ENCODING, errors="replace")
+
+    def width(self, data: bytes, size: float) -> float:
+        """Width of encoded text at a font size, in points."""
+        widths = self.widths
+        return sum(widths[byte] for byte in data) * size / 1000
+
+
+@functools.lru_cache(maxsize=None)
+def font_metrics(style: str) -> FontMetrics:
+    """
+    Get a font's metrics, built once per process.
+
+    Helvetica is one of the standard PDF fonts every reader provides, so
+    nothing is embedded or read from disk.
+    """
+    resource, base_font, ascii_widths = FONTS[style]
+    widths = [DEFAULT_WIDTH] * 256
+    for byte in range(32):
+        widths[byte] = 0
+    widths[32:127] = ascii_widths
+    for char, width in EXTRA_WIDTHS.items():
+        widths[char.encode(ENCODING)[0]] = width
+    definition = (
+        f"<< /Type /Font /Subtype /Type1 /BaseFont /{base_font} /Encoding /WinAnsiEncoding >>"
+    ).encode("ascii")
+    return FontMetrics(resource=resource, definition=definition, widths=tuple(widths))
+
+
+def _literal(data: bytes) -> bytes:
+    """Encode bytes as a PDF literal string."""
+    escaped = data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)").replace(b"\r", b"\\r")
+    return b"(" + escaped + b")"
+
+
+def _text_string(text: str) -> bytes:
+    """Encode text for document metadata and bookmarks, which may use any Unicode character."""
+    return b"<FEFF" + text.encode("utf-16-be").hex().upper().encode("ascii") + b">"
+
+
+def _number(value: float) -> str:
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+
+class OutlineItem:
+    """A bookmark and the bookmarks nested under it."""
+
+    def __init__(self, title: str, page_id: int, top: float):
+        self.title = title
+        self.page_id = page_id
+        self.top = top
+        self.children: List["OutlineItem"] = []
+        self.id = 0
+
+
+class PDFWriter:
+    """
+    Writes a PDF page by page to a binary file.
+
+    Text is laid out top to bottom with line wrapping and automatic page
+    breaks. Each page is compressed and written out as soon as it is full,
+    so memory use is one page plus a few numbers per page and bookmark,
+    however long the document grows. Bookmarks recorded along the way
+    become the document outline when the writer is closed.
+
+    Writing is blocking; run it on the I/O thread pool.
+    """
+
+    # Object numbers fixed up front; page and outline objects follow
+    CATALOG_ID = 1
+    PAGES_ID = 2
+    OUTLINES_ID = 3
+    INFO_ID = 4
+
+    def __init__(self, file: BinaryIO, title: str = "", author: str = "", footer: str = "", compress: bool = True):
+        self.file = file
+        self.title = title
+        self.author = author
+        self.footer = footer
+        self.compress = compress
+        self._position = 0
+        self._offsets: Dict[int, int] = {}
+        self._next_id = self.INFO_ID + 1
+        self._font_ids: Dict[str, int] = {}
+        self._page_ids: List[int] = []
+        self._outline: List[OutlineItem] = []
+        self._content: Optional[List[bytes]] = None
+        self._page_id = 0
+        self.y = 0.0
+
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        for style in FONTS:
+            font_id = self._allocate()
+            self._font_ids[style] = font_id
+            self._write_object(font_id, font_metrics(style).definition)
+        self._resources = (
+            "<< /Font << "
+            + " ".join(f"/{font_metrics(style).resource} {font_id} 0 R" for style, font_id in self._font_ids.items())
+            + " >> >>"
+        ).encode("ascii")
+
+    @property
+    def page_count(self) -> int:
+        return len(self._page_ids) + (1 if self._content is not None else 0)
+
+    @property
+    def width(self) -> float:
+        """Width available for text."""
+        return PAGE_WIDTH - 2 * MARGIN
+
+    def _allocate(self) -> int:
+        object_id = self._next_id
+        self._next_id += 1
+        return object_id
+
+    def _write(self, data: bytes):
+        self.file.write(data)
+        self._position += len(data)
+
+    def _write_object(self, object_id: int, body: bytes):
+        self._offsets[object_id] = self._position
+        self._write(f"{object_id} 0 obj\n".encode("ascii") + body + b"\nendobj\n")
+
+    def _write_stream(self, object_id: int, data: bytes):
+        if self.compress:
+            data = zlib.compress(data)
+            header = f"<< /Length {len(data)} /Filter /FlateDecode >>"
+        else:
+            header = f"<< /Length {len(data)} >>"
+        self._write_object(object_id, header.encode("ascii") + b"\nstream\n" + data + b"\nendstream")
+
+    def _start_page(self):
+        self._page_id = self._allocate()
+        self._content = []
+        self.y = PAGE_HEIGHT - MARGIN
+
+    def _finish_page(self):
+        """Add the footer and write the current page out."""
+        if self._content is None:
+            return
+        number = len(self._page_ids) + 1
+        footer_y = MARGIN - FOOTER_HEIGHT
+        if self.footer:
+            self._draw_text(self.footer, MARGIN, footer_y, 8, "regular", max_width=self.width - 60)
+        label = f"Page {number}"
+        font = font_metrics("regular")
+        self._draw_text(label, PAGE_WIDTH - MARGIN - font.width(font.encode(label), 8), footer_y, 8, "regular")
+
+        content_id = self._allocate()
+        self._write_stream(content_id, b"\n".join(self._content))
+        self._write_object(self._page_id, (
+            f"<< /Type /Page /Parent {self.PAGES_ID} 0 R "
+            f"/MediaBox [0 0 {_number(PAGE_WIDTH)} {_number(PAGE_HEIGHT)}] /Resources "
+        ).encode("ascii") + self._resources + f" /Contents {content_id} 0 R >>".encode("ascii"))
+        self._page_ids.append(self._page_id)
+        self._content = None
+
+    def _ensure_room(self, height: float):
+        """Start a new page unless height fits above the footer."""
+        if self._content is None or self.y - height < MARGIN:
+            self._finish_page()
+            self._start_page()
+
+    def _draw_text(self, text: str, x: float, y: float, size: float, style: str, max_width: Optional[float] = None):
+        font = font_metrics(style)
+        data = font.encode(text)
+        if max_width is not None:
+            data = next(self._wrap(data, font, size, max_width), b"")
+        self._draw_encoded(data, x, y, size, font)
+
+    def _draw_encoded(self, data: bytes, x: float, y: float, size: float, font: FontMetrics):
+        self._content.append(
+            f"BT /{font.resource} {_number(size)} Tf 1 0 0 1 {_number(x)} {_number(y)} Tm ".encode("ascii")
+            + _literal(data) + b" Tj ET"
+        )
+
+    @staticmethod
+    def _wrap(data: bytes, font: FontMetrics, size: float, width: float) -> Iterator[bytes]:
+        """Break encoded text into lines that fit a width, splitting words too long for a line."""
+        space = font.widths[32] * size / 1000
+        line: List[bytes] = []
+        line_width = 0.0
+        for word in data.split(b" "):
+            word_width = font.width(word, size)
+            if line and line_width + space + word_width > width:
+                yield b" ".join(line)
+                line, line_width = [], 0.0
+            while word_width > width:
+                cut, cut_width = 1, font.width(word[:1], size)
+                while cut < len(word) and cut_width + font.widths[word[cut]] * size / 1000 <= width:
+                    cut_width += font.widths[word[cut]] * size / 1000
+                    cut += 1
+                yield word[:cut]
+                word = word[cut:]
+                word_width = font.width(word, size)
+            line.append(word)
+            line_width += (space if len(line) > 1 else 0.0) + word_width
+        if line:
+            yield b" ".join(line)
+
+    def text(
+        self,
+        text: str,
+        size: float = 10.5,
+        style: str = "regular",
+        indent: float = 0.0,
+        bullet: Optional[str] = None,
+        space_before: float = 0.0,
+        space_after: float = 6.0,
+        leading: float = 1.4,
+    ):
+        """
+        Add wrapped text; each line of the input starts a new paragraph.
+
+        A bullet is drawn in the indent before the first line.
+        """
+        font = font_metrics(style)
+        line_height = size * leading
+        x = MARGIN + indent
+        self.y -= space_before
+        first = True
+        for paragraph in text.splitlines() or [""]:
+            for line in self._wrap(font.encode(paragraph.strip()), font, size, self.width - indent):
+                self._ensure_room(line_height)
+                self.y -= line_height
+                if bullet and first:
+                    self._draw_text(bullet, x - 12, self.y, size, "regular")
+                self._draw_encoded(line, x, self.y, size, font)
+                first = False
+        self.y -= space_after
+
+    def heading(self, text: str, level: int = 0, bookmark: Optional[int] = None):
+        """
+        Add a heading, kept on the same page as the lines after it.
+
+        With bookmark set, the heading also gets an outline entry at that
+        nesting level.
+        """
+        size = (20.0, 15.0, 12.5)[min(level, 2)]
+        space_before = (0.0, 14.0, 8.0)[min(level, 2)]
+        self._ensure_room(space_before + size * 1.4 + 3 * 10.5 * 1.4)
+        if bookmark is not None:
+            self.bookmark(text, bookmark)
+        self.text(text, size=size, style="bold", space_before=space_before, space_after=4.0, leading=1.3)
+
+    def rule(self, space_after: float = 10.0):
+        """Draw a horizontal line across the text area."""
+        self._ensure_room(space_after)
+        y = self.y - 2
+        self._content.append(f"0.5 w {_number(MARGIN)} {_number(y)} m {_number(PAGE_WIDTH - MARGIN)} {_number(y)} l S".encode("ascii"))
+        self.y -= space_after
+
+    def page_break(self):
+        """Continue on a new page, unless the current one is still empty."""
+        if self._content:
+            self._finish_page()
+            self._start_page()
+
+    def bookmark(self, title: str, level: int = 0):
+        """Add an outline entry pointing at the current position."""
+        if self._content is None:
+            self._start_page()
+        item = OutlineItem(title, self._page_id, self.y)
+        siblings = self._outline
+        for _ in range(level):
+            if not siblings:
+                break
+            siblings = siblings[-1].children
+        siblings.append(item)
+
+    def _write_outline(self, items: List[OutlineItem], parent_id: int) -> int:
+        """Write a level of the outline; returns the number of entries shown when it is open."""
+        for item in items:
+            item.id = self._allocate()
+        for index, item in enumerate(items):
+            body = [
+                f"<< /Title ".encode("ascii") + _text_string(item.title),
+                f"/Parent {parent_id} 0 R".encode("ascii"),
+                f"/Dest [{item.page_id} 0 R /XYZ 0 {_number(item.top)} null]".encode("ascii"),
+            ]
+            if index > 0:
+                body.append(f"/Prev {items[index - 1].id} 0 R".encode("ascii"))
+            if index < len(items) - 1:
+                body.append(f"/Next {items[index + 1].id} 0 R".encode("ascii"))
+            if item.children:
+                descendants = self._write_outline(item.children, item.id)
+                # Negative: entries with children start collapsed
+                body.append(
+                    f"/First {item.children[0].id} 0 R /Last {item.children[-1].id} 0 R /Count -{descendants}".encode("ascii")
+                )
+            self._write_object(item.id, b" ".join(body) + b" >>")
+        return len(items)
+
+    def close(self):
+        """Write the last page, the outline and the document trailer."""
+        if self._content is None and not self._page_ids:
+            self._start_page()
+        self._finish_page()
+
+        if self._outline:
+            self._write_outline(self._outline, self.OUTLINES_ID)
+            self._write_object(self.OUTLINES_ID, (
+                f"<< /Type /Outlines /First {self._outline[0].id} 0 R "
+                f"/Last {self._outline[-1].id} 0 R /Count {len(self._outline)} >>"
+            ).encode("ascii"))
+        else:
+            self._write_object(self.OUTLINES_ID, b"<< /Type /Outlines /Count 0 >>")
+
+        kids = " ".join(f"{page_id} 0 R" for page_id in self._page_ids)
+        self._write_object(
+            self.PAGES_ID,
+            f"<< /Type /Pages /Kids [{kids}] /Count {len(self._page_ids)} >>".encode("ascii"),
+        )
+        info = [b"<< /Producer " + _text_string("Prometheus Course Generation System")]
+        if self.title:
+            info.append(b"/Title " + _text_string(self.title))
+        if self.author:
+            info.append(b"/Author " + _text_string(self.author))
+        info.append(f"/CreationDate (D:{datetime.now().strftime('%Y%m%d%H%M%S')})".encode("ascii"))
+        self._write_object(self.INFO_ID, b" ".join(info) + b" >>")
+        page_mode = " /PageMode /UseOutlines" if self._outline else ""
+        self._write_object(
+            self.CATALOG_ID,
+            f"<< /Type /Catalog /Pages {self.PAGES_ID} 0 R /Outlines {self.OUTLINES_ID} 0 R{page_mode} >>".encode("ascii"),
+        )
+
+        xref_offset = self._position
+        lines = [f"xref\n0 {self._next_id}\n0000000000 65535 f \n"]
+        lines.extend(f"{self._offsets[object_id]:010d} 00000 n \n" for object_id in range(1, self._next_id))
+        self._write("".join(lines).encode("ascii"))
+        self._write((
+            f"trailer\n<< /Size {self._next_id} /Root {self.CATALOG_ID} 0 R /Info {self.INFO_ID} 0 R >>\n"
+            f"startxref\n{xref_offset}\n%%EOF\n"
+        ).encode("ascii"))
+        self.file.flush()
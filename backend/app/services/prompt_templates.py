@@ -0,0 +1,321 @@
+"""Precompiled prompt templates with lexicon placeholders and hot reload."""
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Mapping, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+from app.core.executor import run_io
+from app.services.lexicon import lexicon_service
+
+logger = logging.getLogger(__name__)
+
+# A placeholder as written in templates and the lexicon, e.g. {{COURSE_TITLE}}
+PLACEHOLDER_PATTERN = re.compile(r"\{\{\s*([A-Z][A-Z0-9_]*)\s*\}\}")
+
+TEMPLATE_SUFFIX = ".txt"
+
+# Templates the application renders; a template set missing any of them is rejected
+REQUIRED_TEMPLATES = (
+    "generation_system",
+    "course",
+    "section_objectives",
+    "section_module_outline",
+    "section_module",
+    "section_assessments",
+    "section_description",
+    "section_lesson",
+    "section_assessment",
+    "chat_system",
+    "chat_course",
+    "chat_summary",
+    "summary_system",
+    "summary_request",
+)
+
+# Course fields read for each course placeholder, as stored or as sent by the editor
+COURSE_PLACEHOLDER_FIELDS = {
+    "COURSE_TITLE": ("title",),
+    "COURSE_CODE": ("code",),
+    "COURSE_VERSION": ("version",),
+    "COURSE_LEVEL": ("level",),
+    "COURSE_THEMATIC": ("thematic",),
+    "COURSE_DURATION": ("duration",),
+    "COURSE_DESCRIPTION": ("description",),
+    "COURSE_OVERVIEW": ("overview",),
+    "TARGET_AUDIENCE": ("targetAudience", "target_audience"),
+}
+
+# Rendered for course fields that are not set
+UNSPECIFIED = "not specified"
+
+
+class PromptTemplateError(ValueError):
+    """Raised for a template that cannot be compiled or rendered."""
+
+
+class CompiledTemplate(NamedTuple):
+    """
+    A template compiled to a str.format pattern.
+
+    Literal braces are escaped and each ``{{NAME}}`` placeholder becomes a
+    ``{NAME}`` field, so rendering is a single ``format_map`` call.
+    """
+    name: str
+    pattern: str
+    placeholders: FrozenSet[str]
+
+    @classmethod
+    def compile(cls, name: str, source: str, allowed: FrozenSet[str]) -> "CompiledTemplate":
+        """Compile a template, rejecting placeholders the lexicon does not define."""
+        placeholders = frozenset(PLACEHOLDER_PATTERN.findall(source))
+        unknown = sorted(placeholders - allowed)
+        if unknown:
+            raise PromptTemplateError(f"Template {name} uses unknown placeholders: {', '.join(unknown)}")
+
+        parts = []
+        position = 0
+        for match in PLACEHOLDER_PATTERN.finditer(source):
+            parts.append(cls._escape(name, source[position:match.start()]))
+            parts.append(f"{{{match.group(1)}}}")
+            position = match.end()
+        parts.append(cls._escape(name, source[position:]))
+        return cls(name=name, pattern="".join(parts), placeholders=placeholders)
+
+    @staticmethod
+    def _escape(name: str, literal: str) -> str:
+        if "{{" in literal:
+            raise PromptTemplateError(f"Template {name} has a malformed placeholder")
+        return literal.replace("{", "{{").replace("}", "}}")
+
+    def render(self, values: Mapping[str, Any]) -> str:
+        """Fill in the placeholders; every one must have a value."""
+        try:
+            return self.pattern.format_map(values)
+        except KeyError as e:
+            raise PromptTemplateError(f"Template {self.name} needs a value for {{{{{e.args[0]}}}}}")
+
+
+class PromptTemplateSet(NamedTuple):
+    """
+    One compiled version of the template directory.
+
+    ``fingerprint`` changes whenever any template's text does, and
+    ``stamp`` records the files and lexicon placeholders it was built from.
+    """
+    templates: Mapping[str, CompiledTemplate]
+    fingerprint: str
+    stamp: Optional[Tuple[Any, ...]] = None
+
+
+def lexicon_placeholders() -> FrozenSet[str]:
+    """Get the placeholder names the lexicon defines, in every category."""
+    names = set()
+    for category in lexicon_service.snapshot.data.get("placeholders", {}).values():
+        for placeholder in category:
+            match = PLACEHOLDER_PATTERN.fullmatch(placeholder)
+            if match:
+                names.add(match.group(1))
+    return frozenset(names)
+
+
+def course_values(course_context: Mapping[str, Any]) -> Dict[str, str]:
+    """Get the course placeholder values of a course or generation context."""
+    values = {}
+    for placeholder, fields in COURSE_PLACEHOLDER_FIELDS.items():
+        value = next((course_context[field] for field in fields if course_context.get(field)), None)
+        values[placeholder] = str(value) if value is not None else UNSPECIFIED
+    return values
+
+
+class PromptTemplateService:
+    """
+    Keeps the prompt templates compiled in memory.
+
+    Templates are the ``*.txt`` files in PROMPT_TEMPLATE_DIR, named after
+    the file, and may only use placeholders listed in the lexicon. The
+    whole set is compiled once and swapped in atomically; a background task
+    recompiles it every PROMPT_RELOAD_INTERVAL seconds if a file or the
+    lexicon's placeholders changed. If a changed set fails to compile, the
+    last good one stays in use and the error is reported in stats.
+
+    Rendered prompt prefixes, which depend only on the course, are cached
+    so a course's many section requests share one rendering, and one
+    identical leading prompt that providers can cache upstream.
+    """
+
+    def __init__(self, directory: Optional[str] = None, prefix_cache_size: Optional[int] = None):
+        self.directory = directory or settings.PROMPT_TEMPLATE_DIR
+        self.prefix_cache_size = prefix_cache_size or settings.PROMPT_PREFIX_CACHE_SIZE
+        self._lock = threading.Lock()
+        self._set: Optional[PromptTemplateSet] = None
+        self._prefixes: "OrderedDict[Tuple[Any, ...], str]" = OrderedDict()
+        self._watch_task: Optional[asyncio.Task] = None
+        self.error: Optional[str] = None
+        self.prefix_hits = 0
+        self.prefix_misses = 0
+
+    def _stamp(self) -> Tuple[Any, ...]:
+        """Stamp the template files and the lexicon placeholders they are checked against."""
+        try:
+            names = sorted(name for name in os.listdir(self.directory) if name.endswith(TEMPLATE_SUFFIX))
+        except FileNotFoundError:
+            names = []
+        files = []
+        for name in names:
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            files.append((name, stat.st_mtime_ns, stat.st_size))
+        return (tuple(files), lexicon_service.get_response("placeholders").etag)
+
+    def _compile(self, stamp: Tuple[Any, ...]) -> PromptTemplateSet:
+        """Read and compile every template file."""
+        allowed = lexicon_placeholders()
+        templates = {}
+        digest = hashlib.sha256()
+        for name, _, _ in stamp[0]:
+            with open(os.path.join(self.directory, name), "r", encoding="utf-8") as f:
+                source = f.read().rstrip("\n")
+            template_name = name[:-len(TEMPLATE_SUFFIX)]
+            templates[template_name] = CompiledTemplate.compile(template_name, source, allowed)
+            digest.update(f"{template_name}\0{source}\0".encode("utf-8"))
+
+        missing = [name for name in REQUIRED_TEMPLATES if name not in templates]
+        if missing:
+            raise PromptTemplateError(f"Missing prompt templates: {', '.join(missing)}")
+        return PromptTemplateSet(
+            templates=MappingProxyType(templates),
+            fingerprint=digest.hexdigest()[:16],
+            stamp=stamp,
+        )
+
+    @property
+    def current(self) -> PromptTemplateSet:
+        """Get the current template set, compiling it on first use."""
+        template_set = self._set
+        if template_set is None:
+            template_set = self.reload()
+        return template_set
+
+    @property
+    def fingerprint(self) -> str:
+        return self.current.fingerprint
+
+    def reload(self, force: bool = True) -> PromptTemplateSet:
+        """
+        Compile the template directory into a new set.
+
+        Without force, templates are only recompiled when the files or the
+        lexicon placeholders changed. Raises PromptTemplateError if there
+        is no good set to fall back on.
+        """
+        with self._lock:
+            current = self._set
+            stamp = self._stamp()
+            if not force and current is not None and stamp == current.stamp:
+                return current
+
+            try:
+                template_set = self._compile(stamp)
+            except (OSError, UnicodeDecodeError, PromptTemplateError) as e:
+                if current is None:
+                    raise PromptTemplateError(str(e)) from e
+                # Keep the last good templates, and do not retry until something changes again
+                self.error = str(e)
+                self._set = current._replace(stamp=stamp)
+                return self._set
+
+            self.error = None
+            self._set = template_set
+            self._prefixes.clear()
+            return template_set
+
+    def get(self, name: str) -> CompiledTemplate:
+        """Get a compiled template by name."""
+        template = self.current.templates.get(name)
+        if template is None:
+            raise PromptTemplateError(f"Unknown prompt template: {name}")
+        return template
+
+    def render(self, name: str, values: Optional[Mapping[str, Any]] = None) -> str:
+        """Render a template."""
+        return self.get(name).render(values or {})
+
+    def prefix(self, names: Tuple[str, ...], values: Mapping[str, Any]) -> str:
+        """
+        Render templates joined by blank lines, caching the result.
+
+        Meant for the leading part of a prompt that depends only on the
+        course; values should be the course placeholder values.
+        """
+        template_set = self.current
+        key = (template_set.fingerprint, names, tuple(sorted(values.items())))
+        with self._lock:
+            cached = self._prefixes.get(key)
+            if cached is not None:
+                self._prefixes.move_to_end(key)
+                self.prefix_hits += 1
+                return cached
+
+        rendered = "\n\n".join(self.render(name, values) for name in names)
+        with self._lock:
+            self.prefix_misses += 1
+            self._prefixes[key] = rendered
+            while len(self._prefixes) > self.prefix_cache_size:
+                self._prefixes.popitem(last=False)
+        return rendered
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the loaded templates and prefix cache counters."""
+        template_set = self._set
+        return {
+            "templates": sorted(template_set.templates) if template_set else [],
+            "fingerprint": template_set.fingerprint if template_set else None,
+            "prefixes": len(self._prefixes),
+            "prefix_hits": self.prefix_hits,
+            "prefix_misses": self.prefix_misses,
+            "error": self.error,
+        }
+
+    async def _watch_loop(self):
+        """
+        Periodically recompile the templates if they changed.
+
+        A failed reload is logged and reported in stats, and the current
+        templates stay in use until the next tick.
+        """
+        while True:
+            await asyncio.sleep(settings.PROMPT_RELOAD_INTERVAL)
+            try:
+                await run_io(self.reload, False)
+            except Exception as e:
+                self.error = str(e)
+                logger.exception("Prompt template reload failed; keeping the current templates")
+
+    async def start(self):
+        """Compile the templates and start watching them for changes."""
+        await run_io(self.reload)
+        if settings.PROMPT_RELOAD_INTERVAL > 0:
+            self._watch_task = asyncio.create_task(self._watch_loop())
+
+    async def stop(self):
+        """Stop watching the template files."""
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+            self._watch_task = None
+
+
+# Singleton instance
+prompt_templates = PromptTemplateService()
@@ -0,0 +1,173 @@
+"""Token-bucket rate limiting for AI requests."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+# Client key for work that does not come from an interactive request, such as jobs
+BACKGROUND_CLIENT = "background"
+
+# Key of the buckets shared by every client
+GLOBAL_CLIENT = "*"
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a request would have to wait longer than allowed."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    A bucket refilled at a steady rate up to its capacity.
+
+    Levels may go negative: taking more than is available reserves future
+    refills, so later callers wait behind earlier ones.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, amount: float = 0.0) -> float:
+        """Seconds until the bucket holds at least amount."""
+        self._refill()
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        """Remove amount from the bucket, going into debt if needed; a negative amount refunds."""
+        self._refill()
+        self.level = min(self.capacity, self.level - amount)
+
+
+class RateLimiter:
+    """
+    Per-client limits on requests and tokens per minute.
+
+    Each client has a request bucket and a token bucket, and optional global
+    buckets are shared by all clients. A request takes one request token and
+    reserves an estimate of its token cost up front, so a burst of concurrent
+    requests queues behind the reservations instead of all starting at once.
+    Once the request is done, the difference between the tokens it actually
+    used and its reservation is settled, so a large generation delays the
+    client's next request rather than failing mid-way. Requests that would
+    wait longer than their allowed wait are rejected with RateLimitExceeded.
+    A limit of 0 disables that bucket.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = 0,
+        tokens_per_minute: float = 0,
+        global_requests_per_minute: float = 0,
+        global_tokens_per_minute: float = 0,
+        max_wait: float = 0.0,
+        reserve_tokens: int = 0,
+        max_clients: int = 1024,
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_wait = max_wait
+        self.reserve_tokens = reserve_tokens
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, Tuple[Optional[TokenBucket], Optional[TokenBucket]]]" = OrderedDict()
+        self._global = self._new_buckets(global_requests_per_minute, global_tokens_per_minute)
+
+    @staticmethod
+    def _new_buckets(requests_per_minute: float, tokens_per_minute: float) -> Tuple[Optional[TokenBucket], Optional[TokenBucket]]:
+        return (
+            TokenBucket(requests_per_minute) if requests_per_minute > 0 else None,
+            TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None,
+        )
+
+    def _client_buckets(self, client: str) -> List[Tuple[Optional[TokenBucket], Optional[TokenBucket]]]:
+        """Get the buckets that apply to a client, creating its own on first use."""
+        buckets = self._buckets.get(client)
+        if buckets is None:
+            buckets = self._new_buckets(self.requests_per_minute, self.tokens_per_minute)
+            self._buckets[client] = buckets
+            while len(self._buckets) > self.max_clients:
+                # Forget the least recently seen client; if it comes back it starts with full buckets
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(client)
+        return [buckets, self._global]
+
+    async def acquire(self, client: str, max_wait: Optional[float] = None, tokens: Optional[int] = None) -> int:
+        """
+        Wait until a client may make a request, reserving its estimated tokens.
+
+        max_wait defaults to the limiter's; pass float("inf") to wait as
+        long as needed, as background work does. tokens defaults to the
+        limiter's reserve_tokens. Returns the tokens reserved, to be passed
+        to charge once the request is done.
+        """
+        max_wait = self.max_wait if max_wait is None else max_wait
+        reserved = self.reserve_tokens if tokens is None else tokens
+        buckets = self._client_buckets(client)
+
+        wait = 0.0
+        for requests, token_bucket in buckets:
+            if requests is not None:
+                wait = max(wait, requests.delay(1))
+            if token_bucket is not None:
+                wait = max(wait, token_bucket.delay(min(reserved, token_bucket.capacity)))
+        if wait > max_wait:
+            raise RateLimitExceeded(f"Rate limit exceeded, retry in {wait:.1f}s", retry_after=wait)
+
+        for requests, token_bucket in buckets:
+            if requests is not None:
+                requests.take(1)
+            if token_bucket is not None:
+                token_bucket.take(reserved)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return reserved
+
+    def charge(self, client: str, tokens: int, reserved: int = 0):
+        """Charge the tokens a client's request used, less what it reserved."""
+        for _, bucket in self._client_buckets(client):
+            if bucket is not None:
+                bucket.take(tokens - reserved)
+
+    def stats(self) -> Dict[str, float]:
+        """Get the configured limits."""
+        return {
+            "requests_per_minute": self.requests_per_minute,
+            "tokens_per_minute": self.tokens_per_minute,
+            "global_requests_per_minute": self._global[0].rate * 60 if self._global[0] else 0,
+            "global_tokens_per_minute": self._global[1].rate * 60 if self._global[1] else 0,
+            "max_wait": self.max_wait,
+            "reserve_tokens": self.reserve_tokens,
+            "clients": len(self._buckets),
+        }
+
+
+def create_rate_limiter() -> RateLimiter:
+    """Create the AI rate limiter configured in settings."""
+    return RateLimiter(
+        requests_per_minute=settings.AI_RATE_LIMIT_REQUESTS,
+        tokens_per_minute=settings.AI_RATE_LIMIT_TOKENS,
+        global_requests_per_minute=settings.AI_RATE_LIMIT_GLOBAL_REQUESTS,
+        global_tokens_per_minute=settings.AI_RATE_LIMIT_GLOBAL_TOKENS,
+        max_wait=settings.AI_RATE_LIMIT_MAX_WAIT,
+        reserve_tokens=settings.AI_RATE_LIMIT_RESERVE_TOKENS,
+    )
+
+
+# Singleton instance
+ai_rate_limiter = create_rate_limiter()
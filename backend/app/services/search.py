@@ -0,0 +1,129 @@
+"""Full-text search index for courses."""
+
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+from app.models.course import Course
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+STOP_WORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in",
+    "into", "is", "it", "its", "of", "on", "or", "that", "the", "this",
+    "to", "will", "with",
+})
+
+# Title terms are counted this many times so title matches rank higher
+TITLE_BOOST = 3
+
+
+def normalize_term(term: str) -> str:
+    """Fold simple plurals so 'modules' and 'module' share a term."""
+    if len(term) > 3 and term.endswith("s") and not term.endswith("ss"):
+        return term[:-1]
+    return term
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into normalized, lowercased search terms."""
+    return [
+        normalize_term(token)
+        for token in TOKEN_PATTERN.findall(text.lower())
+        if token not in STOP_WORDS
+    ]
+
+
+def course_terms(course: Course) -> List[str]:
+    """Collect the searchable terms of a course."""
+    terms = tokenize(course.title) * TITLE_BOOST
+    terms += tokenize(course.description)
+    terms += tokenize(course.overview)
+    for module in course.modules:
+        terms += tokenize(module.title)
+        terms += tokenize(module.description)
+        for lesson in module.lessons:
+            terms += tokenize(lesson.title)
+            terms += tokenize(lesson.content)
+            for point in lesson.key_points:
+                terms += tokenize(point)
+    return terms
+
+
+class SearchIndex:
+    """
+    Inverted index over course text with BM25 ranking.
+
+    Postings map each term to per-course term frequencies. Courses are
+    added, replaced and removed incrementally, so the index never needs a
+    full rebuild after a mutation. Callers are responsible for locking.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._doc_terms: Dict[str, Counter] = {}
+        self._doc_lengths: Dict[str, int] = {}
+        self._total_length = 0
+
+    @classmethod
+    def build(cls, courses: Iterable[Course]) -> "SearchIndex":
+        """Build an index over the given courses."""
+        index = cls()
+        for course in courses:
+            index.add(course)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    def add(self, course: Course):
+        """Index a course, replacing any previous version of it."""
+        self.remove(course.id)
+
+        terms = course_terms(course)
+        counts = Counter(terms)
+        for term, frequency in counts.items():
+            self._postings.setdefault(term, {})[course.id] = frequency
+
+        self._doc_terms[course.id] = counts
+        self._doc_lengths[course.id] = len(terms)
+        self._total_length += len(terms)
+
+    def remove(self, course_id: str):
+        """Remove a course from the index."""
+        counts = self._doc_terms.pop(course_id, None)
+        if counts is None:
+            return
+
+        for term in counts:
+            postings = self._postings[term]
+            del postings[course_id]
+            if not postings:
+                del self._postings[term]
+
+        self._total_length -= self._doc_lengths.pop(course_id)
+
+    def search(self, query: str) -> List[Tuple[str, float]]:
+        """Return (course_id, score) pairs matching the query, best first."""
+        doc_count = len(self._doc_lengths)
+        if doc_count == 0:
+            return []
+
+        average_length = self._total_length / doc_count or 1.0
+        scores: Dict[str, float] = {}
+
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+
+            idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for course_id, frequency in postings.items():
+                length_norm = 1 - self.b + self.b * self._doc_lengths[course_id] / average_length
+                score = idf * frequency * (self.k1 + 1) / (frequency + self.k1 * length_norm)
+                scores[course_id] = scores.get(course_id, 0.0) + score
+
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)
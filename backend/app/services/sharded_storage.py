@@ -0,0 +1,199 @@
+"""Sharded per-course JSON storage service."""
+
+import hashlib
+import json
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+from app.models.course import Course
+from app.core.config import settings
+from app.services.storage import StorageService, atomic_write_json
+
+SAFE_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,128}$")
+
+
+class ShardedStorageService(StorageService):
+    """
+    Storage service keeping one JSON file per course plus a small manifest.
+
+    The manifest only lists course IDs in catalog order, so it is rewritten
+    on create and delete but not on update. Every file is written with an
+    atomic rename, and a single-course mutation touches only that course's
+    shard. An existing monolithic courses.json is migrated on first start.
+    """
+
+    MANIFEST_VERSION = 1
+
+    def __init__(self):
+        self.courses_dir = os.path.join(settings.DATA_DIR, settings.COURSES_DIR)
+        self.manifest_file = os.path.join(self.courses_dir, "manifest.json")
+        self._order: List[str] = []
+        self._shard_stamps: Dict[str, Optional[Tuple[int, int]]] = {}
+        super().__init__()
+
+    def _ensure_data_file(self):
+        """Ensure the shard directory and manifest exist, migrating if needed."""
+        os.makedirs(self.courses_dir, exist_ok=True)
+        if os.path.exists(self.manifest_file):
+            return
+        if os.path.exists(self.courses_file):
+            self.migrate_from_json()
+        else:
+            self._write_manifest([])
+
+    def migrate_from_json(self) -> int:
+        """
+        Migrate the monolithic courses file into per-course shards.
+
+        The original file is renamed with a ``.migrated`` suffix once the
+        shards and manifest are in place. Returns the number of migrated courses.
+        """
+        courses = super()._read_courses()
+        order = []
+        for record in courses:
+            course = Course(**record)
+            atomic_write_json(self._shard_path(course.id), record)
+            order.append(course.id)
+
+        self._write_manifest(order)
+        os.replace(self.courses_file, f"{self.courses_file}.migrated")
+
+        # Force the index to load the migrated shards
+        self._stamp = None
+        return len(order)
+
+    def _shard_path(self, course_id: str) -> str:
+        """Get the shard file path for a course ID."""
+        if SAFE_ID_PATTERN.match(course_id):
+            name = course_id
+        else:
+            name = "_" + hashlib.sha1(course_id.encode("utf-8")).hexdigest()
+        return os.path.join(self.courses_dir, f"{name}.json")
+
+    def _write_manifest(self, order: List[str]):
+        """Write the manifest listing course IDs in catalog order."""
+        atomic_write_json(self.manifest_file, {
+            "version": self.MANIFEST_VERSION,
+            "courses": order,
+        })
+        self._stamp = self._file_stamp()
+
+    def _read_manifest(self) -> List[str]:
+        """Read the ordered course IDs from the manifest."""
+        try:
+            with open(self.manifest_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, FileNotFoundError):
+            return []
+        order = data.get("courses", []) if isinstance(data, dict) else []
+        return [course_id for course_id in order if isinstance(course_id, str)]
+
+    def _file_stamp(self, path: Optional[str] = None) -> Optional[Tuple[int, int]]:
+        """Return the (mtime, size) stamp of a shard, or of the manifest."""
+        try:
+            stat = os.stat(path or self.manifest_file)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _read_shard(self, course_id: str) -> Optional[dict]:
+        """Read a single course shard."""
+        try:
+            with open(self._shard_path(course_id), "r", encoding="utf-8") as f:
+                data = json.load(f)
+                return data if isinstance(data, dict) else None
+        except (json.JSONDecodeError, FileNotFoundError):
+            return None
+
+    def _read_courses(self) -> List[dict]:
+        """Read all courses from their shards in manifest order."""
+        self._refresh_index()
+        return list(self._records.values())
+
+    def _refresh_index(self):
+        """
+        Reload the index if the manifest changed on disk.
+
+        Shards whose stamp is unchanged keep their already-validated course.
+        """
+        stamp = self._file_stamp()
+        if stamp is not None and stamp == self._stamp:
+            return
+
+        records: Dict[str, dict] = {}
+        courses: Dict[str, Course] = {}
+        shard_stamps: Dict[str, Optional[Tuple[int, int]]] = {}
+        for course_id in self._read_manifest():
+            shard_stamp = self._file_stamp(self._shard_path(course_id))
+            if shard_stamp is not None and shard_stamp == self._shard_stamps.get(course_id):
+                records[course_id] = self._records[course_id]
+                courses[course_id] = self._courses[course_id]
+            else:
+                record = self._read_shard(course_id)
+                if record is None:
+                    continue
+                records[course_id] = record
+                courses[course_id] = Course(**record)
+            shard_stamps[course_id] = shard_stamp
+
+        self._records = records
+        self._courses = courses
+        self._order = list(records)
+        self._shard_stamps = shard_stamps
+        self._stamp = stamp
+        self._search_index = None
+
+    def _refresh_shard(self, course_id: str):
+        """Reload a single shard if it changed on disk."""
+        if course_id not in self._records:
+            return
+        stamp = self._file_stamp(self._shard_path(course_id))
+        if stamp == self._shard_stamps.get(course_id):
+            return
+        record = self._read_shard(course_id)
+        if record is None:
+            return
+        self._records[course_id] = record
+        self._courses[course_id] = Course(**record)
+        self._shard_stamps[course_id] = stamp
+        self._index_course(self._courses[course_id])
+
+    def _save_records(self, items: List[Tuple[dict, Course]]):
+        """Write only the affected shards, plus the manifest for new courses."""
+        new_ids = []
+        for record, course in items:
+            path = self._shard_path(course.id)
+            atomic_write_json(path, record)
+            if course.id not in self._records and course.id not in new_ids:
+                new_ids.append(course.id)
+
+            self._records[course.id] = record
+            self._courses[course.id] = course
+            self._shard_stamps[course.id] = self._file_stamp(path)
+
+        if new_ids:
+            self._write_manifest(self._order + new_ids)
+            self._order.extend(new_ids)
+
+    def _remove_record(self, course_id: str):
+        """Drop the course from the manifest, then delete its shard."""
+        order = [existing for existing in self._order if existing != course_id]
+        self._write_manifest(order)
+        self._order = order
+
+        try:
+            os.remove(self._shard_path(course_id))
+        except FileNotFoundError:
+            pass
+
+        self._records.pop(course_id, None)
+        self._courses.pop(course_id, None)
+        self._shard_stamps.pop(course_id, None)
+
+    def get_course(self, course_id: str) -> Optional[Course]:
+        """Get a course by ID."""
+        with self._lock:
+            self._refresh_index()
+            self._refresh_shard(course_id)
+            return self._courses.get(course_id)
@@ -0,0 +1,318 @@
+"""SQLite storage service."""
+
+import json
+import os
+import sqlite3
+import threading
+from typing import List, Optional, Tuple, Union
+
+from app.models.course import Course, CourseCreate, CourseUpdate
+from app.core.config import settings
+from app.services.patch import apply_patch
+from app.services.storage import PageKey, StorageService
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS courses (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    title_lower TEXT NOT NULL,
+    code TEXT NOT NULL,
+    level TEXT,
+    thematic TEXT,
+    status TEXT,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_courses_level ON courses (level, seq);
+CREATE INDEX IF NOT EXISTS idx_courses_thematic ON courses (thematic, seq);
+CREATE INDEX IF NOT EXISTS idx_courses_status ON courses (status, seq);
+CREATE INDEX IF NOT EXISTS idx_courses_code ON courses (code);
+"""
+
+
+class SQLiteStorageService(StorageService):
+    """
+    Storage service backed by a local SQLite database.
+
+    Each course is one row: the filterable fields (level, thematic, status,
+    code) are indexed columns and the full course is stored as a JSON body.
+    Filtered listings are answered by SQL, so only matching rows are parsed.
+    Connections are kept per thread.
+    """
+
+    ID_CHUNK_SIZE = 500
+
+    def __init__(self):
+        self.db_file = os.path.join(settings.DATA_DIR, settings.SQLITE_FILE)
+        self._local = threading.local()
+        super().__init__()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get the calling thread's database connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_file, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _ensure_data_file(self):
+        """Create the schema, migrating an existing courses file if present."""
+        os.makedirs(self.data_dir, exist_ok=True)
+        conn = self._connection()
+        with conn:
+            conn.executescript(SCHEMA)
+
+        if os.path.exists(self.courses_file):
+            empty = conn.execute("SELECT 1 FROM courses LIMIT 1").fetchone() is None
+            if empty:
+                self.migrate_from_json()
+
+    def migrate_from_json(self) -> int:
+        """
+        Import the monolithic courses file into the database.
+
+        The original file is renamed with a ``.migrated`` suffix once the
+        rows are committed. Returns the number of migrated courses.
+        """
+        courses = [Course(**record) for record in self._read_courses()]
+        conn = self._connection()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO courses "
+                "(id, title, title_lower, code, level, thematic, status, body) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [self._row(course) for course in courses],
+            )
+        os.replace(self.courses_file, f"{self.courses_file}.migrated")
+        return len(courses)
+
+    def _refresh_index(self):
+        """The database is the index; there is nothing to refresh."""
+
+    @staticmethod
+    def _row(course: Course) -> tuple:
+        """Build the column values stored for a course."""
+        data = course.model_dump(mode="json")
+        return (
+            course.id,
+            course.title,
+            course.title.lower(),
+            course.code,
+            data["level"],
+            data["thematic"],
+            data["status"],
+            json.dumps(data, ensure_ascii=False),
+        )
+
+    def _update_row(self, conn: sqlite3.Connection, course: Course):
+        """Rewrite an existing course row."""
+        values = self._row(course)
+        conn.execute(
+            "UPDATE courses SET title = ?, title_lower = ?, code = ?, "
+            "level = ?, thematic = ?, status = ?, body = ? WHERE id = ?",
+            values[1:] + (course.id,),
+        )
+
+    def _query(self, sql: str, params: tuple = ()) -> List[Course]:
+        """Run a query selecting course bodies and hydrate the results."""
+        rows = self._connection().execute(sql, params).fetchall()
+        return [Course.model_validate_json(body) for (body,) in rows]
+
+    def get_all_courses(self) -> List[Course]:
+        """Get all courses."""
+        return self._query("SELECT body FROM courses ORDER BY seq")
+
+    def get_course(self, course_id: str) -> Optional[Course]:
+        """Get a course by ID."""
+        courses = self._query("SELECT body FROM courses WHERE id = ?", (course_id,))
+        return courses[0] if courses else None
+
+    def create_course(self, course_data: CourseCreate) -> Course:
+        """Create a new course."""
+        new_course = self._build_course(course_data)
+
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "INSERT INTO courses "
+                "(id, title, title_lower, code, level, thematic, status, body) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                self._row(new_course),
+            )
+        self._index_course(new_course)
+
+        return new_course
+
+    def import_courses(self, items: List[Union[CourseCreate, Course]]) -> List[Course]:
+        """Create or replace many courses in one transaction."""
+        courses = self._prepare_import(items)
+
+        conn = self._connection()
+        with conn:
+            conn.executemany(
+                "INSERT INTO courses "
+                "(id, title, title_lower, code, level, thematic, status, body) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET title = excluded.title, "
+                "title_lower = excluded.title_lower, code = excluded.code, "
+                "level = excluded.level, thematic = excluded.thematic, "
+                "status = excluded.status, body = excluded.body",
+                [self._row(course) for course in courses],
+            )
+        for course in courses:
+            self._index_course(course)
+
+        return courses
+
+    def update_course(self, course_id: str, updates: CourseUpdate) -> Optional[Course]:
+        """Update an existing course."""
+        conn = self._connection()
+        with conn:
+            # Take the write lock before reading so concurrent updates serialize
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT body FROM courses WHERE id = ?", (course_id,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            _, updated = self._apply_updates(json.loads(row[0]), updates)
+            self._update_row(conn, updated)
+        self._index_course(updated)
+
+        return updated
+
+    def patch_course(self, course_id: str, operations: List[dict]) -> Optional[Course]:
+        """Apply JSON Patch operations to a course row, rewriting the whole row."""
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT body FROM courses WHERE id = ?", (course_id,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            patched = self._touch(apply_patch(Course.model_validate_json(row[0]), operations))
+            self._update_row(conn, patched)
+        self._index_course(patched)
+
+        return patched
+
+    def delete_course(self, course_id: str) -> bool:
+        """Delete a course by ID."""
+        conn = self._connection()
+        with conn:
+            cursor = conn.execute("DELETE FROM courses WHERE id = ?", (course_id,))
+        if cursor.rowcount == 0:
+            return False
+
+        self._unindex_course(course_id)
+        return True
+
+    @staticmethod
+    def _filter_clauses(
+        title: Optional[str] = None,
+        level: Optional[str] = None,
+        thematic: Optional[str] = None,
+        status: Optional[str] = None,
+        code: Optional[str] = None,
+    ) -> Tuple[List[str], tuple]:
+        """Build WHERE clauses and parameters for the indexed filter columns."""
+        clauses = []
+        params = []
+
+        if code:
+            clauses.append("code = ?")
+            params.append(code)
+        if level:
+            clauses.append("level = ?")
+            params.append(level)
+        if thematic:
+            clauses.append("thematic = ?")
+            params.append(thematic)
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if title:
+            clauses.append("instr(title_lower, ?) > 0")
+            params.append(title.lower())
+
+        return clauses, tuple(params)
+
+    def search_courses(
+        self,
+        title: Optional[str] = None,
+        level: Optional[str] = None,
+        thematic: Optional[str] = None,
+        status: Optional[str] = None,
+        code: Optional[str] = None,
+        query: Optional[str] = None,
+    ) -> List[Course]:
+        """
+        Search courses using the indexed filter columns.
+
+        A full-text query is resolved against the in-memory index first and
+        only the ranked IDs are fetched, in relevance order.
+        """
+        clauses, params = self._filter_clauses(
+            title=title, level=level, thematic=thematic, status=status, code=code,
+        )
+
+        if not query:
+            where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+            return self._query(f"SELECT body FROM courses {where}ORDER BY seq", params)
+
+        with self._lock:
+            ranked_ids = [course_id for course_id, _ in self._get_search_index().search(query)]
+
+        # Fetch ranked IDs in chunks to stay under SQLite's variable limit
+        courses = []
+        for start in range(0, len(ranked_ids), self.ID_CHUNK_SIZE):
+            chunk = ranked_ids[start:start + self.ID_CHUNK_SIZE]
+            chunk_clauses = clauses + [f"id IN ({', '.join('?' * len(chunk))})"]
+            courses += self._query(
+                f"SELECT body FROM courses WHERE {' AND '.join(chunk_clauses)}",
+                params + tuple(chunk),
+            )
+
+        rank = {course_id: position for position, course_id in enumerate(ranked_ids)}
+        courses.sort(key=lambda course: rank[course.id])
+        return courses
+
+    def list_courses(
+        self,
+        limit: int = 50,
+        after: Optional[PageKey] = None,
+        **filters,
+    ) -> Tuple[List[Course], int, Optional[PageKey]]:
+        """
+        Get one page of courses, keyed on the row sequence unless a full-text query is given.
+
+        Pages continue with ``seq > ?``, so rows added or removed between
+        pages do not shift the rest.
+        """
+        if filters.get("query"):
+            return super().list_courses(limit, after, **filters)
+        filters.pop("query", None)
+
+        clauses, params = self._filter_clauses(**filters)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        conn = self._connection()
+        (total,) = conn.execute(f"SELECT COUNT(*) FROM courses {where}", params).fetchone()
+
+        if after is not None:
+            if len(after) != 1 or not isinstance(after[0], int):
+                raise ValueError("Page key does not match the listing")
+            clauses = clauses + ["seq > ?"]
+            params = params + (after[0],)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        rows = conn.execute(
+            f"SELECT seq, body FROM courses {where}ORDER BY seq LIMIT ?",
+            params + (limit + 1,),
+        ).fetchall()
+        page = rows[:limit]
+        next_key = [page[-1][0]] if len(rows) > limit else None
+        return [Course.model_validate_json(body) for _, body in page], total, next_key
@@ -1,23 +1,76 @@
 """JSON file storage service."""
 
+import asyncio
 import json
 import os
-from typing import List, Optional
+import tempfile
+import threading
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
 from datetime import datetime
 import uuid
 
-from app.models.course import Course, CourseCreate, CourseUpdate, CourseMetadata
+from app.models.course import (
+    Course,
+    CourseCreate,
+    CourseUpdate,
+    CourseMetadata,
+    CourseStatusEnum,
+)
 from app.core.config import settings
+from app.core.executor import run_io
+from app.services.patch import apply_patch
+from app.services.search import SearchIndex
+
+
+# Position of a course in a paged listing, compared as a tuple
+PageKey = List[Union[str, int, float]]
+
+
+def page_after(
+    keyed: List[Tuple[tuple, Course]],
+    after: Optional[PageKey],
+    limit: int,
+) -> Tuple[List[Course], Optional[PageKey]]:
+    """Take the page of key-sorted courses that follows a key, and the key to continue from."""
+    if after is not None:
+        start = tuple(after)
+        try:
+            keyed = [entry for entry in keyed if entry[0] > start]
+        except TypeError:
+            raise ValueError("Page key does not match the listing")
+    page = keyed[:limit]
+    next_key = list(page[-1][0]) if len(keyed) > limit else None
+    return [course for _, course in page], next_key
 
 
 class StorageService:
-    """Service for storing and retrieving courses from JSON files."""
+    """
+    Service for storing and retrieving courses from JSON files.
+
+    Courses are kept in a resident index keyed by ID, holding both the raw
+    records and validated Course models. The index is loaded once and only
+    re-read when the courses file's mtime or size changes, so lookups do not
+    re-parse the catalog. Methods are blocking and thread-safe; async callers
+    should go through AsyncStorageService.
+    """
 
     def __init__(self):
         self.data_dir = settings.DATA_DIR
         self.courses_file = os.path.join(self.data_dir, settings.COURSES_FILE)
+        self._records: Dict[str, dict] = {}
+        self._courses: Dict[str, Course] = {}
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._lock = threading.RLock()
+        self._search_index: Optional[SearchIndex] = None
         self._ensure_data_file()
 
+    async def start(self):
+        """Start background maintenance tasks, if the backend has any."""
+
+    async def stop(self):
+        """Stop background maintenance tasks and flush pending state."""
+
     def _ensure_data_file(self):
         """Ensure the data directory and courses file exist."""
         os.makedirs(self.data_dir, exist_ok=True)
@@ -34,33 +87,96 @@ class StorageService:
             return []
 
     def _write_courses(self, courses: List[dict]):
-        """Write courses to the JSON file."""
-        with open(self.courses_file, "w", encoding="utf-8") as f:
-            json.dump(courses, f, indent=2, ensure_ascii=False)
+        """Write courses to the JSON file, replacing it atomically so a crash cannot corrupt it."""
+        atomic_write_json(self.courses_file, courses)
+        self._stamp = self._file_stamp()
+
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        """Return the (mtime, size) stamp of the courses file."""
+        try:
+            stat = os.stat(self.courses_file)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _refresh_index(self):
+        """Reload the resident index if the courses file changed on disk."""
+        stamp = self._file_stamp()
+        if stamp is not None and stamp == self._stamp:
+            return
+
+        records: Dict[str, dict] = {}
+        courses: Dict[str, Course] = {}
+        for record in self._read_courses():
+            course = Course(**record)
+            records[course.id] = record
+            courses[course.id] = course
+
+        self._records = records
+        self._courses = courses
+        self._stamp = stamp
+        self._search_index = None
+
+    def _save_records(self, items: List[Tuple[dict, Course]]):
+        """Persist created or updated records in one write and add them to the index."""
+        records = dict(self._records)
+        for record, course in items:
+            records[course.id] = record
+        self._write_courses(list(records.values()))
+        self._records = records
+        for _, course in items:
+            self._courses[course.id] = course
+
+    def _remove_record(self, course_id: str):
+        """Remove a record from storage and from the index."""
+        records = dict(self._records)
+        del records[course_id]
+        self._write_courses(list(records.values()))
+        self._records = records
+        self._courses.pop(course_id, None)
+
+    def _get_search_index(self) -> SearchIndex:
+        """Get the full-text index, building it on first use."""
+        with self._lock:
+            if self._search_index is None:
+                self._search_index = SearchIndex.build(self.get_all_courses())
+            return self._search_index
+
+    def _index_course(self, course: Course):
+        """Update the full-text index for a created or changed course."""
+        with self._lock:
+            if self._search_index is not None:
+                self._search_index.add(course)
+
+    def _unindex_course(self, course_id: str):
+        """Remove a deleted course from the full-text index."""
+        with self._lock:
+            if self._search_index is not None:
+                self._search_index.remove(course_id)
+
+    def _rank_courses(self, query: str) -> List[Course]:
+        """Get courses matching a full-text query, best match first."""
+        with self._lock:
+            self._refresh_index()
+            ranked = self._get_search_index().search(query)
+            return [self._courses[course_id] for course_id, _ in ranked]
 
     def get_all_courses(self) -> List[Course]:
         """Get all courses."""
-        courses_data = self._read_courses()
-        return [Course(**course) for course in courses_data]
+        with self._lock:
+            self._refresh_index()
+            return list(self._courses.values())
 
     def get_course(self, course_id: str) -> Optional[Course]:
         """Get a course by ID."""
-        courses_data = self._read_courses()
-        for course in courses_data:
-            if course.get("id") == course_id:
-                return Course(**course)
-        return None
-
-    def create_course(self, course_data: CourseCreate) -> Course:
-        """Create a new course."""
-        courses = self._read_courses()
+        with self._lock:
+            self._refresh_index()
+            return self._courses.get(course_id)
 
-        # Generate new ID
-        course_id = str(uuid.uuid4())
-
-        # Create course dict
-        new_course = Course(
-            id=course_id,
+    def _build_course(self, course_data: CourseCreate) -> Course:
+        """Build a new course with a fresh ID from creation data."""
+        return Course(
+            id=str(uuid.uuid4()),
             **course_data.model_dump(exclude_none=True),
             metadata=CourseMetadata(
                 author=course_data.author,
@@ -68,48 +184,85 @@ class StorageService:
             ),
         )
 
-        # Add to list and save
-        courses.append(new_course.model_dump())
-        self._write_courses(courses)
+    def _apply_updates(self, record: dict, updates: CourseUpdate) -> Tuple[dict, Course]:
+        """Apply updates to a copy of a stored record and validate the result."""
+        # Update fields
+        course = dict(record)
+        update_data = updates.model_dump(exclude_none=True)
+        for key, value in update_data.items():
+            course[key] = value
+
+        # Update metadata
+        course["metadata"] = dict(course.get("metadata") or {})
+        course["metadata"]["updated_date"] = datetime.now().isoformat()
+
+        return course, Course(**course)
+
+    def create_course(self, course_data: CourseCreate) -> Course:
+        """Create a new course."""
+        new_course = self._build_course(course_data)
+
+        # Add to index and save
+        with self._lock:
+            self._refresh_index()
+            self._save_records([(new_course.model_dump(), new_course)])
+            self._index_course(new_course)
 
         return new_course
 
     def update_course(self, course_id: str, updates: CourseUpdate) -> Optional[Course]:
         """Update an existing course."""
-        courses = self._read_courses()
+        with self._lock:
+            self._refresh_index()
+
+            if course_id not in self._records:
+                return None
+
+            course, updated = self._apply_updates(self._records[course_id], updates)
+            self._save_records([(course, updated)])
+            self._index_course(updated)
 
-        for i, course in enumerate(courses):
-            if course.get("id") == course_id:
-                # Update fields
-                update_data = updates.model_dump(exclude_none=True)
-                for key, value in update_data.items():
-                    course[key] = value
+        return updated
+
+    @staticmethod
+    def _touch(course: Course) -> Course:
+        """Return a copy of the course with its updated date set to now."""
+        metadata = course.metadata.model_copy(
+            update={"updated_date": datetime.now().isoformat()},
+        )
+        return course.model_copy(update={"metadata": metadata})
 
-                # Update metadata
-                if "metadata" not in course:
-                    course["metadata"] = {}
-                course["metadata"]["updated_date"] = datetime.now().isoformat()
+    def patch_course(self, course_id: str, operations: List[dict]) -> Optional[Course]:
+        """
+        Apply JSON Patch operations to a course.
 
-                # Save
-                courses[i] = course
-                self._write_courses(courses)
+        Only the patched values are validated; raises PatchError if the
+        patch is invalid. The patched course is persisted whole, which here
+        means rewriting the courses file; the log backend persists only the
+        operations.
+        """
+        with self._lock:
+            course = self.get_course(course_id)
+            if course is None:
+                return None
 
-                return Course(**course)
+            patched = self._touch(apply_patch(course, operations))
+            self._save_records([(patched.model_dump(), patched)])
+            self._index_course(patched)
 
-        return None
+        return patched
 
     def delete_course(self, course_id: str) -> bool:
         """Delete a course by ID."""
-        courses = self._read_courses()
-        original_length = len(courses)
+        with self._lock:
+            self._refresh_index()
 
-        courses = [c for c in courses if c.get("id") != course_id]
+            if course_id not in self._records:
+                return False
 
-        if len(courses) < original_length:
-            self._write_courses(courses)
-            return True
-
-        return False
+            self._remove_record(course_id)
+            self._unindex_course(course_id)
+        return True
 
     def search_courses(
         self,
@@ -117,9 +270,16 @@ class StorageService:
         level: Optional[str] = None,
         thematic: Optional[str] = None,
         status: Optional[str] = None,
+        code: Optional[str] = None,
+        query: Optional[str] = None,
     ) -> List[Course]:
-        """Search courses by various criteria."""
-        courses = self.get_all_courses()
+        """
+        Search courses by various criteria.
+
+        With a full-text query, results are ranked by relevance; otherwise
+        they keep catalog order.
+        """
+        courses = self._rank_courses(query) if query else self.get_all_courses()
         results = []
 
         for course in courses:
@@ -131,10 +291,265 @@ class StorageService:
                 continue
             if status and course.status != status:
                 continue
+            if code and course.code != code:
+                continue
             results.append(course)
 
         return results
 
+    @staticmethod
+    def _clone_course(source: Course, remap_ids: bool = False) -> Course:
+        """
+        Copy a course under a new ID as a fresh draft.
+
+        With remap_ids, objectives, modules, lessons and assessments also get
+        new IDs, and enabling objectives are re-pointed at their new parents.
+        """
+        update = {
+            "id": str(uuid.uuid4()),
+            "title": f"{source.title} (Copy)",
+            "code": f"{source.code}-COPY",
+            "status": CourseStatusEnum.DRAFT,
+            "metadata": CourseMetadata(
+                author=source.metadata.author,
+                organization=source.metadata.organization,
+            ),
+        }
+
+        if remap_ids:
+            objective_ids = {
+                objective.id: str(uuid.uuid4()) for objective in source.learning_objectives
+            }
+            update["learning_objectives"] = [
+                objective.model_copy(update={
+                    "id": objective_ids[objective.id],
+                    "parent_id": objective_ids.get(objective.parent_id, objective.parent_id),
+                })
+                for objective in source.learning_objectives
+            ]
+            update["modules"] = [
+                module.model_copy(update={
+                    "id": str(uuid.uuid4()),
+                    "lessons": [
+                        lesson.model_copy(update={"id": str(uuid.uuid4())})
+                        for lesson in module.lessons
+                    ],
+                })
+                for module in source.modules
+            ]
+            update["assessments"] = [
+                assessment.model_copy(update={"id": str(uuid.uuid4())})
+                for assessment in source.assessments
+            ]
+
+        return source.model_copy(update=update)
+
+    def clone_courses(self, course_ids: List[str], remap_ids: bool = False) -> Optional[List[Course]]:
+        """
+        Clone courses with a single storage write.
+
+        Returns None without writing anything if any source course is missing.
+        """
+        with self._lock:
+            sources = [self.get_course(course_id) for course_id in course_ids]
+            if any(source is None for source in sources):
+                return None
+
+            return self.import_courses([
+                self._clone_course(source, remap_ids) for source in sources
+            ])
+
+    def _search_scores(self, query: str) -> Dict[str, float]:
+        """Get the relevance of each course matching a full-text query."""
+        with self._lock:
+            self._refresh_index()
+            return dict(self._get_search_index().search(query))
+
+    def list_courses(
+        self,
+        limit: int = 50,
+        after: Optional[PageKey] = None,
+        **filters,
+    ) -> Tuple[List[Course], int, Optional[PageKey]]:
+        """
+        Get one page of courses matching the filters.
+
+        Pages are keyed on a stable order instead of an offset, so courses
+        added or removed between pages do not shift the rest: creation date
+        then ID, or relevance then ID for a full-text query. Returns the
+        page, the total match count and the key to pass as ``after`` for the
+        next page, or None after the last one. Raises ValueError for a key
+        that does not belong to this listing.
+        """
+        active = {key: value for key, value in filters.items() if value}
+        query = active.get("query")
+        courses = self.search_courses(**active) if active else self.get_all_courses()
+        if query:
+            scores = self._search_scores(query)
+            keyed = [((-scores.get(course.id, 0.0), course.id), course) for course in courses]
+        else:
+            keyed = [((course.metadata.created_date, course.id), course) for course in courses]
+        keyed.sort(key=lambda entry: entry[0])
+        page, next_key = page_after(keyed, after, limit)
+        return page, len(courses), next_key
+
+    def _prepare_import(self, items: List[Union[CourseCreate, Course]]) -> List[Course]:
+        """Turn creation data into new courses; full courses are kept as given."""
+        return [
+            item if isinstance(item, Course) else self._build_course(item)
+            for item in items
+        ]
+
+    def import_courses(self, items: List[Union[CourseCreate, Course]]) -> List[Course]:
+        """
+        Create or replace many courses with a single write.
+
+        CourseCreate items get new IDs; full Course items keep their ID and
+        replace any existing course with the same ID.
+        """
+        courses = self._prepare_import(items)
+
+        with self._lock:
+            self._refresh_index()
+            self._save_records([(course.model_dump(), course) for course in courses])
+            for course in courses:
+                self._index_course(course)
+
+        return courses
+
+
+def atomic_write_json(path: str, data):
+    """Write JSON to a temporary file and atomically rename it into place."""
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def create_storage_service() -> StorageService:
+    """Create the storage service selected by settings.STORAGE_BACKEND."""
+    backend = settings.STORAGE_BACKEND
+
+    if backend == "json":
+        return StorageService()
+    if backend == "sharded":
+        from app.services.sharded_storage import ShardedStorageService
+        return ShardedStorageService()
+    if backend == "sqlite":
+        from app.services.sqlite_storage import SQLiteStorageService
+        return SQLiteStorageService()
+    if backend == "log":
+        from app.services.log_storage import LogStorageService
+        return LogStorageService()
+
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+class AsyncStorageService:
+    """
+    Async facade over a storage backend.
+
+    Every call runs on the bounded I/O thread pool so file access and
+    (de)serialization never block the event loop. Writes to the same course
+    are serialized by a per-course asyncio lock; writes to different
+    courses proceed concurrently.
+    """
+
+    def __init__(self, storage: StorageService):
+        self.storage = storage
+        self._course_locks: Dict[str, Tuple[asyncio.Lock, int]] = {}
+
+    @asynccontextmanager
+    async def course_lock(self, course_id: str) -> AsyncIterator[None]:
+        """Hold the write lock for a single course."""
+        lock, users = self._course_locks.get(course_id, (asyncio.Lock(), 0))
+        self._course_locks[course_id] = (lock, users + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, users = self._course_locks[course_id]
+            if users == 1:
+                del self._course_locks[course_id]
+            else:
+                self._course_locks[course_id] = (lock, users - 1)
+
+    async def get_all_courses(self) -> List[Course]:
+        """Get all courses."""
+        return await run_io(self.storage.get_all_courses)
+
+    async def get_course(self, course_id: str) -> Optional[Course]:
+        """Get a course by ID."""
+        return await run_io(self.storage.get_course, course_id)
+
+    async def create_course(self, course_data: CourseCreate) -> Course:
+        """Create a new course."""
+        return await run_io(self.storage.create_course, course_data)
+
+    async def update_course(self, course_id: str, updates: CourseUpdate) -> Optional[Course]:
+        """Update an existing course."""
+        async with self.course_lock(course_id):
+            return await run_io(self.storage.update_course, course_id, updates)
+
+    async def patch_course(self, course_id: str, operations: List[dict]) -> Optional[Course]:
+        """Apply JSON Patch operations to a course."""
+        async with self.course_lock(course_id):
+            return await run_io(self.storage.patch_course, course_id, operations)
+
+    async def delete_course(self, course_id: str) -> bool:
+        """Delete a course by ID."""
+        async with self.course_lock(course_id):
+            return await run_io(self.storage.delete_course, course_id)
+
+    async def search_courses(self, **filters) -> List[Course]:
+        """Search courses by various criteria."""
+        return await run_io(self.storage.search_courses, **filters)
+
+    async def import_courses(self, items: List[Union[CourseCreate, Course]]) -> List[Course]:
+        """
+        Create or replace many courses with a single write.
+
+        Courses imported with an ID hold that course's write lock, like an
+        update, so a replace cannot interleave with a patch of the same course.
+        """
+        async with AsyncExitStack() as stack:
+            # Always taken in ID order, so two imports cannot deadlock
+            for course_id in sorted({item.id for item in items if isinstance(item, Course)}):
+                await stack.enter_async_context(self.course_lock(course_id))
+            return await run_io(self.storage.import_courses, items)
+
+    async def clone_courses(self, course_ids: List[str], remap_ids: bool = False) -> Optional[List[Course]]:
+        """Clone courses with a single storage write."""
+        return await run_io(self.storage.clone_courses, course_ids, remap_ids)
+
+    async def iter_courses(self, batch_size: int = 200, **filters) -> AsyncIterator[List[Course]]:
+        """Yield courses matching the filters in batches, one page at a time."""
+        after = None
+        while True:
+            courses, _, after = await self.list_courses(batch_size, after, **filters)
+            if courses:
+                yield courses
+            if after is None:
+                return
+
+    async def list_courses(
+        self,
+        limit: int = 50,
+        after: Optional[PageKey] = None,
+        **filters,
+    ) -> Tuple[List[Course], int, Optional[PageKey]]:
+        """Get one page of courses matching the filters, the total match count and the next page's key."""
+        return await run_io(self.storage.list_courses, limit, after, **filters)
+
 
-# Singleton instance
-storage_service = StorageService()
+# Singleton instances
+storage_service = create_storage_service()
+async_storage_service = AsyncStorageService(storage_service)
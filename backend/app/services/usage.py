@@ -0,0 +1,123 @@
+"""Token accounting for AI requests."""
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+# Rough characters per token for English text, used when a provider reports no usage
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of a text."""
+    return -(-len(text) // CHARS_PER_TOKEN) if text else 0
+
+
+def estimate_message_tokens(messages: List[Dict[str, str]]) -> int:
+    """Estimate the prompt tokens of a list of chat messages."""
+    return sum(estimate_tokens(str(message.get("content", ""))) for message in messages)
+
+
+class TokenMeter:
+    """
+    Counts the tokens used within one scope, such as a request.
+
+    Meters nest: usage recorded in an inner meter also counts toward the
+    meter that was current when it was opened.
+    """
+
+    def __init__(self, parent: Optional["TokenMeter"] = None):
+        self.parent = parent
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.calls = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def add(self, prompt_tokens: int, completion_tokens: int, calls: int = 1):
+        """Record model calls."""
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        self.calls += calls
+        if self.parent is not None:
+            self.parent.add(prompt_tokens, completion_tokens, calls)
+
+
+_current_meter: ContextVar[Optional[TokenMeter]] = ContextVar("token_meter", default=None)
+
+
+@contextmanager
+def metered(detached: bool = False) -> Iterator[TokenMeter]:
+    """
+    Open a meter for the enclosed code.
+
+    Tasks created inside the block inherit the meter, so usage from
+    concurrent section requests is counted too. A detached meter does not
+    count toward the enclosing one, for work shared by several requests.
+    """
+    meter = TokenMeter(None if detached else _current_meter.get())
+    token = _current_meter.set(meter)
+    try:
+        yield meter
+    finally:
+        try:
+            _current_meter.reset(token)
+        except ValueError:
+            pass  # closed from another context, e.g. an abandoned stream being finalized
+
+
+def record_usage(prompt_tokens: int, completion_tokens: int, calls: int = 1):
+    """Record model calls against the current meter, if any."""
+    meter = _current_meter.get()
+    if meter is not None:
+        meter.add(prompt_tokens, completion_tokens, calls)
+
+
+def _empty_totals() -> Dict[str, int]:
+    return {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0, "calls": 0, "requests": 0}
+
+
+class UsageTracker:
+    """Aggregates metered token usage per course and per client."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._total = _empty_totals()
+        self._courses: Dict[str, Dict[str, int]] = {}
+        self._clients: Dict[str, Dict[str, int]] = {}
+
+    def record(self, meter: TokenMeter, course_id: Optional[str] = None, client: Optional[str] = None):
+        """Add one request's meter to the totals."""
+        with self._lock:
+            buckets = [self._total]
+            if course_id:
+                buckets.append(self._courses.setdefault(course_id, _empty_totals()))
+            if client:
+                buckets.append(self._clients.setdefault(client, _empty_totals()))
+            for totals in buckets:
+                totals["prompt_tokens"] += meter.prompt_tokens
+                totals["completion_tokens"] += meter.completion_tokens
+                totals["total_tokens"] += meter.total_tokens
+                totals["calls"] += meter.calls
+                totals["requests"] += 1
+
+    def for_course(self, course_id: str) -> Dict[str, int]:
+        """Get the usage of one course."""
+        with self._lock:
+            return dict(self._courses.get(course_id) or _empty_totals())
+
+    def stats(self) -> Dict[str, Any]:
+        """Get total usage and usage per course and client."""
+        with self._lock:
+            return {
+                "total": dict(self._total),
+                "courses": {key: dict(value) for key, value in self._courses.items()},
+                "clients": {key: dict(value) for key, value in self._clients.items()},
+            }
+
+
+# Singleton instance
+usage_tracker = UsageTracker()
@@ -0,0 +1 @@
+"""Test support utilities."""
@@ -0,0 +1,228 @@
+"""
+Latency benchmark for the AI engine against the fake provider.
+
+Runs generation and chat workloads through ``AIEngine`` with N concurrent
+clients, each sending requests one after another, and reports latency
+percentiles, throughput and token usage per workload:
+
+    python -m app.testing.benchmark --types objectives,full,chat --clients 1,8,32
+    python -m app.testing.benchmark --latency 0.5 --tokens-per-second 50 --error-rate 0.02
+    python -m app.testing.benchmark --contexts 4 --json   # mostly cache hits
+
+Every run uses a fresh engine, so cache state never carries over between
+workloads. Requests draw their course from a pool of ``--contexts``
+distinct courses; with fewer courses than requests, repeats are served by
+the generation cache or coalesced with an identical request in flight.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+from app.core.config import settings
+from app.services.ai_engine import GENERATION_SECTIONS, AIEngine
+from app.services.generation_cache import GenerationCache
+from app.services.llm_provider import LLMError
+from app.services.usage import metered
+from app.testing.fake_provider import LATENCY_DISTRIBUTIONS, FakeProvider
+
+GENERATION_TYPES = GENERATION_SECTIONS + ("full",)
+CHAT_TYPES = ("chat", "chat_stream")
+
+CHAT_MESSAGES = (
+    "How should I structure the modules?",
+    "Suggest learning objectives for this course.",
+    "What assessments would fit this level?",
+)
+
+
+def percentile(values: Sequence[float], p: float) -> float:
+    """Get the p-th percentile of values by linear interpolation."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * p / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class Sample(NamedTuple):
+    """One request's outcome."""
+    latency: float
+    tokens: int
+    ok: bool
+    first_token: Optional[float] = None
+
+
+def course_context(index: int) -> Dict[str, Any]:
+    """Build the generation context of the index-th benchmark course."""
+    levels = ("awareness", "foundational", "basic", "intermediate", "advanced", "expert", "senior")
+    return {
+        "title": f"Benchmark Course {index}",
+        "level": levels[index % len(levels)],
+        "thematic": "personal-skills",
+        "targetAudience": "Professionals",
+    }
+
+
+async def run_request(engine: AIEngine, kind: str, context: Dict[str, Any], sequence: int) -> Sample:
+    """Send one request and time it."""
+    first_token = None
+    start = time.perf_counter()
+    with metered() as meter:
+        try:
+            if kind == "chat":
+                await engine.chat(CHAT_MESSAGES[sequence % len(CHAT_MESSAGES)], context)
+            elif kind == "chat_stream":
+                async for _ in engine.chat_stream(CHAT_MESSAGES[sequence % len(CHAT_MESSAGES)], context):
+                    if first_token is None:
+                        first_token = time.perf_counter() - start
+            else:
+                result = await engine.generate_content(context, kind)
+                if "error" in result or "errors" in result:
+                    return Sample(time.perf_counter() - start, meter.total_tokens, False)
+        except LLMError:
+            return Sample(time.perf_counter() - start, meter.total_tokens, False, first_token)
+    return Sample(time.perf_counter() - start, meter.total_tokens, True, first_token)
+
+
+async def run_workload(
+    kind: str,
+    clients: int,
+    requests_per_client: int,
+    contexts: int,
+    provider_options: Dict[str, Any],
+    cache: bool,
+) -> Dict[str, Any]:
+    """Run one workload on a fresh engine and summarize it."""
+    provider = FakeProvider(**provider_options)
+    engine = AIEngine(provider, GenerationCache() if cache else None)
+    await engine.start()
+
+    async def client(number: int) -> List[Sample]:
+        samples = []
+        for request in range(requests_per_client):
+            sequence = request * clients + number
+            samples.append(await run_request(engine, kind, course_context(sequence % contexts), sequence))
+        return samples
+
+    start = time.perf_counter()
+    try:
+        results = await asyncio.gather(*(client(number) for number in range(clients)))
+    finally:
+        await engine.close()
+    elapsed = time.perf_counter() - start
+
+    samples = [sample for samples in results for sample in samples]
+    latencies = [sample.latency for sample in samples]
+    first_tokens = [sample.first_token for sample in samples if sample.first_token is not None]
+    tokens = sum(sample.tokens for sample in samples)
+    summary = {
+        "type": kind,
+        "clients": clients,
+        "requests": len(samples),
+        "errors": sum(1 for sample in samples if not sample.ok),
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "throughput_rps": len(samples) / elapsed if elapsed else 0.0,
+        "tokens": tokens,
+        "tokens_per_request": tokens / len(samples) if samples else 0.0,
+        "provider_calls": provider.calls,
+        "cache_hits": engine.cache.stats()["hits"] if engine.cache else 0,
+        "coalesced": engine.coalesced,
+    }
+    if first_tokens:
+        summary["ttft_p50_ms"] = percentile(first_tokens, 50) * 1000
+        summary["ttft_p95_ms"] = percentile(first_tokens, 95) * 1000
+    return summary
+
+
+def format_table(rows: List[Dict[str, Any]]) -> str:
+    """Lay out workload summaries as an aligned text table."""
+    columns = (
+        ("type", "type", "{}"),
+        ("clients", "clients", "{}"),
+        ("requests", "reqs", "{}"),
+        ("errors", "errors", "{}"),
+        ("p50_ms", "p50 ms", "{:.1f}"),
+        ("p95_ms", "p95 ms", "{:.1f}"),
+        ("p99_ms", "p99 ms", "{:.1f}"),
+        ("ttft_p50_ms", "ttft p50", "{:.1f}"),
+        ("throughput_rps", "req/s", "{:.1f}"),
+        ("tokens", "tokens", "{}"),
+        ("tokens_per_request", "tok/req", "{:.0f}"),
+        ("provider_calls", "calls", "{}"),
+        ("cache_hits", "hits", "{}"),
+        ("coalesced", "coalesced", "{}"),
+    )
+    table = [[title for _, title, _ in columns]]
+    for row in rows:
+        table.append([fmt.format(row[key]) if key in row else "-" for key, _, fmt in columns])
+    widths = [max(len(line[index]) for line in table) for index in range(len(columns))]
+    return "\n".join(
+        "  ".join(cell.rjust(width) if index else cell.ljust(width) for index, (cell, width) in enumerate(zip(line, widths)))
+        for line in table
+    )
+
+
+def parse_list(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+async def main(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    settings.AI_MAX_CONCURRENCY = args.section_concurrency
+    provider_options = {
+        "latency": args.latency,
+        "distribution": args.distribution,
+        "spread": args.spread,
+        "tokens_per_second": args.tokens_per_second,
+        "error_rate": args.error_rate,
+        "seed": args.seed,
+    }
+
+    rows = []
+    for kind in parse_list(args.types):
+        for clients in (int(value) for value in parse_list(args.clients)):
+            total = clients * args.requests
+            row = await run_workload(
+                kind,
+                clients,
+                args.requests,
+                args.contexts or total,
+                provider_options,
+                cache=not args.no_cache,
+            )
+            rows.append(row)
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the AI engine against a fake provider")
+    parser.add_argument("--types", default="objectives,full,chat,chat_stream",
+                        help=f"Comma-separated workloads: {', '.join(GENERATION_TYPES + CHAT_TYPES)}")
+    parser.add_argument("--clients", default="1,8", help="Comma-separated concurrent client counts")
+    parser.add_argument("--requests", type=int, default=20, help="Requests per client")
+    parser.add_argument("--contexts", type=int, default=0,
+                        help="Distinct courses requests are drawn from (default: one per request)")
+    parser.add_argument("--latency", type=float, default=0.2, help="Mean seconds to first token")
+    parser.add_argument("--distribution", default="lognormal", choices=sorted(LATENCY_DISTRIBUTIONS))
+    parser.add_argument("--spread", type=float, default=0.5, help="Relative spread of the latency")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Completion speed; 0 for instant")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of provider calls that fail")
+    parser.add_argument("--section-concurrency", type=int, default=settings.AI_MAX_CONCURRENCY,
+                        help="Concurrent section requests per full generation")
+    parser.add_argument("--no-cache", action="store_true", help="Run without the generation cache")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    unknown = set(parse_list(args.types)) - set(GENERATION_TYPES + CHAT_TYPES)
+    if unknown:
+        parser.error(f"Unknown workload: {', '.join(sorted(unknown))}")
+
+    results = asyncio.run(main(args))
+    print(json.dumps(results, indent=2) if args.json else format_table(results))
@@ -0,0 +1,130 @@
+"""
+In-process stand-in for an LLM provider, for benchmarks.
+
+Unlike the stub server, the fake provider needs no network and no second
+process: it answers in the same event loop as the engine, after a
+simulated delay. Each call waits a time-to-first-token drawn from a
+latency distribution, then produces its completion at a fixed token rate,
+so full replies take longer than short ones and streamed replies arrive
+token by token. A share of calls can be made to fail.
+
+Generation requests are answered with the mock engine's output for the
+task, so responses are valid course JSON and exercise the engine's
+parsing. Other requests get the mock chat reply.
+"""
+
+import asyncio
+import json
+import math
+import random
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+from app.services.ai_engine import STREAM_CHUNK_PATTERN, AIEngine
+from app.services.llm_provider import LLMError, LLMProvider, LLMResponse, UsageCallback
+from app.services.usage import estimate_message_tokens, estimate_tokens
+from app.testing.stub_llm import generation_request, last_user_message
+
+# Time-to-first-token distributions, each drawing a delay around a mean with a relative spread
+LATENCY_DISTRIBUTIONS: Dict[str, Callable[[random.Random, float, float], float]] = {
+    "fixed": lambda rng, mean, spread: mean,
+    "uniform": lambda rng, mean, spread: rng.uniform(mean * (1 - spread), mean * (1 + spread)),
+    "normal": lambda rng, mean, spread: rng.gauss(mean, mean * spread),
+    "exponential": lambda rng, mean, spread: rng.expovariate(1 / mean) if mean > 0 else 0.0,
+    # Long-tailed, like real model latency; the mean is kept, spread is sigma
+    "lognormal": lambda rng, mean, spread: rng.lognormvariate(math.log(mean) - spread ** 2 / 2, spread) if mean > 0 else 0.0,
+}
+
+
+class FakeProvider(LLMProvider):
+    """
+    A provider with simulated latency, throughput and failures.
+
+    Args:
+        latency: Mean seconds before the first token
+        distribution: How that delay varies (see LATENCY_DISTRIBUTIONS)
+        spread: Relative variation of the delay, e.g. 0.5 for +/-50%
+        tokens_per_second: Completion speed; 0 makes completions instant
+        error_rate: Share of calls (0-1) that fail with LLMError
+        seed: Seed for reproducible runs
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        latency: float = 0.2,
+        distribution: str = "lognormal",
+        spread: float = 0.5,
+        tokens_per_second: float = 0.0,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+        model: str = "fake",
+    ):
+        super().__init__(model)
+        if distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+        self.latency = latency
+        self.distribution = distribution
+        self.spread = spread
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        # Source of mock output; it never records usage, so only the provider's report counts
+        self.engine = AIEngine()
+        self.calls = 0
+        self.errors = 0
+
+    def _first_token_delay(self) -> float:
+        return max(0.0, LATENCY_DISTRIBUTIONS[self.distribution](self.random, self.latency, self.spread))
+
+    def _token_delay(self, tokens: int) -> float:
+        return tokens / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+    async def _reply(self, messages: List[Dict[str, str]]) -> str:
+        """Produce the reply text, failing at the configured rate."""
+        self.calls += 1
+        await asyncio.sleep(self._first_token_delay())
+        if self.error_rate and self.random.random() < self.error_rate:
+            self.errors += 1
+            raise LLMError("Fake upstream unavailable", status_code=503)
+
+        request = generation_request(messages)
+        if request:
+            task, context = request
+            return json.dumps(await self.engine.mock_section(task, context))
+        return self.engine.mock_chat_reply(last_user_message(messages), None)
+
+    async def complete(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        json_mode: bool = False,
+        timeout: Optional[float] = None,
+    ) -> LLMResponse:
+        """Answer after the first-token delay plus the time to produce the completion."""
+        text = await self._reply(messages)
+        completion_tokens = estimate_tokens(text)
+        await asyncio.sleep(self._token_delay(completion_tokens))
+        return LLMResponse(
+            text=text,
+            model=self.model,
+            prompt_tokens=estimate_message_tokens(messages),
+            completion_tokens=completion_tokens,
+        )
+
+    async def stream(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        timeout: Optional[float] = None,
+        on_usage: Optional[UsageCallback] = None,
+    ) -> AsyncIterator[str]:
+        """Yield the reply word by word at the configured token rate, reporting usage at the end."""
+        text = await self._reply(messages)
+        for chunk in STREAM_CHUNK_PATTERN.findall(text):
+            await asyncio.sleep(self._token_delay(estimate_tokens(chunk)))
+            yield chunk
+        if on_usage is not None:
+            on_usage(estimate_message_tokens(messages), estimate_tokens(text))
@@ -0,0 +1,147 @@
+"""
+Local stand-in for an OpenAI-compatible chat completion API.
+
+Run it next to the backend and point the OpenAI provider at it:
+
+    python -m app.testing.stub_llm --port 8001
+    AI_PROVIDER=openai AI_API_BASE=http://127.0.0.1:8001/v1
+
+Generation requests (those whose prompt names a ``Task:``) are answered with
+the mock engine's output for that section, so responses are valid course
+JSON. Other requests get the mock chat reply. Streaming requests get the
+reply word by word as server-sent events. Latency, failure rate and the
+delay between streamed words can be set with STUB_LLM_LATENCY (seconds),
+STUB_LLM_FAILURE_RATE (0-1) and STUB_LLM_TOKEN_DELAY (seconds).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.services.ai_engine import STREAM_CHUNK_PATTERN, AIEngine
+
+TASK_PATTERN = re.compile(r"^Task:\s*(\w+)\s*$", re.MULTILINE)
+CONTEXT_PATTERN = re.compile(r"^Course context:\n(.*)$", re.MULTILINE)
+
+app = FastAPI(title="Stub LLM")
+engine = AIEngine()
+
+
+def count_tokens(text: str) -> int:
+    """Approximate a token count from whitespace-separated words."""
+    return len(text.split())
+
+
+def generation_request(messages: List[Dict[str, Any]]) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """Find the task and course context of a generation prompt, or None for chat."""
+    prompt = "\n".join(str(message.get("content", "")) for message in messages)
+
+    task = TASK_PATTERN.search(prompt)
+    if not task:
+        return None
+    context = {}
+    match = CONTEXT_PATTERN.search(prompt)
+    if match:
+        try:
+            context = json.loads(match.group(1))
+        except json.JSONDecodeError:
+            pass
+    return task.group(1), context
+
+
+def last_user_message(messages: List[Dict[str, Any]]) -> str:
+    """Get the text of the last user message."""
+    user_messages = [message for message in messages if message.get("role") == "user"]
+    return user_messages[-1]["content"] if user_messages else ""
+
+
+async def stub_reply(messages: List[Dict[str, Any]]) -> str:
+    """Produce the reply text for a list of chat messages."""
+    request = generation_request(messages)
+    if request:
+        task, context = request
+        return json.dumps(await engine.generate_section(task, context))
+    return await engine.chat(last_user_message(messages))
+
+
+async def stream_reply(completion_id: str, model: str, text: str):
+    """Yield a reply as OpenAI-style streaming chunks."""
+    token_delay = float(os.environ.get("STUB_LLM_TOKEN_DELAY", "0"))
+    for piece in STREAM_CHUNK_PATTERN.findall(text):
+        if token_delay:
+            await asyncio.sleep(token_delay)
+        chunk = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "model": model,
+            "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}],
+        }
+        yield f"data: {json.dumps(chunk)}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    """Answer a chat completion request."""
+    body = await request.json()
+
+    latency = float(os.environ.get("STUB_LLM_LATENCY", "0"))
+    if latency:
+        await asyncio.sleep(latency)
+
+    failure_rate = float(os.environ.get("STUB_LLM_FAILURE_RATE", "0"))
+    if failure_rate and random.random() < failure_rate:
+        return JSONResponse(
+            status_code=503,
+            content={"error": {"message": "Stub upstream unavailable"}},
+        )
+
+    messages = body.get("messages", [])
+    text = await stub_reply(messages)
+    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+    model = body.get("model", "stub")
+
+    if body.get("stream"):
+        return StreamingResponse(
+            stream_reply(completion_id, model, text),
+            media_type="text/event-stream",
+        )
+
+    prompt_tokens = sum(count_tokens(str(message.get("content", ""))) for message in messages)
+    completion_tokens = count_tokens(text)
+
+    return {
+        "id": completion_id,
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": text},
+            "finish_reason": "stop",
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run the stub LLM server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    args = parser.parse_args()
+    uvicorn.run(app, host=args.host, port=args.port)
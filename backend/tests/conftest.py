@@ -0,0 +1,32 @@
+"""Shared fixtures for the backend tests."""
+
+import tempfile
+
+import pytest
+
+from app.core.config import settings
+
+# Services created at import time write under these, so move them off the real data first
+settings.DATA_DIR = tempfile.mkdtemp(prefix="prometheus-test-data-")
+settings.EXPORT_DIR = tempfile.mkdtemp(prefix="prometheus-test-exports-")
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Point DATA_DIR at an empty directory for one test."""
+    monkeypatch.setattr(settings, "DATA_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def client():
+    """A test client for the app, starting its services, with an empty course store."""
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+    from app.services.storage import storage_service
+
+    for course in storage_service.get_all_courses():
+        storage_service.delete_course(course.id)
+    with TestClient(app) as client:
+        yield client
@@ -0,0 +1,50 @@
+"""Chat sessions: course context and the conversation kept on the server."""
+
+from app.services.chat_sessions import chat_session_store
+
+
+def prompt_text(session_id: str, message: str = "next") -> str:
+    session = chat_session_store.get(session_id)
+    course = session.course_context
+    return "\n".join(part["content"] for part in chat_session_store.build_messages(session, message, course))
+
+
+def test_messages_update_the_snapshot_of_an_unsaved_course(client):
+    session_id = client.post("/api/ai/chat/sessions", json={"course_context": {"title": "Old title"}}).json()["id"]
+
+    response = client.post(
+        f"/api/ai/chat/sessions/{session_id}/messages",
+        json={"message": "Suggest objectives", "course_context": {"title": "New title"}},
+    )
+    assert response.status_code == 200
+    assert "New title" in prompt_text(session_id)
+    assert "Old title" not in prompt_text(session_id)
+
+    with client.stream(
+        "POST",
+        f"/api/ai/chat/sessions/{session_id}/messages/stream",
+        json={"message": "And assessments?", "course_context": {"title": "Newest title"}},
+    ) as stream:
+        assert "event: done" in "".join(stream.iter_text())
+    # A message without a snapshot keeps the last one
+    client.post(f"/api/ai/chat/sessions/{session_id}/messages", json={"message": "Thanks"})
+    assert chat_session_store.get(session_id).course_context == {"title": "Newest title"}
+
+    turns = client.get(f"/api/ai/chat/sessions/{session_id}").json()["turns"]
+    assert [turn["role"] for turn in turns] == ["user", "assistant"] * 3
+
+
+def test_stored_courses_are_read_fresh_for_each_message(client):
+    course = client.post("/api/courses/", json={"title": "Stored", "code": "S"}).json()
+    session_id = client.post("/api/ai/chat/sessions", json={"course_id": course["id"]}).json()["id"]
+    client.post(
+        f"/api/ai/chat/sessions/{session_id}/messages",
+        json={"message": "Hello", "course_context": {"title": "Ignored"}},
+    )
+    assert chat_session_store.get(session_id).course_context is None
+
+
+def test_unknown_sessions_and_courses_are_404(client):
+    assert client.post("/api/ai/chat/sessions", json={"course_id": "missing"}).status_code == 404
+    assert client.post("/api/ai/chat/sessions/missing/messages", json={"message": "Hi"}).status_code == 404
+    assert client.get("/api/ai/chat/sessions/missing").status_code == 404
@@ -0,0 +1,137 @@
+"""Identical generations in flight are shared between callers, streamed or not."""
+
+import asyncio
+
+from app.services.ai_engine import AIEngine
+from app.services.generation_cache import GenerationCache
+from app.services.usage import metered
+from app.testing.fake_provider import FakeProvider
+
+CONTEXT = {"title": "Data Science", "level": "basic"}
+
+
+def engine_with(latency: float = 0.1):
+    provider = FakeProvider(latency=latency, distribution="fixed", seed=1)
+    return AIEngine(provider=provider, cache=GenerationCache()), provider
+
+
+async def single_run_calls(generation_type: str) -> int:
+    engine, provider = engine_with(latency=0)
+    await engine.generate_content(CONTEXT, generation_type)
+    return provider.calls
+
+
+def test_concurrent_requests_share_one_generation():
+    async def scenario():
+        engine, provider = engine_with()
+
+        async def caller():
+            with metered() as meter:
+                return await engine.generate_content(CONTEXT, "full"), meter.total_tokens
+
+        outcomes = await asyncio.gather(*(caller() for _ in range(5)))
+        assert provider.calls == await single_run_calls("full")
+        assert engine.coalesced == 4 and engine.inflight == 0
+        results = [result for result, _ in outcomes]
+        assert all(result == results[0] for result in results)
+        # Every caller is charged the shared generation's usage
+        tokens = {tokens for _, tokens in outcomes}
+        assert len(tokens) == 1 and tokens.pop() > 0
+
+        # Each caller has its own copy
+        results[0]["learningObjectives"].clear()
+        assert results[1]["learningObjectives"]
+
+    asyncio.run(scenario())
+
+
+def test_fresh_requests_still_share_in_flight_work():
+    async def scenario():
+        engine, provider = engine_with()
+        await asyncio.gather(*(engine.generate_content(CONTEXT, "objectives", fresh=True) for _ in range(3)))
+        assert provider.calls == await single_run_calls("objectives")
+        assert engine.coalesced == 2
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_does_not_cancel_the_generation():
+    async def scenario():
+        engine, provider = engine_with()
+        leaving = asyncio.create_task(engine.generate_content(CONTEXT, "objectives"))
+        staying = asyncio.create_task(engine.generate_content(CONTEXT, "objectives"))
+        await asyncio.sleep(0.02)
+        leaving.cancel()
+
+        result = await staying
+        assert leaving.cancelled()
+        assert "error" not in result
+        assert provider.calls == await single_run_calls("objectives")
+
+    asyncio.run(scenario())
+
+
+def test_generation_completes_and_caches_when_every_waiter_leaves():
+    async def scenario():
+        engine, provider = engine_with()
+        task = asyncio.create_task(engine.generate_content(CONTEXT, "objectives"))
+        await asyncio.sleep(0.02)
+        task.cancel()
+        while engine.inflight:
+            await asyncio.sleep(0.01)
+
+        calls = provider.calls
+        assert "error" not in await engine.generate_content(CONTEXT, "objectives")
+        assert provider.calls == calls
+        assert engine.cache.stats()["hits"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_stream_joins_a_generation_in_flight():
+    async def scenario():
+        engine, provider = engine_with()
+        plain = asyncio.create_task(engine.generate_content(CONTEXT, "full"))
+        await asyncio.sleep(0.02)
+        events = [event async for event in engine.generate_stream(CONTEXT, "full")]
+        result = await plain
+
+        assert provider.calls == await single_run_calls("full")
+        names = [name for name, _ in events]
+        assert names[-1] == "done" and "error" not in names
+        assert names.count("module") == len(result["modules"])
+        assert "section" in names
+
+    asyncio.run(scenario())
+
+
+def test_late_stream_receives_events_from_the_start():
+    async def scenario():
+        engine, _ = engine_with(latency=0.05)
+        first = [event async for event in engine.generate_stream(CONTEXT, "full")]
+
+        engine, _ = engine_with(latency=0.05)
+        early = engine.generate_stream(CONTEXT, "full")
+        early_events = [await early.__anext__()]
+        late_events = [event async for event in engine.generate_stream(CONTEXT, "full")]
+        early_events += [event async for event in early]
+
+        assert [name for name, _ in early_events] == [name for name, _ in late_events] == [name for name, _ in first]
+        assert early_events == late_events
+
+    asyncio.run(scenario())
+
+
+def test_closing_one_stream_does_not_stop_the_others():
+    async def scenario():
+        engine, provider = engine_with()
+        closing = engine.generate_stream(CONTEXT, "full")
+        staying = asyncio.create_task(engine.generate_content(CONTEXT, "full"))
+        await closing.__anext__()
+        await closing.aclose()
+
+        result = await staying
+        assert "errors" not in result and "error" not in result
+        assert provider.calls == await single_run_calls("full")
+
+    asyncio.run(scenario())
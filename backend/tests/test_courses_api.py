@@ -0,0 +1,80 @@
+"""Course API: bulk ingest, streaming and summary paging."""
+
+import json
+
+import pytest
+
+from app.core.config import settings
+
+
+def ndjson(*records) -> bytes:
+    return b"".join(json.dumps(record).encode() + b"\n" for record in records)
+
+
+def titles(client) -> list:
+    return sorted(course["title"] for course in client.get("/api/courses/").json())
+
+
+def test_bulk_ingest_creates_replaces_and_reports_bad_lines(client, monkeypatch):
+    monkeypatch.setattr(settings, "BULK_BATCH_SIZE", 2)
+    existing = client.post("/api/courses/", json={"title": "Before", "code": "B"}).json()
+    body = (
+        ndjson({"title": "One", "code": "1"}, {"title": "Two", "code": "2"})
+        + b"not json\n\n"
+        + ndjson({"title": "missing code"}, {**existing, "title": "After"})
+        + json.dumps({"title": "Last", "code": "L"}).encode()  # no trailing newline
+    )
+    response = client.post("/api/courses/bulk", content=body, headers={"content-type": "application/x-ndjson"})
+
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["imported"], result["failed"]) == (4, 2)
+    assert [error["line"] for error in result["errors"]] == [3, 5]
+    assert titles(client) == ["After", "Last", "One", "Two"]
+
+
+def test_bulk_ingest_rejects_oversized_lines(client, monkeypatch):
+    monkeypatch.setattr(settings, "BULK_MAX_LINE_BYTES", 100)
+
+    def chunks():
+        yield ndjson({"title": "Kept", "code": "K"})
+        for _ in range(5):  # a 500 byte line arriving over several chunks
+            yield b"x" * 100
+        yield b"\n" + ndjson({"title": "Also kept", "code": "A"})
+        yield b"y" * 200 + b"\n"  # an oversized line within one chunk
+        yield b"z" * 200  # an oversized last line
+
+    result = client.post("/api/courses/bulk", content=chunks()).json()
+    assert result["imported"] == 2
+    assert [error["line"] for error in result["errors"]] == [2, 4, 5]
+    assert all("exceeds 100 bytes" in error["error"] for error in result["errors"])
+    assert titles(client) == ["Also kept", "Kept"]
+
+
+def test_stream_returns_every_course_as_ndjson(client):
+    for i in range(3):
+        client.post("/api/courses/", json={"title": f"Course {i}", "code": f"C{i}"})
+    with client.stream("GET", "/api/courses/stream") as response:
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        streamed = [json.loads(line) for line in response.iter_lines() if line]
+    assert sorted(course["title"] for course in streamed) == ["Course 0", "Course 1", "Course 2"]
+
+
+@pytest.mark.parametrize("query", ["", "?q=course"])
+def test_summary_cursors_walk_every_course_once(client, query):
+    ids = {client.post("/api/courses/", json={"title": f"Course {i}", "code": f"C{i}"}).json()["id"] for i in range(5)}
+    separator = "&" if query else "?"
+    seen = []
+    page = client.get(f"/api/courses/summary{query}{separator}limit=2").json()
+    while True:
+        assert page["total"] == 5
+        seen.extend(item["id"] for item in page["items"])
+        if page["next_cursor"] is None:
+            break
+        page = client.get(f"/api/courses/summary{query}{separator}limit=2&cursor={page['next_cursor']}").json()
+    assert sorted(seen) == sorted(ids)
+
+
+def test_summary_rejects_a_bad_cursor(client):
+    client.post("/api/courses/", json={"title": "Only", "code": "O"})
+    assert client.get("/api/courses/summary?cursor=not-a-cursor").status_code == 400
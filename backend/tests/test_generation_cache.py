@@ -0,0 +1,150 @@
+"""Generation cache: keys, LRU and TTL bounds, the disk tier, and its use by the engine."""
+
+import asyncio
+import os
+
+from app.services.ai_engine import AIEngine
+from app.services.generation_cache import GenerationCache, cache_key
+from app.testing.fake_provider import FakeProvider
+
+FINGERPRINT = {"provider": "fake", "model": "fake"}
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_equivalent_contexts_share_a_key():
+    key = cache_key({"title": "Data  Science\n", "notes": "", "tags": []}, "objectives", FINGERPRINT)
+    assert key == cache_key({"title": "Data Science"}, "objectives", FINGERPRINT)
+    assert key != cache_key({"title": "data science"}, "objectives", FINGERPRINT)
+    assert key != cache_key({"title": "Data Science"}, "modules", FINGERPRINT)
+    assert key != cache_key({"title": "Data Science"}, "objectives", {**FINGERPRINT, "model": "other"})
+
+
+def test_hits_return_copies():
+    async def scenario():
+        cache = GenerationCache()
+        await cache.set("k", {"items": [1, 2]})
+        first = await cache.get("k")
+        first["items"].append(3)
+        assert await cache.get("k") == {"items": [1, 2]}
+        assert await cache.get("missing") is None
+        return cache.stats()
+
+    stats = run(scenario())
+    assert (stats["hits"], stats["misses"], stats["stores"]) == (2, 1, 1)
+
+
+def test_memory_tier_evicts_least_recently_used():
+    async def scenario():
+        cache = GenerationCache(max_entries=2)
+        await cache.set("a", {"v": "a"})
+        await cache.set("b", {"v": "b"})
+        await cache.get("a")
+        await cache.set("c", {"v": "c"})
+        return [await cache.get(key) is not None for key in "abc"], cache.stats()
+
+    present, stats = run(scenario())
+    assert present == [True, False, True]
+    assert stats["evictions"] == 1 and stats["entries"] == 2
+
+
+def test_memory_tier_is_bounded_in_bytes():
+    async def scenario():
+        cache = GenerationCache(max_bytes=100)
+        await cache.set("big", {"v": "x" * 200})
+        await cache.set("a", {"v": "a" * 60})
+        await cache.set("b", {"v": "b" * 60})
+        return [await cache.get(key) is not None for key in ("big", "a", "b")], cache.stats()
+
+    present, stats = run(scenario())
+    assert present == [False, False, True]
+    assert stats["entries"] == 1 and stats["bytes"] <= 100
+
+
+def test_entries_expire():
+    async def scenario():
+        cache = GenerationCache(ttl=0.05)
+        await cache.set("k", {"v": 1})
+        assert await cache.get("k") == {"v": 1}
+        await asyncio.sleep(0.1)
+        return await cache.get("k"), cache.stats()
+
+    value, stats = run(scenario())
+    assert value is None and stats["expirations"] == 1
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    disk_dir = str(tmp_path / "cache")
+
+    async def scenario():
+        await GenerationCache(disk_dir=disk_dir).set("k", {"v": 1})
+        restarted = GenerationCache(disk_dir=disk_dir)
+        await restarted.start()
+        return await restarted.get("k"), restarted.stats()
+
+    value, stats = run(scenario())
+    assert value == {"v": 1}
+    assert stats["disk_hits"] == 1 and stats["disk_entries"] == 1
+
+
+def test_disk_tier_is_bounded(tmp_path):
+    disk_dir = str(tmp_path / "cache")
+
+    async def scenario():
+        cache = GenerationCache(max_entries=2, disk_dir=disk_dir)
+        for key in "abcd":
+            await cache.set(key, {"v": key})
+        return cache.stats()
+
+    stats = run(scenario())
+    assert sorted(os.listdir(disk_dir)) == ["c.json", "d.json"]
+    assert stats["disk_entries"] == 2 and stats["disk_evictions"] == 2
+
+
+def test_disk_tier_is_trimmed_on_start(tmp_path):
+    disk_dir = str(tmp_path / "cache")
+
+    async def scenario():
+        cache = GenerationCache(disk_dir=disk_dir)
+        for key in "abc":
+            await cache.set(key, {"v": key})
+            os.utime(os.path.join(disk_dir, f"{key}.json"), (0, {"a": 1, "b": 2, "c": 3}[key]))
+        smaller = GenerationCache(max_entries=1, disk_dir=disk_dir)
+        await smaller.start()
+
+    run(scenario())
+    assert os.listdir(disk_dir) == ["c.json"]
+
+
+def test_engine_reuses_cached_results():
+    async def scenario():
+        provider = FakeProvider(latency=0, seed=1)
+        engine = AIEngine(provider=provider, cache=GenerationCache())
+        context = {"title": "Data Science", "level": "basic"}
+        first = await engine.generate_content(context, "objectives")
+        calls = provider.calls
+        second = await engine.generate_content(context, "objectives")
+        assert provider.calls == calls and second == first
+
+        # fresh skips the cache and replaces the stored result
+        fresh = await engine.generate_content(context, "objectives", fresh=True)
+        assert provider.calls == 2 * calls
+        assert await engine.generate_content(context, "objectives") == fresh
+
+    run(scenario())
+
+
+def test_engine_does_not_cache_failures():
+    async def scenario():
+        provider = FakeProvider(latency=0, error_rate=1.0, seed=1)
+        cache = GenerationCache()
+        engine = AIEngine(provider=provider, cache=cache)
+        assert "error" in await engine.generate_content({"title": "T"}, "objectives")
+        calls = provider.calls
+        assert "error" in await engine.generate_content({"title": "T"}, "objectives")
+        assert provider.calls > calls
+        assert cache.stats()["stores"] == 0
+
+    run(scenario())
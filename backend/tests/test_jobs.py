@@ -0,0 +1,214 @@
+"""Background jobs: lifecycle, priorities, cancellation and restarts."""
+
+import asyncio
+
+import pytest
+
+from app.models.job import JobStatusEnum
+from app.services.jobs import JobQueue, UnknownJobKind
+
+
+async def finished(queue: JobQueue, job_id: str, timeout: float = 5.0):
+    """Wait for a job to finish and return it with its result."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not queue.get(job_id).finished:
+        assert asyncio.get_running_loop().time() < deadline, "job did not finish"
+        await asyncio.sleep(0.01)
+    return await queue.fetch(job_id)
+
+
+@pytest.fixture
+def job_dir(tmp_path):
+    return str(tmp_path / "jobs")
+
+
+def test_job_succeeds_and_result_is_read_back_from_disk(job_dir):
+    async def scenario():
+        queue = JobQueue(directory=job_dir, workers=1)
+
+        async def double(payload):
+            return {"value": payload["value"] * 2}
+
+        queue.register("double", double)
+        await queue.start()
+        job = await queue.submit("double", {"value": 21})
+        done = await finished(queue, job.id)
+        await queue.stop()
+        return queue, done
+
+    queue, done = asyncio.run(scenario())
+    assert done.status == JobStatusEnum.SUCCEEDED
+    assert done.result == {"value": 42}
+    assert done.started_date and done.finished_date
+    # Only the copy read back by fetch carries the result
+    assert queue.get(done.id).result is None
+    assert [job.result for job in queue.list_jobs()] == [None]
+
+
+def test_failed_job_records_the_error(job_dir):
+    async def scenario():
+        queue = JobQueue(directory=job_dir, workers=1)
+
+        async def broken(payload):
+            raise ValueError("no good")
+
+        queue.register("broken", broken)
+        await queue.start()
+        job = await queue.submit("broken")
+        done = await finished(queue, job.id)
+        await queue.stop()
+        return done
+
+    done = asyncio.run(scenario())
+    assert done.status == JobStatusEnum.FAILED
+    assert done.error == "no good"
+    assert done.result is None
+
+
+def test_unknown_kind_is_rejected(job_dir):
+    with pytest.raises(UnknownJobKind):
+        asyncio.run(JobQueue(directory=job_dir).submit("nope"))
+
+
+def test_higher_priority_runs_first(job_dir):
+    async def scenario():
+        queue = JobQueue(directory=job_dir, workers=1)
+        release = asyncio.Event()
+        order = []
+
+        async def record(payload):
+            if payload["name"] == "blocker":
+                await release.wait()
+            order.append(payload["name"])
+
+        queue.register("record", record)
+        await queue.start()
+        blocker = await queue.submit("record", {"name": "blocker"})
+        await asyncio.sleep(0.05)
+        jobs = [
+            await queue.submit("record", {"name": "low"}, priority=-1),
+            await queue.submit("record", {"name": "first"}),
+            await queue.submit("record", {"name": "high"}, priority=5),
+            await queue.submit("record", {"name": "second"}),
+        ]
+        release.set()
+        for job in [blocker] + jobs:
+            await finished(queue, job.id)
+        await queue.stop()
+        return order
+
+    assert asyncio.run(scenario()) == ["blocker", "high", "first", "second", "low"]
+
+
+def test_cancelled_jobs_stay_cancelled(job_dir):
+    async def scenario():
+        queue = JobQueue(directory=job_dir, workers=1)
+        ran = []
+
+        async def slow(payload):
+            ran.append(payload["name"])
+            await asyncio.sleep(10)
+
+        queue.register("slow", slow)
+        await queue.start()
+        running = await queue.submit("slow", {"name": "running"})
+        waiting = await queue.submit("slow", {"name": "waiting"})
+        await asyncio.sleep(0.05)
+        await queue.cancel(waiting.id)
+        await queue.cancel(running.id)
+        await asyncio.sleep(0.05)
+        await queue.stop()
+
+        restarted = JobQueue(directory=job_dir, workers=1)
+        restarted.register("slow", slow)
+        await restarted.start()
+        await asyncio.sleep(0.05)
+        await restarted.stop()
+        return ran, [restarted.get(job.id).status for job in (running, waiting)]
+
+    ran, statuses = asyncio.run(scenario())
+    assert ran == ["running"]
+    assert statuses == [JobStatusEnum.CANCELLED, JobStatusEnum.CANCELLED]
+
+
+def test_cancel_after_the_handler_returned_wins(job_dir):
+    async def scenario():
+        queue = JobQueue(directory=job_dir, workers=1)
+        submitted = []
+
+        async def finish_as_cancelled(payload):
+            # cancel() gets in after the handler has returned but before its outcome is recorded
+            asyncio.ensure_future(queue.cancel(submitted[0]))
+            return {"value": 1}
+
+        queue.register("race", finish_as_cancelled)
+        await queue.start()
+        submitted.append((await queue.submit("race")).id)
+        done = await finished(queue, submitted[0])
+        await asyncio.sleep(0.05)
+        await queue.stop()
+        return done, JobQueue(directory=job_dir)._read_job(submitted[0])
+
+    done, on_disk = asyncio.run(scenario())
+    assert done.status == on_disk.status == JobStatusEnum.CANCELLED
+    assert on_disk.result is None
+
+
+def test_job_cancelled_while_starting_never_runs(job_dir):
+    class CancelOnStart(JobQueue):
+        async def _save(self, job):
+            if job.status == JobStatusEnum.RUNNING:
+                asyncio.ensure_future(self.cancel(job.id))
+            await super()._save(job)
+
+    async def scenario():
+        queue = CancelOnStart(directory=job_dir, workers=1)
+        ran = []
+
+        async def work(payload):
+            ran.append(True)
+
+        queue.register("work", work)
+        await queue.start()
+        job = await queue.submit("work")
+        await finished(queue, job.id)
+        await asyncio.sleep(0.05)
+        await queue.stop()
+        return ran, JobQueue(directory=job_dir)._read_job(job.id)
+
+    ran, on_disk = asyncio.run(scenario())
+    assert ran == []
+    assert on_disk.status == JobStatusEnum.CANCELLED
+
+
+def test_unfinished_jobs_resume_after_restart(job_dir):
+    async def scenario():
+        release = asyncio.Event()
+        runs = []
+
+        async def work(payload):
+            runs.append(payload["name"])
+            if payload["name"] == "interrupted" and runs.count("interrupted") == 1:
+                await release.wait()
+            return {"name": payload["name"]}
+
+        queue = JobQueue(directory=job_dir, workers=1)
+        queue.register("work", work)
+        await queue.start()
+        interrupted = await queue.submit("work", {"name": "interrupted"})
+        queued = await queue.submit("work", {"name": "queued"})
+        await asyncio.sleep(0.05)
+        await queue.stop()
+        left = [queue.get(job.id).status for job in (interrupted, queued)]
+
+        restarted = JobQueue(directory=job_dir, workers=1)
+        restarted.register("work", work)
+        await restarted.start()
+        results = [(await finished(restarted, job.id)).result for job in (interrupted, queued)]
+        await restarted.stop()
+        return runs, left, results
+
+    runs, left, results = asyncio.run(scenario())
+    assert left == [JobStatusEnum.QUEUED, JobStatusEnum.QUEUED]
+    assert runs == ["interrupted", "interrupted", "queued"]
+    assert results == [{"name": "interrupted"}, {"name": "queued"}]
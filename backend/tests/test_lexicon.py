@@ -0,0 +1,61 @@
+"""Resident lexicon: reloading and the background watcher."""
+
+import asyncio
+import json
+import shutil
+
+import pytest
+
+from app.core.config import settings
+from app.services.lexicon import LexiconService
+
+
+@pytest.fixture
+def lexicon_path(tmp_path):
+    path = tmp_path / "lexicon.json"
+    shutil.copy(settings.LEXICON_PATH, path)
+    return path
+
+
+def test_reload_picks_up_changes_and_keeps_the_last_good_lexicon(lexicon_path):
+    service = LexiconService(str(lexicon_path))
+    first = service.snapshot
+    assert first.loaded
+
+    assert service.reload(force=False) is first
+    data = json.loads(lexicon_path.read_text())
+    data["added_for_test"] = True
+    lexicon_path.write_text(json.dumps(data))
+    changed = service.reload(force=False)
+    assert changed is not first and changed.loaded
+
+    lexicon_path.write_text("{ not json")
+    kept = service.reload(force=False)
+    assert kept.loaded and kept.responses == changed.responses
+
+
+def test_watcher_survives_a_failing_reload(lexicon_path, monkeypatch):
+    monkeypatch.setattr(settings, "LEXICON_RELOAD_INTERVAL", 0.01)
+    service = LexiconService(str(lexicon_path))
+    reload = service.reload
+    attempts = []
+
+    def flaky_reload(force=True):
+        attempts.append(force)
+        if len(attempts) <= 2:
+            raise RuntimeError("disk on fire")
+        return reload(force)
+
+    async def scenario():
+        await service.start()
+        snapshot = service.snapshot
+        service.reload = flaky_reload
+        await asyncio.sleep(0.1)
+        alive = not service._watch_task.done()
+        await service.stop()
+        return snapshot, alive
+
+    snapshot, alive = asyncio.run(scenario())
+    assert alive
+    assert len(attempts) > 2
+    assert service.snapshot is snapshot
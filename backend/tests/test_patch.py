@@ -0,0 +1,138 @@
+"""JSON Patch, JSON Merge Patch and diff semantics."""
+
+import pytest
+
+from app.models.course import Assessment, Course
+from app.services.patch import (
+    PatchError,
+    PatchTestFailed,
+    apply_patch,
+    diff_operations,
+    merge_patch_to_operations,
+    parse_pointer,
+)
+
+
+@pytest.fixture
+def course():
+    return Course(
+        id="c1",
+        title="Course",
+        code="C",
+        level="basic",
+        modules=[
+            {
+                "id": f"m{i}",
+                "number": i + 1,
+                "title": f"Module {i + 1}",
+                "lessons": [{"id": f"m{i}l{j}", "number": j + 1, "title": f"Lesson {j + 1}"} for j in range(3)],
+            }
+            for i in range(3)
+        ],
+    )
+
+
+def lesson_ids(course: Course, module: int) -> list:
+    return [lesson.id for lesson in course.modules[module].lessons]
+
+
+def test_parse_pointer_unescapes_and_allows_relative_paths():
+    assert parse_pointer("/a~1b/c~0d") == ["a/b", "c~d"]
+    assert parse_pointer("modules/2/title") == parse_pointer("/modules/2/title")
+    assert parse_pointer("/") == []
+
+
+def test_replace_nested_value(course):
+    patched = apply_patch(course, [{"op": "replace", "path": "/modules/2/lessons/1/title", "value": "New"}])
+    assert patched.modules[2].lessons[1].title == "New"
+    # The original is left untouched, and untouched branches are shared rather than copied
+    assert course.modules[2].lessons[1].title == "Lesson 2"
+    assert patched.modules[0] is course.modules[0]
+
+
+def test_operations_apply_in_order(course):
+    patched = apply_patch(course, [
+        {"op": "add", "path": "/modules/0/lessons/-", "value": {"id": "x", "number": 9, "title": "Added"}},
+        {"op": "remove", "path": "/modules/1"},
+        {"op": "move", "from": "/modules/1/lessons/0", "path": "/modules/0/lessons/0"},
+        {"op": "copy", "from": "/title", "path": "/overview"},
+        {"op": "test", "path": "/overview", "value": "Course"},
+    ])
+    assert [module.id for module in patched.modules] == ["m0", "m2"]
+    assert lesson_ids(patched, 0) == ["m2l0", "m0l0", "m0l1", "m0l2", "x"]
+    assert lesson_ids(patched, 1) == ["m2l1", "m2l2"]
+    assert patched.overview == "Course"
+
+
+def test_add_inserts_at_index(course):
+    patched = apply_patch(course, [{"op": "add", "path": "/modules/1", "value": {"id": "ins", "number": 0, "title": "In"}}])
+    assert [module.id for module in patched.modules] == ["m0", "ins", "m1", "m2"]
+
+
+def test_remove_optional_field_resets_it(course):
+    assert apply_patch(course, [{"op": "remove", "path": "/level"}]).level is None
+
+
+@pytest.mark.parametrize("operation", [
+    {"op": "replace", "path": "/modules/0/number", "value": "not a number"},
+    {"op": "replace", "path": "/level", "value": "grandmaster"},
+    {"op": "add", "path": "/modules/-", "value": {"title": "missing id and number"}},
+])
+def test_written_values_are_validated(course, operation):
+    with pytest.raises(PatchError):
+        apply_patch(course, [operation])
+
+
+@pytest.mark.parametrize("operation", [
+    {"op": "replace", "path": "/id", "value": "other"},
+    {"op": "replace", "path": "", "value": {}},
+    {"op": "remove", "path": "/modules/9"},
+    {"op": "replace", "path": "/nope", "value": 1},
+    {"op": "move", "from": "/modules/0", "path": "/modules/0/lessons/0"},
+    {"op": "frobnicate", "path": "/title"},
+    {"op": "replace", "path": "/title"},
+])
+def test_invalid_operations_are_rejected(course, operation):
+    with pytest.raises(PatchError):
+        apply_patch(course, [operation])
+
+
+def test_failed_test_aborts_the_whole_patch(course):
+    with pytest.raises(PatchTestFailed):
+        apply_patch(course, [
+            {"op": "replace", "path": "/title", "value": "Changed"},
+            {"op": "test", "path": "/code", "value": "not the code"},
+        ])
+    assert course.title == "Course"
+
+
+def test_merge_patch_operations(course):
+    operations = merge_patch_to_operations({"description": "Merged", "metadata": {"reviewer": "R"}, "level": None})
+    assert operations == [
+        {"op": "replace", "path": "/description", "value": "Merged"},
+        {"op": "replace", "path": "/metadata/reviewer", "value": "R"},
+        {"op": "remove", "path": "/level"},
+    ]
+    patched = apply_patch(course, operations)
+    assert (patched.description, patched.metadata.reviewer, patched.level) == ("Merged", "R", None)
+    assert patched.metadata.created_date == course.metadata.created_date
+
+
+def test_merge_patch_must_be_an_object():
+    with pytest.raises(PatchError):
+        merge_patch_to_operations(["not", "an", "object"])
+
+
+def test_diff_changes_only_what_differs(course):
+    old = course.model_dump(mode="json")
+    new = course.model_dump(mode="json")
+    new["modules"][1]["lessons"][2]["title"] = "Changed"
+    new["assessments"].append(Assessment(id="a1", type="quiz", title="Quiz").model_dump(mode="json"))
+
+    operations = diff_operations(old, new)
+    assert operations == [
+        {"op": "replace", "path": "/modules/1/lessons/2/title", "value": "Changed"},
+        {"op": "replace", "path": "/assessments", "value": new["assessments"]},
+    ]
+    assert apply_patch(course, operations).model_dump(mode="json") == new
+    assert diff_operations(old, old) == []
@@ -0,0 +1,54 @@
+"""Prompt templates: reloading and the background watcher."""
+
+import asyncio
+import shutil
+
+import pytest
+
+from app.core.config import settings
+from app.services.prompt_templates import PromptTemplateService
+
+
+@pytest.fixture
+def template_dir(tmp_path):
+    directory = tmp_path / "prompts"
+    shutil.copytree(settings.PROMPT_TEMPLATE_DIR, directory)
+    return directory
+
+
+def test_broken_template_keeps_the_last_good_set(template_dir):
+    service = PromptTemplateService(str(template_dir))
+    good = service.current
+
+    (template_dir / "course.txt").write_text("Uses {{NOT_A_PLACEHOLDER}}")
+    kept = service.reload(force=False)
+    assert kept.templates is good.templates
+    assert "NOT_A_PLACEHOLDER" in service.stats()["error"]
+
+
+def test_watcher_survives_a_failing_reload(template_dir, monkeypatch):
+    monkeypatch.setattr(settings, "PROMPT_RELOAD_INTERVAL", 0.01)
+    service = PromptTemplateService(str(template_dir))
+    reload = service.reload
+    attempts = []
+
+    def flaky_reload(force=True):
+        attempts.append(force)
+        if len(attempts) <= 2:
+            raise RuntimeError("disk on fire")
+        return reload(force)
+
+    async def scenario():
+        await service.start()
+        templates = service.current
+        service.reload = flaky_reload
+        await asyncio.sleep(0.1)
+        alive = not service._watch_task.done()
+        await service.stop()
+        return templates, alive
+
+    templates, alive = asyncio.run(scenario())
+    assert alive
+    assert len(attempts) > 2
+    assert service.current is templates
+    assert service.stats()["error"] == "disk on fire"
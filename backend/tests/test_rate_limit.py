@@ -0,0 +1,170 @@
+"""Rate limiting: reservations, settlement and client bookkeeping."""
+
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from app.api.routes import ai as ai_routes
+from app.services.ai_engine import AIEngine
+from app.services.llm_provider import OpenAIProvider
+from app.services.rate_limit import RateLimiter, RateLimitExceeded
+from app.services.usage import metered, record_usage
+
+
+def token_level(limiter: RateLimiter, client: str) -> float:
+    _, tokens = limiter._buckets[client]
+    tokens._refill()
+    return tokens.level
+
+
+def test_reservation_is_settled_to_actual_usage():
+    limiter = RateLimiter(tokens_per_minute=60, reserve_tokens=30)
+    reserved = asyncio.run(limiter.acquire("client"))
+    assert reserved == 30
+    assert token_level(limiter, "client") == pytest.approx(30, abs=0.5)
+
+    limiter.charge("client", 10, reserved)
+    assert token_level(limiter, "client") == pytest.approx(50, abs=0.5)
+
+
+def test_usage_over_the_reservation_is_charged():
+    limiter = RateLimiter(tokens_per_minute=60, reserve_tokens=30)
+    reserved = asyncio.run(limiter.acquire("client"))
+    limiter.charge("client", 90, reserved)
+    assert token_level(limiter, "client") == pytest.approx(-30, abs=0.5)
+
+    with pytest.raises(RateLimitExceeded) as raised:
+        asyncio.run(limiter.acquire("client", max_wait=0))
+    # 30 tokens of debt plus a new 30-token reservation, refilled at one token per second
+    assert raised.value.retry_after == pytest.approx(60, abs=1)
+
+
+def test_reservations_hold_back_a_concurrent_burst():
+    limiter = RateLimiter(tokens_per_minute=1000, reserve_tokens=400)
+
+    async def burst():
+        return await asyncio.gather(*(limiter.acquire("client") for _ in range(3)), return_exceptions=True)
+
+    outcomes = asyncio.run(burst())
+    assert outcomes[:2] == [400, 400]
+    assert isinstance(outcomes[2], RateLimitExceeded)
+
+
+def test_request_waits_up_to_max_wait():
+    limiter = RateLimiter(requests_per_minute=600, max_wait=1)
+    limiter.charge("client", 0)
+    requests, _ = limiter._buckets["client"]
+    requests.take(requests.capacity + 2)  # two requests into debt, refilled at ten a second
+
+    started = time.monotonic()
+    asyncio.run(limiter.acquire("client"))
+    assert time.monotonic() - started == pytest.approx(0.3, abs=0.1)
+
+
+def test_global_limit_applies_across_clients():
+    limiter = RateLimiter(global_requests_per_minute=2)
+
+    async def three_clients():
+        return await asyncio.gather(*(limiter.acquire(client) for client in "abc"), return_exceptions=True)
+
+    outcomes = asyncio.run(three_clients())
+    assert outcomes[:2] == [0, 0]
+    assert isinstance(outcomes[2], RateLimitExceeded)
+
+
+def test_least_recently_seen_clients_are_forgotten():
+    limiter = RateLimiter(requests_per_minute=1, max_clients=2)
+
+    async def clients():
+        await limiter.acquire("a")
+        await limiter.acquire("b")
+        limiter.charge("a", 0)  # a is seen again, so b is now the oldest
+        await limiter.acquire("c")
+
+    asyncio.run(clients())
+    assert list(limiter._buckets) == ["a", "c"]
+
+
+async def serve(response, disconnect_first: bool = False):
+    """Run a response as an ASGI app, with the client disconnecting at once or after the body."""
+    sent = []
+
+    async def receive():
+        if not disconnect_first:
+            while not sent or sent[-1].get("more_body", True):
+                await asyncio.sleep(0.01)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if disconnect_first:
+            await asyncio.sleep(1)
+        sent.append(message)
+
+    await response({"type": "http"}, receive, send)
+    return b"".join(message.get("body", b"") for message in sent)
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    limiter = RateLimiter(tokens_per_minute=600, reserve_tokens=200)
+    monkeypatch.setattr(ai_routes, "ai_rate_limiter", limiter)
+    return limiter
+
+
+def usage_events(client: str, reserved: int):
+    async def events():
+        with ai_routes.accounted(client, None, reserved):
+            record_usage(30, 20)
+            yield ai_routes.sse_event("done", {})
+
+    return events
+
+
+def test_stream_settles_its_reservation(limiter):
+    async def scenario():
+        reserved = await limiter.acquire("client")
+        body = await serve(ai_routes.ReservedEventStream("client", reserved, usage_events("client", reserved)))
+        return body
+
+    assert b"event: done" in asyncio.run(scenario())
+    assert token_level(limiter, "client") == pytest.approx(550, abs=1)
+
+
+def test_stream_the_client_left_before_it_started_is_refunded(limiter):
+    async def scenario():
+        reserved = await limiter.acquire("client")
+        assert token_level(limiter, "client") == pytest.approx(400, abs=1)
+        await serve(ai_routes.ReservedEventStream("client", reserved, usage_events("client", reserved)), disconnect_first=True)
+
+    asyncio.run(scenario())
+    assert token_level(limiter, "client") == pytest.approx(600, abs=1)
+
+
+def test_openai_stream_reports_provider_usage():
+    requests = []
+
+    def upstream(request):
+        requests.append(json.loads(request.content))
+        chunks = [
+            {"choices": [{"delta": {"content": "Hello"}}]},
+            {"choices": [{"delta": {"content": " there"}}]},
+            {"choices": [], "usage": {"prompt_tokens": 123, "completion_tokens": 45}},
+        ]
+        body = "".join(f"data: {json.dumps(chunk)}\n\n" for chunk in chunks) + "data: [DONE]\n\n"
+        return httpx.Response(200, text=body)
+
+    async def scenario():
+        provider = OpenAIProvider("key", "model", "http://upstream", transport=httpx.MockTransport(upstream))
+        engine = AIEngine(provider=provider)
+        with metered() as meter:
+            text = "".join([delta async for delta in engine.chat_stream("Hi")])
+        await provider.close()
+        return text, meter
+
+    text, meter = asyncio.run(scenario())
+    assert text == "Hello there"
+    assert requests[0]["stream_options"] == {"include_usage": True}
+    assert (meter.prompt_tokens, meter.completion_tokens, meter.calls) == (123, 45, 1)
@@ -0,0 +1,171 @@
+"""Storage backends: round trips, patches and reloading from disk."""
+
+import os
+
+import pytest
+
+from app.core.config import settings
+from app.models.course import Course, CourseCreate, CourseUpdate, Lesson, Module
+from app.services.log_storage import LogStorageService
+from app.services.storage import create_storage_service
+
+BACKENDS = ["json", "sharded", "sqlite", "log"]
+
+
+@pytest.fixture(params=BACKENDS)
+def open_storage(request, data_dir, monkeypatch):
+    """Open the backend under test on the test's DATA_DIR; call again to simulate a restart."""
+    monkeypatch.setattr(settings, "STORAGE_BACKEND", request.param)
+    opened = []
+
+    def open_storage():
+        storage = create_storage_service()
+        opened.append(storage)
+        return storage
+
+    yield open_storage
+    for storage in opened:
+        if isinstance(storage, LogStorageService):
+            storage._close_log()
+
+
+def modules(count: int = 2):
+    return [
+        Module(
+            id=f"m{i}",
+            number=i + 1,
+            title=f"Module {i + 1}",
+            lessons=[Lesson(id=f"m{i}l{j}", number=j + 1, title=f"Lesson {j + 1}") for j in range(2)],
+        )
+        for i in range(count)
+    ]
+
+
+def dump(course: Course) -> dict:
+    return course.model_dump(mode="json")
+
+
+def test_round_trip(open_storage):
+    storage = open_storage()
+    created = storage.create_course(CourseCreate(title="Data Science", code="DS-1", level="advanced"))
+    updated = storage.update_course(created.id, CourseUpdate(description="Numbers", modules=modules()))
+
+    assert dump(storage.get_course(created.id)) == dump(updated)
+    assert updated.title == "Data Science"
+    assert updated.description == "Numbers"
+    assert [module.id for module in updated.modules] == ["m0", "m1"]
+    assert [dump(course) for course in storage.get_all_courses()] == [dump(updated)]
+
+
+def test_changes_survive_restart(open_storage):
+    storage = open_storage()
+    kept = storage.create_course(CourseCreate(title="Kept", code="K"))
+    dropped = storage.create_course(CourseCreate(title="Dropped", code="D"))
+    kept = storage.update_course(kept.id, CourseUpdate(title="Kept and renamed", modules=modules()))
+    assert storage.delete_course(dropped.id)
+
+    reopened = open_storage()
+    assert [dump(course) for course in reopened.get_all_courses()] == [dump(kept)]
+    assert reopened.get_course(dropped.id) is None
+
+
+def test_patch_survives_restart(open_storage):
+    storage = open_storage()
+    course = storage.create_course(CourseCreate(title="Patched", code="P"))
+    storage.update_course(course.id, CourseUpdate(modules=modules()))
+    patched = storage.patch_course(course.id, [
+        {"op": "replace", "path": "/modules/1/lessons/0/title", "value": "Renamed"},
+        {"op": "remove", "path": "/modules/0"},
+        {"op": "add", "path": "/modules/-", "value": {"id": "new", "number": 3, "title": "Added"}},
+    ])
+
+    assert [module.id for module in patched.modules] == ["m1", "new"]
+    assert patched.modules[0].lessons[0].title == "Renamed"
+    assert dump(storage.get_course(course.id)) == dump(patched)
+    assert dump(open_storage().get_course(course.id)) == dump(patched)
+
+
+def test_missing_course(open_storage):
+    storage = open_storage()
+    assert storage.get_course("missing") is None
+    assert storage.update_course("missing", CourseUpdate(title="x")) is None
+    assert storage.patch_course("missing", []) is None
+    assert storage.delete_course("missing") is False
+
+
+def test_import_replaces_by_id(open_storage):
+    storage = open_storage()
+    existing = storage.create_course(CourseCreate(title="Before", code="B"))
+    replacement = existing.model_copy(update={"title": "After"})
+    imported = storage.import_courses([replacement, CourseCreate(title="New", code="N")])
+
+    assert len(imported) == 2
+    assert imported[1].id != existing.id
+    assert storage.get_course(existing.id).title == "After"
+    assert sorted(course.title for course in open_storage().get_all_courses()) == ["After", "New"]
+
+
+def test_search_filters(open_storage):
+    storage = open_storage()
+    storage.create_course(CourseCreate(title="Intro to Python", code="PY-1", level="basic"))
+    storage.create_course(CourseCreate(title="Advanced Python", code="PY-2", level="advanced"))
+    storage.create_course(CourseCreate(title="Watercolours", code="ART-1", level="basic"))
+
+    assert sorted(course.code for course in storage.search_courses(level="basic")) == ["ART-1", "PY-1"]
+    assert [course.code for course in storage.search_courses(query="python", level="advanced")] == ["PY-2"]
+
+
+def test_list_pages_are_stable_under_inserts(open_storage):
+    storage = open_storage()
+    for i in range(5):
+        storage.create_course(CourseCreate(title=f"Course {i}", code=f"C{i}"))
+
+    seen = []
+    page, total, after = storage.list_courses(limit=2)
+    assert total == 5
+    seen.extend(course.id for course in page)
+    # A course created mid-listing sorts last and must not shift the pages already read
+    late = storage.create_course(CourseCreate(title="Late", code="L"))
+    while after is not None:
+        page, _, after = storage.list_courses(limit=2, after=after)
+        seen.extend(course.id for course in page)
+
+    assert len(seen) == len(set(seen)) == 6
+    assert seen[-1] == late.id
+
+
+def test_list_rejects_a_foreign_key(open_storage):
+    storage = open_storage()
+    storage.create_course(CourseCreate(title="Only one", code="O1"))
+    storage.create_course(CourseCreate(title="Only two", code="O2"))
+    _, _, search_key = storage.list_courses(limit=1, query="only")
+    with pytest.raises(ValueError):
+        storage.list_courses(limit=1, after=search_key)
+
+
+def test_log_replays_onto_snapshot(data_dir):
+    storage = LogStorageService()
+    first = storage.create_course(CourseCreate(title="First", code="F"))
+    assert storage.compact()
+    second = storage.create_course(CourseCreate(title="Second", code="S"))
+    first = storage.patch_course(first.id, [{"op": "replace", "path": "/title", "value": "First, patched"}])
+    storage._close_log()
+
+    reopened = LogStorageService()
+    assert dump(reopened.get_course(first.id)) == dump(first)
+    assert dump(reopened.get_course(second.id)) == dump(second)
+    reopened._close_log()
+
+
+def test_log_discards_torn_entry(data_dir):
+    storage = LogStorageService()
+    course = storage.create_course(CourseCreate(title="Whole", code="W"))
+    storage._close_log()
+    size = os.path.getsize(storage.log_file)
+    with open(storage.log_file, "a", encoding="utf-8") as f:
+        f.write('{"op":"update","id":"' + course.id + '","data":{"title":"Torn')
+
+    reopened = LogStorageService()
+    assert reopened.get_course(course.id).title == "Whole"
+    assert os.path.getsize(reopened.log_file) == size
+    reopened._close_log()
@@ -9,6 +9,10 @@ export function AIChat() {
   const [inputValue, setInputValue] = useState('');
   const messagesEndRef = useRef<HTMLDivElement>(null);
 
+  // Once the streamed reply has started, it replaces the typing indicator
+  const isAwaitingReply =
+    isChatting && chatMessages[chatMessages.length - 1]?.role !== 'assistant';
+
   const scrollToBottom = () => {
     messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' });
   };
@@ -77,7 +81,7 @@ export function AIChat() {
         )}
 
         {/* Typing Indicator */}
-        {isChatting && (
+        {isAwaitingReply && (
           <div className="flex items-start gap-2">
             <div className="w-8 h-8 rounded-full bg-purple-500/20 flex items-center justify-center">
               <Bot className="w-4 h-4 text-purple-400" />
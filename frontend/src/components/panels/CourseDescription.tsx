@@ -14,8 +14,9 @@ export function CourseDescription() {
     updateCourse({ description: value });
   };
 
-  const handleGenerateDescription = async () => {
-    await generateContent('description');
+  // Shift-click regenerates instead of reusing an earlier result
+  const handleGenerateDescription = async (event: React.MouseEvent) => {
+    await generateContent('description', event.shiftKey);
   };
 
   return (
@@ -33,6 +34,7 @@ export function CourseDescription() {
           icon={<Sparkles className="w-4 h-4" />}
           onClick={handleGenerateDescription}
           loading={isGenerating}
+          title="Shift-click to regenerate"
         >
           AI Generate
         </NeonButton>
@@ -8,7 +8,7 @@ interface GenerationOptionProps {
   icon: React.ReactNode;
   title: string;
   description: string;
-  onClick: () => void;
+  onClick: (event: React.MouseEvent) => void;
   loading?: boolean;
 }
 
@@ -37,20 +37,21 @@ function GenerationOption({ icon, title, description, onClick, loading }: Genera
 export function GeneratePanel() {
   const { isGenerating, generateContent, currentCourse } = useCourseStore();
 
-  const handleGenerateFull = async () => {
-    await generateContent('full');
+  // Shift-click regenerates instead of reusing an earlier result for the same course
+  const handleGenerateFull = async (event: React.MouseEvent) => {
+    await generateContent('full', event.shiftKey);
   };
 
-  const handleGenerateObjectives = async () => {
-    await generateContent('objectives');
+  const handleGenerateObjectives = async (event: React.MouseEvent) => {
+    await generateContent('objectives', event.shiftKey);
   };
 
-  const handleGenerateModules = async () => {
-    await generateContent('modules');
+  const handleGenerateModules = async (event: React.MouseEvent) => {
+    await generateContent('modules', event.shiftKey);
   };
 
-  const handleGenerateAssessments = async () => {
-    await generateContent('assessments');
+  const handleGenerateAssessments = async (event: React.MouseEvent) => {
+    await generateContent('assessments', event.shiftKey);
   };
 
   const isConfigured = currentCourse?.title && currentCourse?.level && currentCourse?.thematic;
@@ -98,6 +99,10 @@ export function GeneratePanel() {
         <div className="flex-1 h-px bg-prometheus-border-primary" />
       </div>
 
+      <p className="text-xs text-prometheus-text-muted mb-2">
+        Shift-click to regenerate instead of reusing an earlier result.
+      </p>
+
       {/* Individual Generation Options */}
       <div className="space-y-2">
         <GenerationOption
@@ -128,7 +133,7 @@ export function GeneratePanel() {
           icon={<FileText className="w-4 h-4" />}
           title="Description"
           description="Generate course overview and description"
-          onClick={() => generateContent('description')}
+          onClick={(event) => generateContent('description', event.shiftKey)}
           loading={isGenerating}
         />
       </div>
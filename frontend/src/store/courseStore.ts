@@ -3,11 +3,12 @@ import { devtools, persist } from 'zustand/middleware';
 import type {
   Course,
   LearningObjective,
+  Module,
   ChatMessage,
   ExportFormat,
   AIGenerationRequest,
 } from '@/types/course';
-import { api } from '@/utils/api';
+import { api, StreamError } from '@/utils/api';
 
 interface CourseState {
   // Course Data
@@ -23,6 +24,7 @@ interface CourseState {
 
   // Chat State
   chatMessages: ChatMessage[];
+  chatSessionId: string | null;
 
   // Course Actions
   createNewCourse: () => void;
@@ -40,7 +42,7 @@ interface CourseState {
   reorderObjectives: (objectiveIds: string[]) => void;
 
   // AI Generation Actions
-  generateContent: (type: AIGenerationRequest['generationType']) => Promise<void>;
+  generateContent: (type: AIGenerationRequest['generationType'], fresh?: boolean) => Promise<void>;
 
   // Chat Actions
   sendChatMessage: (content: string) => Promise<void>;
@@ -90,10 +92,11 @@ export const useCourseStore = create<CourseState>()(
         isChatting: false,
         error: null,
         chatMessages: [],
+        chatSessionId: null,
 
         // Course Actions
         createNewCourse: () => {
-          set({ currentCourse: createDefaultCourse() });
+          set({ currentCourse: createDefaultCourse(), chatSessionId: null });
         },
 
         updateCourse: (updates) => {
@@ -138,7 +141,7 @@ export const useCourseStore = create<CourseState>()(
           try {
             if (id) {
               const course = await api.getCourse(id);
-              set({ currentCourse: course, isLoading: false });
+              set({ currentCourse: course, chatSessionId: null, isLoading: false });
             } else {
               const courses = await api.getCourses();
               set({ courses, isLoading: false });
@@ -170,7 +173,7 @@ export const useCourseStore = create<CourseState>()(
         },
 
         resetCourse: () => {
-          set({ currentCourse: createDefaultCourse(), chatMessages: [] });
+          set({ currentCourse: createDefaultCourse(), chatMessages: [], chatSessionId: null });
         },
 
         duplicateCourse: () => {
@@ -190,7 +193,7 @@ export const useCourseStore = create<CourseState>()(
             } as Course['metadata'],
           };
 
-          set({ currentCourse: duplicated });
+          set({ currentCourse: duplicated, chatSessionId: null });
         },
 
         // Learning Objectives Actions
@@ -255,33 +258,61 @@ export const useCourseStore = create<CourseState>()(
         },
 
         // AI Generation Actions
-        generateContent: async (type) => {
+        generateContent: async (type, fresh = false) => {
           const { currentCourse } = get();
           if (!currentCourse) return;
 
           set({ isGenerating: true, error: null });
           try {
-            const response = await api.generateContent({
-              courseId: currentCourse.id || '',
-              generationType: type,
-              context: JSON.stringify({
-                title: currentCourse.title,
-                level: currentCourse.level,
-                thematic: currentCourse.thematic,
-                targetAudience: currentCourse.targetAudience,
-              }),
-            });
+            const errors: string[] = [];
+            let modulesStarted = false;
+
+            // Apply each section as it streams in so the panels fill progressively
+            await api.streamGeneration(
+              {
+                courseId: currentCourse.id || '',
+                generationType: type,
+                context: JSON.stringify({
+                  title: currentCourse.title,
+                  level: currentCourse.level,
+                  thematic: currentCourse.thematic,
+                  targetAudience: currentCourse.targetAudience,
+                }),
+                // Reuse an earlier result for the same course unless asked to regenerate
+                fresh,
+              },
+              ({ event, data }) => {
+                const payload = data as {
+                  data?: Partial<Course>;
+                  module?: Module;
+                  message?: string;
+                };
+
+                if (event === 'section' && payload.data) {
+                  set((state) => ({
+                    currentCourse: state.currentCourse
+                      ? { ...state.currentCourse, ...payload.data }
+                      : null,
+                  }));
+                } else if (event === 'module' && payload.module) {
+                  const generatedModule = payload.module;
+                  const reset = !modulesStarted;
+                  modulesStarted = true;
+                  set((state) => ({
+                    currentCourse: state.currentCourse
+                      ? {
+                          ...state.currentCourse,
+                          modules: [...(reset ? [] : state.currentCourse.modules || []), generatedModule],
+                        }
+                      : null,
+                  }));
+                } else if (event === 'error') {
+                  errors.push(payload.message || 'Generation failed');
+                }
+              }
+            );
 
-            if (response.success && response.data) {
-              set((state) => ({
-                currentCourse: state.currentCourse
-                  ? { ...state.currentCourse, ...response.data }
-                  : null,
-                isGenerating: false,
-              }));
-            } else {
-              throw new Error(response.message || 'Generation failed');
-            }
+            set({ isGenerating: false, error: errors.length ? errors.join('; ') : null });
           } catch (error) {
             set({
               error: error instanceof Error ? error.message : 'Failed to generate content',
@@ -305,19 +336,58 @@ export const useCourseStore = create<CourseState>()(
           }));
 
           try {
-            const response = await api.sendChatMessage(content, get().currentCourse);
+            const assistantId = `msg-${Date.now()}-assistant`;
+            let started = false;
+
+            // Show the reply as soon as its first token arrives, then grow it in place
+            const appendToken = (text: string) => {
+              if (!started) {
+                started = true;
+                const assistantMessage: ChatMessage = {
+                  id: assistantId,
+                  role: 'assistant',
+                  content: text,
+                  timestamp: new Date().toISOString(),
+                };
+                set((state) => ({ chatMessages: [...state.chatMessages, assistantMessage] }));
+              } else {
+                set((state) => ({
+                  chatMessages: state.chatMessages.map((message) =>
+                    message.id === assistantId
+                      ? { ...message, content: message.content + text }
+                      : message
+                  ),
+                }));
+              }
+            };
 
-            const assistantMessage: ChatMessage = {
-              id: `msg-${Date.now()}`,
-              role: 'assistant',
-              content: response.message || 'I apologize, but I could not process your request.',
-              timestamp: new Date().toISOString(),
+            // The server keeps the conversation; start a session on first use
+            // A course not yet saved is sent with every message, so the reply sees the latest edits
+            const sendInSession = async (fresh: boolean) => {
+              let sessionId = get().chatSessionId;
+              const course = get().currentCourse;
+              const saved = course?.id && !course.id.startsWith('course-');
+              if (!sessionId || fresh) {
+                const session = await api.createChatSession(saved ? course.id : undefined, course);
+                sessionId = session.id;
+                set({ chatSessionId: sessionId });
+              }
+              await api.streamSessionMessage(sessionId, content, appendToken, saved ? undefined : course);
             };
 
-            set((state) => ({
-              chatMessages: [...state.chatMessages, assistantMessage],
-              isChatting: false,
-            }));
+            try {
+              await sendInSession(false);
+            } catch (error) {
+              // Sessions expire on the server; start a new one only if ours is gone
+              const expired = error instanceof StreamError && error.status === 404;
+              if (started || !expired) throw error;
+              await sendInSession(true);
+            }
+
+            if (!started) {
+              appendToken('I apologize, but I could not process your request.');
+            }
+            set({ isChatting: false });
           } catch (error) {
             const errorMessage: ChatMessage = {
               id: `msg-${Date.now()}`,
@@ -335,7 +405,7 @@ export const useCourseStore = create<CourseState>()(
         },
 
         clearChat: () => {
-          set({ chatMessages: [] });
+          set({ chatMessages: [], chatSessionId: null });
         },
 
         // Export Actions
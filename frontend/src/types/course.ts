@@ -147,6 +147,62 @@ export interface Course {
   metadata: CourseMetadata;
 }
 
+// Course listing summary (field names match the API payload)
+export interface CourseSummary {
+  id: string;
+  title?: string;
+  code?: string;
+  level?: CourseLevelId | null;
+  thematic?: CourseThematicId | null;
+  status?: CourseStatusCode;
+  duration?: number;
+  delivery_method?: DeliveryMethod | null;
+  module_count?: number;
+  lesson_count?: number;
+  updated_date?: string;
+}
+
+export interface CourseSummaryPage {
+  items: CourseSummary[];
+  total: number;
+  next_cursor?: string | null;
+}
+
+export interface CourseSummaryQuery {
+  limit?: number;
+  cursor?: string;
+  fields?: (keyof CourseSummary)[];
+  q?: string;
+  level?: CourseLevelId;
+  thematic?: CourseThematicId;
+  status?: CourseStatusCode;
+}
+
+// JSON Patch (RFC 6902) operation for partial course updates
+export interface JsonPatchOperation {
+  op: 'add' | 'remove' | 'replace' | 'move' | 'copy' | 'test';
+  path: string;
+  value?: unknown;
+  from?: string;
+}
+
+// Bloom-level classification of learning objectives
+export interface ObjectiveClassification {
+  text: string;
+  verb: string | null;
+  level: CourseLevelId | null;
+  candidates: CourseLevelId[];
+  matches_level: boolean | null;
+}
+
+export interface ObjectiveClassificationResult {
+  level: CourseLevelId | null;
+  results: ObjectiveClassification[];
+  matched: number;
+  mismatched: number;
+  unclassified: number;
+}
+
 // Course Creation/Update DTOs
 export interface CreateCourseDTO {
   title: string;
@@ -173,6 +229,7 @@ export interface AIGenerationRequest {
   generationType: 'objectives' | 'modules' | 'assessments' | 'full';
   context?: string;
   preferences?: Record<string, unknown>;
+  fresh?: boolean; // bypass the server's generation cache
 }
 
 export interface AIGenerationResponse {
@@ -180,6 +237,61 @@ export interface AIGenerationResponse {
   data?: Partial<Course>;
   message?: string;
   tokens_used?: number;
+  errors?: Record<string, string>;
+}
+
+export interface BatchGenerationItem {
+  courseId?: string;
+  context?: Record<string, unknown>;
+}
+
+export interface BatchGenerationRequest {
+  items: BatchGenerationItem[];
+  generationTypes?: AIGenerationRequest['generationType'][];
+  concurrency?: number;
+  persist?: boolean;
+  fresh?: boolean;
+}
+
+// One `result` event from the batch generation stream
+export interface BatchGenerationResult extends AIGenerationResponse {
+  index: number;
+  course_id: string | null;
+  generation_type: string;
+  saved?: boolean;
+}
+
+export interface BatchGenerationSummary {
+  total: number;
+  succeeded: number;
+  failed: number;
+  saved: number;
+  tokens_used: number;
+}
+
+export type RegenerationTarget = 'objectives' | 'module' | 'lesson' | 'assessment';
+
+export interface RegenerationRequest {
+  courseId: string;
+  target: RegenerationTarget;
+  targetId?: string;
+  persist?: boolean;
+}
+
+export interface RegenerationResponse {
+  success: boolean;
+  path?: string;
+  operations: JsonPatchOperation[];
+  data?: unknown;
+  saved: boolean;
+  message?: string;
+  tokens_used?: number;
+}
+
+// Server-sent event from a streaming AI endpoint
+export interface StreamEvent<T = unknown> {
+  event: string;
+  data: T;
 }
 
 // Chat Message Types
@@ -190,6 +302,16 @@ export interface ChatMessage {
   timestamp: string;
 }
 
+export interface ChatSession {
+  id: string;
+  course_id?: string | null;
+  summary: string;
+  turns: { role: 'user' | 'assistant'; content: string }[];
+  summarized_turns: number;
+  history_tokens: number;
+  created_date: string;
+}
+
 // Export Types
 export type ExportFormat = 'json' | 'pdf' | 'docx' | 'scorm';
 
@@ -204,3 +326,19 @@ export interface ExportResponse {
   downloadUrl?: string;
   message?: string;
 }
+
+// Background Job Types
+export type JobStatus = 'queued' | 'running' | 'succeeded' | 'failed' | 'cancelled';
+
+export interface Job<TResult = Record<string, unknown>> {
+  id: string;
+  kind: string;
+  status: JobStatus;
+  priority: number;
+  payload: Record<string, unknown>;
+  result?: TResult | null;
+  error?: string | null;
+  created_date: string;
+  started_date?: string | null;
+  finished_date?: string | null;
+}
@@ -1,10 +1,23 @@
 import axios from 'axios';
 import type {
   Course,
+  CourseLevelId,
+  CourseSummaryPage,
+  CourseSummaryQuery,
+  JsonPatchOperation,
+  ObjectiveClassificationResult,
   AIGenerationRequest,
   AIGenerationResponse,
+  BatchGenerationRequest,
+  BatchGenerationResult,
+  BatchGenerationSummary,
+  ChatSession,
+  RegenerationRequest,
+  RegenerationResponse,
+  StreamEvent,
   ExportRequest,
   ExportResponse,
+  Job,
 } from '@/types/course';
 
 const apiClient = axios.create({
@@ -23,6 +36,63 @@ apiClient.interceptors.response.use(
   }
 );
 
+// Parse one server-sent event block into its event name and JSON data
+function parseStreamEvent(block: string): StreamEvent {
+  let event = 'message';
+  const data: string[] = [];
+  for (const line of block.split('\n')) {
+    if (line.startsWith('event:')) {
+      event = line.slice(6).trim();
+    } else if (line.startsWith('data:')) {
+      data.push(line.slice(5).trimStart());
+    }
+  }
+  return { event, data: data.length ? JSON.parse(data.join('\n')) : null };
+}
+
+// A streaming request the server rejected before any event was sent
+export class StreamError extends Error {
+  constructor(public status: number) {
+    super(`Stream request failed with status ${status}`);
+    this.name = 'StreamError';
+  }
+}
+
+// POST to a streaming endpoint and call onEvent for each server-sent event as it arrives
+async function streamEvents(
+  path: string,
+  body: unknown,
+  onEvent: (event: StreamEvent) => void,
+  signal?: AbortSignal
+): Promise<void> {
+  const response = await fetch(`/api${path}`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', Accept: 'text/event-stream' },
+    body: JSON.stringify(body),
+    signal,
+  });
+  if (!response.ok || !response.body) {
+    throw new StreamError(response.status);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let boundary = buffer.indexOf('\n\n');
+    while (boundary !== -1) {
+      const block = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      if (block.trim()) onEvent(parseStreamEvent(block));
+      boundary = buffer.indexOf('\n\n');
+    }
+  }
+}
+
 export const api = {
   // Course CRUD Operations
   async getCourses(): Promise<Course[]> {
@@ -30,6 +100,14 @@ export const api = {
     return response.data;
   },
 
+  async getCourseSummaries(query: CourseSummaryQuery = {}): Promise<CourseSummaryPage> {
+    const { fields, ...params } = query;
+    const response = await apiClient.get('/courses/summary', {
+      params: { ...params, fields: fields?.join(',') },
+    });
+    return response.data;
+  },
+
   async getCourse(id: string): Promise<Course> {
     const response = await apiClient.get(`/courses/${id}`);
     return response.data;
@@ -47,6 +125,13 @@ export const api = {
     }
   },
 
+  async patchCourse(id: string, operations: JsonPatchOperation[]): Promise<Course> {
+    const response = await apiClient.patch(`/courses/${id}`, operations, {
+      headers: { 'Content-Type': 'application/json-patch+json' },
+    });
+    return response.data;
+  },
+
   async deleteCourse(id: string): Promise<void> {
     await apiClient.delete(`/courses/${id}`);
   },
@@ -57,7 +142,133 @@ export const api = {
     return response.data;
   },
 
+  async generateContentAsJob(
+    request: AIGenerationRequest,
+    priority = 0
+  ): Promise<Job<AIGenerationResponse>> {
+    const response = await apiClient.post('/ai/generate', request, { params: { job: true, priority } });
+    return response.data;
+  },
+
+  async streamGeneration(
+    request: AIGenerationRequest,
+    onEvent: (event: StreamEvent) => void,
+    signal?: AbortSignal
+  ): Promise<void> {
+    await streamEvents(
+      '/ai/generate/stream',
+      {
+        course_id: request.courseId,
+        generation_type: request.generationType,
+        context: request.context,
+        preferences: request.preferences,
+        fresh: request.fresh,
+      },
+      onEvent,
+      signal
+    );
+  },
+
+  async regeneratePart(request: RegenerationRequest): Promise<RegenerationResponse> {
+    const response = await apiClient.post('/ai/regenerate', {
+      course_id: request.courseId,
+      target: request.target,
+      target_id: request.targetId,
+      persist: request.persist,
+    });
+    return response.data;
+  },
+
+  async generateBatch(
+    request: BatchGenerationRequest,
+    onResult: (result: BatchGenerationResult) => void,
+    signal?: AbortSignal
+  ): Promise<BatchGenerationSummary | null> {
+    let summary: BatchGenerationSummary | null = null;
+    await streamEvents(
+      '/ai/generate/batch',
+      {
+        items: request.items.map((item) => ({ course_id: item.courseId, context: item.context })),
+        generation_types: request.generationTypes,
+        concurrency: request.concurrency,
+        persist: request.persist,
+        fresh: request.fresh,
+      },
+      ({ event, data }) => {
+        if (event === 'result') {
+          onResult(data as BatchGenerationResult);
+        } else if (event === 'done') {
+          summary = data as BatchGenerationSummary;
+        }
+      },
+      signal
+    );
+    return summary;
+  },
+
   // Chat
+  async streamChatMessage(
+    message: string,
+    courseContext: Partial<Course> | null | undefined,
+    onToken: (text: string) => void,
+    signal?: AbortSignal
+  ): Promise<{ message: string }> {
+    let result = { message: '' };
+    await streamEvents(
+      '/ai/chat/stream',
+      { message, course_context: courseContext },
+      ({ event, data }) => {
+        const payload = data as { text?: string; message?: string };
+        if (event === 'token' && payload.text) {
+          onToken(payload.text);
+        } else if (event === 'done') {
+          result = { message: payload.message || '' };
+        } else if (event === 'error') {
+          throw new Error(payload.message || 'Chat stream failed');
+        }
+      },
+      signal
+    );
+    return result;
+  },
+
+  async createChatSession(
+    courseId?: string,
+    courseContext?: Partial<Course> | null
+  ): Promise<ChatSession> {
+    const response = await apiClient.post('/ai/chat/sessions', {
+      course_id: courseId,
+      course_context: courseId ? undefined : courseContext,
+    });
+    return response.data;
+  },
+
+  async streamSessionMessage(
+    sessionId: string,
+    message: string,
+    onToken: (text: string) => void,
+    courseContext?: Partial<Course> | null,
+    signal?: AbortSignal
+  ): Promise<{ message: string }> {
+    let result = { message: '' };
+    await streamEvents(
+      `/ai/chat/sessions/${sessionId}/messages/stream`,
+      { message, course_context: courseContext ?? undefined },
+      ({ event, data }) => {
+        const payload = data as { text?: string; message?: string };
+        if (event === 'token' && payload.text) {
+          onToken(payload.text);
+        } else if (event === 'done') {
+          result = { message: payload.message || '' };
+        } else if (event === 'error') {
+          throw new Error(payload.message || 'Chat stream failed');
+        }
+      },
+      signal
+    );
+    return result;
+  },
+
   async sendChatMessage(
     message: string,
     courseContext?: Partial<Course> | null
@@ -75,11 +286,35 @@ export const api = {
     return response.data;
   },
 
+  async exportCourseAsJob(request: ExportRequest, priority = 0): Promise<Job<ExportResponse>> {
+    const response = await apiClient.post('/export', request, { params: { job: true, priority } });
+    return response.data;
+  },
+
+  // Background Jobs
+  async getJob<TResult = Record<string, unknown>>(id: string): Promise<Job<TResult>> {
+    const response = await apiClient.get(`/jobs/${id}`);
+    return response.data;
+  },
+
+  async cancelJob(id: string): Promise<Job> {
+    const response = await apiClient.delete(`/jobs/${id}`);
+    return response.data;
+  },
+
   // Lexicon
   async getLexicon(): Promise<Record<string, unknown>> {
     const response = await apiClient.get('/lexicon');
     return response.data;
   },
+
+  async classifyObjectives(
+    objectives: string[],
+    level?: CourseLevelId
+  ): Promise<ObjectiveClassificationResult> {
+    const response = await apiClient.post('/lexicon/classify', { objectives, level });
+    return response.data;
+  },
 };
 
 export default api;